@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Content-addressed file cache
+Files are stored as <root>/<namespace>/<key[:2]>/<key><suffix>, where key is
+a content hash of whatever produced them (e.g. the DOCX bytes for a
+converted PDF). Hits refresh the file's mtime, and the least recently used
+files are evicted once the cache grows past its size limit. Entries are
+copied in and out, never hardlinked, so editing an output file in place
+cannot change the cache entry other runs will get.
+"""
+
+import hashlib
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import Optional, Union
+
+DEFAULT_CACHE_SIZE = 5 * 1024 ** 3  # 5 GiB
+
+
+def file_digest(path: Union[str, Path]) -> str:
+    """SHA-256 hex digest of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def copy_file(src: Union[str, Path], dst: Union[str, Path]):
+    """Copy src's contents to a new file at dst (an existing dst is unlinked, not overwritten)"""
+    dst = Path(dst)
+    if dst.exists() or dst.is_symlink():
+        # dst may still be a hardlink into the cache from an older version
+        dst.unlink()
+    shutil.copyfile(src, dst)
+
+
+class ContentCache:
+    """Size-limited content-addressed file cache with LRU eviction"""
+
+    def __init__(self, root: Union[str, Path], max_bytes: int = DEFAULT_CACHE_SIZE):
+        """
+        Args:
+            root: cache directory
+            max_bytes: total size limit; 0 disables the cache
+        """
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # Running total since the last full scan; None until the first put
+        self._size = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def path(self, namespace: str, key: str, suffix: str = '') -> Path:
+        return self.root / namespace / key[:2] / f"{key}{suffix}"
+
+    def get(self, namespace: str, key: str, suffix: str = '') -> Optional[Path]:
+        """Cached file for key, or None; a hit marks the entry as recently used"""
+        if not self.enabled:
+            return None
+        path = self.path(namespace, key, suffix)
+        try:
+            os.utime(path)
+        except OSError:
+            return None
+        return path
+
+    def fetch(self, namespace: str, key: str, suffix: str, dst: Union[str, Path]) -> bool:
+        """Copy the cached file for key to dst; False on a miss"""
+        path = self.get(namespace, key, suffix)
+        if path is None:
+            return False
+        try:
+            copy_file(path, dst)
+        except OSError:
+            return False
+        return True
+
+    def put(self, namespace: str, key: str, suffix: str, src: Union[str, Path]) -> Optional[Path]:
+        """Store src under key (atomically) and evict old entries; returns the cache path"""
+        if not self.enabled:
+            return None
+        path = self.path(namespace, key, suffix)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            copy_file(src, temp_path)
+            os.replace(temp_path, path)
+            added = path.stat().st_size
+        except OSError:
+            return None
+        # Only rescan the directory once the running total passes the limit
+        with self._lock:
+            if self._size is not None:
+                self._size += added
+            over = self._size is None or self._size > self.max_bytes
+        if over:
+            self.evict()
+        return path
+
+    def evict(self):
+        """Delete least recently used entries until the cache fits max_bytes"""
+        with self._lock:
+            entries = []
+            total = 0
+            for path in self.root.rglob('*'):
+                if path.name.endswith('.tmp'):
+                    continue
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                if not path.is_file():
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+            if total > self.max_bytes:
+                entries.sort(key=lambda entry: entry[0])
+                for _, size, path in entries:
+                    if total <= self.max_bytes:
+                        break
+                    try:
+                        path.unlink()
+                        total -= size
+                    except OSError:
+                        pass
+            self._size = total
+
+    def size(self) -> int:
+        """Current total size in bytes"""
+        return sum(p.stat().st_size for p in self.root.rglob('*') if p.is_file())
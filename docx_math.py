@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+DOCX equations → LaTeX without rendering
+Word stores equations as OMML (<m:oMath>) inside word/document.xml. The
+package is read as a zip, the XML is streamed with iterparse, and each
+equation is converted to LaTeX directly. OLE equations (Equation Editor
+3.0 / MathType) and pictures (w:drawing, v:imagedata), which may be
+equations pasted as images, are only counted: they are images to us, so
+documents that contain them still go through the PDF + vision pipeline.
+"""
+
+import re
+import zipfile
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+from latex_omml import LaTeXToOMML
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+M_NS = "http://schemas.openxmlformats.org/officeDocument/2006/math"
+O_NS = "urn:schemas-microsoft-com:office:office"
+V_NS = "urn:schemas-microsoft-com:vml"
+
+W = f"{{{W_NS}}}"
+M = f"{{{M_NS}}}"
+
+# Unicode → LaTeX, reversed from the LaTeX → OMML tables (first name wins)
+UNICODE_TO_LATEX = {}
+for _name, _char in LaTeXToOMML.SYMBOLS.items():
+    if len(_char) == 1 and ord(_char) > 127:
+        UNICODE_TO_LATEX.setdefault(_char, '\\' + _name)
+for _letter, _char in LaTeXToOMML.DOUBLE_STRUCK.items():
+    UNICODE_TO_LATEX[_char] = f'\\mathbb{{{_letter}}}'
+UNICODE_TO_LATEX.update({
+    '\u2212': '-', '\u2219': '\\cdot', '\u22c5': '\\cdot', '\u2032': "'", '\u2033': "''", '\u2034': "'''",
+    '\u2009': '\\,', '\u205f': '\\:', '\u2004': '\\;', '\u2003': '\\quad',
+    '\u00a0': '~', '\u200b': '',
+})
+# Characters that need escaping in LaTeX math
+LATEX_ESCAPES = {'{': '\\{', '}': '\\}', '#': '\\#', '%': '\\%', '&': '\\&', '$': '\\$', '_': '\\_'}
+del _name, _char, _letter
+
+NARY_COMMANDS = {char: '\\' + name for name, (char, _) in LaTeXToOMML.BIG_OPERATORS.items()}
+ACCENT_COMMANDS = {char: '\\' + name for name, char in LaTeXToOMML.ACCENTS.items()
+                   if not name.startswith('wide')}
+ACCENT_COMMANDS.update({'̄': '\\bar', '¯': '\\bar', 'ˆ': '\\hat', '˜': '\\tilde',
+                        '→': '\\vec', '˙': '\\dot'})
+DELIMITER_COMMANDS = {'{': '\\{', '}': '\\}', '⟨': '\\langle', '⟩': '\\rangle', '〈': '\\langle',
+                      '〉': '\\rangle', '‖': '\\|', '⌈': '\\lceil', '⌉': '\\rceil',
+                      '⌊': '\\lfloor', '⌋': '\\rfloor', '': '.'}
+
+_COMMAND_END_RE = re.compile(r'\\[a-zA-Z]+$')
+
+
+def _join(parts) -> str:
+    """Concatenate LaTeX pieces, keeping a command from running into a letter"""
+    out = ''
+    for part in parts:
+        if part and out and part[0].isalpha() and _COMMAND_END_RE.search(out):
+            out += ' '
+        out += part
+    return out
+
+
+def _group(latex: str) -> str:
+    """Script base / argument: braces unless it is a single token"""
+    if len(latex) == 1 or _COMMAND_END_RE.fullmatch(latex):
+        return latex
+    return f'{{{latex}}}'
+
+
+class OMMLToLaTeX:
+    """Convert OMML elements (xml.etree) to LaTeX"""
+
+    def convert(self, element: ET.Element) -> str:
+        """<m:oMath> or <m:oMathPara> element → LaTeX"""
+        return self._children(element).strip()
+
+    # ---- helpers ----
+    @staticmethod
+    def _prop(element: Optional[ET.Element], name: str, default: Optional[str] = None) -> Optional[str]:
+        """m:val of the property <m:name> in element's *Pr child"""
+        if element is None:
+            return default
+        for child in element:
+            if child.tag.endswith('Pr'):
+                prop = child.find(M + name)
+                if prop is not None:
+                    return prop.get(M + 'val', default if default is not None else '')
+        return default
+
+    def _flag(self, element: ET.Element, name: str) -> bool:
+        """On/off property; a bare <m:name/> means on"""
+        return self._prop(element, name) in ('', '1', 'on', 'true')
+
+    def _part(self, element: ET.Element, name: str) -> str:
+        child = element.find(M + name)
+        return self._children(child) if child is not None else ''
+
+    def _children(self, element: ET.Element) -> str:
+        return _join(self._node(child) for child in element)
+
+    # ---- elements ----
+    def _node(self, element: ET.Element) -> str:
+        tag = element.tag
+        if not tag.startswith(M):
+            return ''
+        name = tag[len(M):]
+        if name.endswith('Pr'):
+            return ''
+        handler = getattr(self, f'_el_{name}', None)
+        if handler is not None:
+            return handler(element)
+        return self._children(element)
+
+    def _el_r(self, element: ET.Element) -> str:
+        text = ''.join(t.text or '' for t in element.iter(M + 't'))
+        run_pr = element.find(M + 'rPr')
+        if run_pr is not None and run_pr.find(M + 'nor') is not None:
+            return f'\\text{{{text}}}'
+        style = run_pr.find(M + 'sty').get(M + 'val') if run_pr is not None and run_pr.find(M + 'sty') is not None else None
+        if style in ('p', 'b') and text.isalpha() and len(text) > 1:
+            if text in LaTeXToOMML.FUNCTIONS:
+                return f'\\{text}'
+            return f'\\mathrm{{{text}}}' if style == 'p' else f'\\mathbf{{{text}}}'
+        return _join(UNICODE_TO_LATEX.get(c, LATEX_ESCAPES.get(c, c)) for c in text)
+
+    def _el_f(self, element: ET.Element) -> str:
+        num, den = self._part(element, 'num'), self._part(element, 'den')
+        kind = self._prop(element, 'type', 'bar')
+        if kind == 'noBar':
+            return f'\\genfrac{{}}{{}}{{0pt}}{{}}{{{num}}}{{{den}}}'
+        if kind == 'lin':
+            return f'{_group(num)}/{_group(den)}'
+        return f'\\frac{{{num}}}{{{den}}}'
+
+    def _el_rad(self, element: ET.Element) -> str:
+        body = self._part(element, 'e')
+        degree = self._part(element, 'deg')
+        if self._flag(element, 'degHide') or not degree:
+            return f'\\sqrt{{{body}}}'
+        return f'\\sqrt[{degree}]{{{body}}}'
+
+    def _el_sSup(self, element: ET.Element) -> str:
+        return f"{_group(self._part(element, 'e'))}^{{{self._part(element, 'sup')}}}"
+
+    def _el_sSub(self, element: ET.Element) -> str:
+        return f"{_group(self._part(element, 'e'))}_{{{self._part(element, 'sub')}}}"
+
+    def _el_sSubSup(self, element: ET.Element) -> str:
+        return (f"{_group(self._part(element, 'e'))}_{{{self._part(element, 'sub')}}}"
+                f"^{{{self._part(element, 'sup')}}}")
+
+    def _el_sPre(self, element: ET.Element) -> str:
+        return (f"{{}}_{{{self._part(element, 'sub')}}}^{{{self._part(element, 'sup')}}}"
+                f"{_group(self._part(element, 'e'))}")
+
+    def _el_nary(self, element: ET.Element) -> str:
+        # OMML default operator is the integral
+        char = self._prop(element, 'chr', '∫') or '∫'
+        latex = NARY_COMMANDS.get(char, UNICODE_TO_LATEX.get(char, char))
+        if not self._flag(element, 'subHide'):
+            sub = self._part(element, 'sub')
+            if sub:
+                latex += f'_{{{sub}}}'
+        if not self._flag(element, 'supHide'):
+            sup = self._part(element, 'sup')
+            if sup:
+                latex += f'^{{{sup}}}'
+        return _join([latex, ' ', self._part(element, 'e')])
+
+    def _el_d(self, element: ET.Element) -> str:
+        begin = self._prop(element, 'begChr', '(')
+        end = self._prop(element, 'endChr', ')')
+        sep = self._prop(element, 'sepChr', '|')
+        sep = '\\mid' if sep == '|' else DELIMITER_COMMANDS.get(sep, sep)
+        body = f' {sep} '.join(self._children(e) for e in element.findall(M + 'e'))
+        return (f"\\left{DELIMITER_COMMANDS.get(begin, begin)} {body} "
+                f"\\right{DELIMITER_COMMANDS.get(end, end)}")
+
+    def _el_func(self, element: ET.Element) -> str:
+        return _join([self._part(element, 'fName'), ' ', _group(self._part(element, 'e'))])
+
+    def _el_limLow(self, element: ET.Element) -> str:
+        base, limit = self._part(element, 'e'), self._part(element, 'lim')
+        if base.lstrip('\\') in LaTeXToOMML.LIMIT_FUNCTIONS:
+            return f'{base}_{{{limit}}}'
+        return f'\\underset{{{limit}}}{{{base}}}'
+
+    def _el_limUpp(self, element: ET.Element) -> str:
+        return f"\\overset{{{self._part(element, 'lim')}}}{{{self._part(element, 'e')}}}"
+
+    def _el_acc(self, element: ET.Element) -> str:
+        char = self._prop(element, 'chr', '̂') or '̂'
+        command = ACCENT_COMMANDS.get(char, '\\hat')
+        return f"{command}{{{self._part(element, 'e')}}}"
+
+    def _el_bar(self, element: ET.Element) -> str:
+        command = '\\overline' if self._prop(element, 'pos', 'bot') == 'top' else '\\underline'
+        return f"{command}{{{self._part(element, 'e')}}}"
+
+    def _el_groupChr(self, element: ET.Element) -> str:
+        char = self._prop(element, 'chr', '⏟') or '⏟'
+        body = self._part(element, 'e')
+        if char == '⏟':
+            return f'\\underbrace{{{body}}}'
+        if char == '⏞':
+            return f'\\overbrace{{{body}}}'
+        symbol = UNICODE_TO_LATEX.get(char, char)
+        if self._prop(element, 'pos', 'bot') == 'top':
+            return f'\\overset{{{symbol}}}{{{body}}}'
+        return f'\\underset{{{symbol}}}{{{body}}}'
+
+    def _el_m(self, element: ET.Element) -> str:
+        rows = [' & '.join(self._children(e) for e in row.findall(M + 'e'))
+                for row in element.findall(M + 'mr')]
+        return '\\begin{matrix} ' + ' \\\\ '.join(rows) + ' \\end{matrix}'
+
+    def _el_eqArr(self, element: ET.Element) -> str:
+        rows = [self._children(e) for e in element.findall(M + 'e')]
+        return '\\begin{aligned} ' + ' \\\\ '.join(rows) + ' \\end{aligned}'
+
+    def _el_oMath(self, element: ET.Element) -> str:
+        return self._children(element)
+
+    def _el_oMathPara(self, element: ET.Element) -> str:
+        equations = [self._children(e) for e in element.findall(M + 'oMath')]
+        return ' \\\\ '.join(equations)
+
+
+class DocxMath:
+    """Equations and surrounding text of one DOCX, grouped by rendered page"""
+
+    def __init__(self):
+        # pages[i] = list of paragraphs; a paragraph is a list of parts
+        # {'text': str} or {'latex': str, 'display': bool}
+        self.pages: List[List[List[Dict]]] = [[]]
+        self.page_size = None         # [width, height] in 2x points
+        self.formula_count = 0
+        self.image_equations = 0      # OLE equations (Equation Editor / MathType)
+        self.pictures = 0             # w:drawing / v:imagedata (equations may be images)
+        self.rendered_breaks = 0      # w:lastRenderedPageBreak count; 0 = never laid out by Word
+
+    @property
+    def page_count(self) -> int:
+        return len(self.pages)
+
+
+def read_docx_math(docx_path: Union[str, Path]) -> DocxMath:
+    """
+    Stream word/document.xml and collect paragraphs with OMML converted to LaTeX
+
+    Page numbers follow Word's rendered page breaks (w:lastRenderedPageBreak)
+    and explicit page breaks, so they match the last layout Word saved. A
+    document Word never laid out has no rendered breaks (rendered_breaks == 0)
+    and reads as one page per hard break only.
+    """
+    converter = OMMLToLaTeX()
+    result = DocxMath()
+    paragraph: List[Dict] = []
+    math_depth = 0
+    para_depth = 0
+    display_depth = 0
+    # Word also writes a lastRenderedPageBreak where the page after a hard
+    # break starts; that one must not open another page
+    after_hard_break = False
+
+    def flush():
+        nonlocal paragraph
+        if any(part.get('latex') or (part.get('text') or '').strip() for part in paragraph):
+            result.pages[-1].append(paragraph)
+        paragraph = []
+
+    def add_text(text):
+        if paragraph and 'text' in paragraph[-1]:
+            paragraph[-1]['text'] += text
+        else:
+            paragraph.append({'text': text})
+
+    with zipfile.ZipFile(docx_path) as package:
+        with package.open('word/document.xml') as stream:
+            for event, element in ET.iterparse(stream, events=('start', 'end')):
+                tag = element.tag
+                if event == 'start':
+                    if tag == M + 'oMath':
+                        math_depth += 1
+                    elif tag == M + 'oMathPara':
+                        display_depth += 1
+                    elif tag == W + 'p':
+                        para_depth += 1
+                    continue
+
+                if tag == M + 'oMath':
+                    math_depth -= 1
+                    if math_depth == 0:
+                        latex = converter.convert(element)
+                        if latex:
+                            paragraph.append({'latex': latex, 'display': display_depth > 0})
+                            result.formula_count += 1
+                            after_hard_break = False
+                        element.clear()
+                elif math_depth:
+                    continue
+                elif tag == M + 'oMathPara':
+                    display_depth -= 1
+                elif tag == W + 't':
+                    add_text(element.text or '')
+                    if (element.text or '').strip():
+                        after_hard_break = False
+                elif tag == W + 'tab':
+                    add_text(' ')
+                elif tag == W + 'br' and element.get(W + 'type') == 'page':
+                    flush()
+                    result.pages.append([])
+                    after_hard_break = True
+                elif tag == W + 'lastRenderedPageBreak':
+                    result.rendered_breaks += 1
+                    if after_hard_break:
+                        after_hard_break = False
+                    else:
+                        flush()
+                        result.pages.append([])
+                elif tag == f'{{{O_NS}}}OLEObject' and (element.get('ProgID') or '').startswith('Equation'):
+                    result.image_equations += 1
+                elif tag in (W + 'drawing', f'{{{V_NS}}}imagedata'):
+                    result.pictures += 1
+                elif tag == W + 'pgSz' and result.page_size is None:
+                    # twips (1/20 pt) → 2x points
+                    result.page_size = [int(element.get(W + 'w', 0)) // 10,
+                                        int(element.get(W + 'h', 0)) // 10]
+                elif tag == W + 'p':
+                    para_depth -= 1
+                    if para_depth == 0:
+                        flush()
+                        element.clear()
+
+    flush()
+    # A break right at the end leaves an empty trailing page
+    while len(result.pages) > 1 and not result.pages[-1]:
+        result.pages.pop()
+    return result
+
+
+def main():
+    import sys
+    if len(sys.argv) < 2:
+        print("Usage: python docx_math.py <document.docx>")
+        sys.exit(1)
+    doc = read_docx_math(sys.argv[1])
+    for page_num, paragraphs in enumerate(doc.pages):
+        for paragraph in paragraphs:
+            for part in paragraph:
+                if 'latex' in part:
+                    print(f"[page {page_num + 1}] {'$$' if part['display'] else '$'}{part['latex']}")
+    print(f"[Summary] {doc.formula_count} equations, {doc.image_equations} OLE equations, "
+          f"{doc.pictures} pictures, {doc.page_count} pages ({doc.rendered_breaks} rendered breaks)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,565 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+LaTeX → OMML (Office Math Markup Language) converter
+Single pass: one tokenizer regex feeds a recursive-descent parser that
+emits <m:oMath> XML directly; results are memoized per LaTeX string.
+"""
+
+import re
+from functools import lru_cache
+from typing import List, Optional, Tuple
+from xml.sax.saxutils import escape
+
+OMML_NS = "http://schemas.openxmlformats.org/officeDocument/2006/math"
+
+# \command (optionally starred), \<symbol>, whitespace, any other character
+TOKEN_RE = re.compile(r'\\([a-zA-Z]+)\*?|\\(.)|(\s+)|(.)', re.S)
+
+
+class LaTeXToOMML:
+    """Convert LaTeX to Office Math Markup Language (OMML) format"""
+
+    # Greek letter mappings
+    GREEK_LETTERS = {
+        '\\alpha': 'α', '\\beta': 'β', '\\gamma': 'γ', '\\delta': 'δ',
+        '\\epsilon': 'ε', '\\zeta': 'ζ', '\\eta': 'η', '\\theta': 'θ',
+        '\\iota': 'ι', '\\kappa': 'κ', '\\lambda': 'λ', '\\mu': 'μ',
+        '\\nu': 'ν', '\\xi': 'ξ', '\\pi': 'π', '\\rho': 'ρ',
+        '\\sigma': 'σ', '\\tau': 'τ', '\\upsilon': 'υ', '\\phi': 'φ',
+        '\\chi': 'χ', '\\psi': 'ψ', '\\omega': 'ω',
+        '\\varepsilon': 'ε', '\\vartheta': 'ϑ', '\\varpi': 'ϖ',
+        '\\varrho': 'ϱ', '\\varsigma': 'ς', '\\varphi': 'φ',
+        '\\Alpha': 'Α', '\\Beta': 'Β', '\\Gamma': 'Γ', '\\Delta': 'Δ',
+        '\\Epsilon': 'Ε', '\\Zeta': 'Ζ', '\\Eta': 'Η', '\\Theta': 'Θ',
+        '\\Iota': 'Ι', '\\Kappa': 'Κ', '\\Lambda': 'Λ', '\\Mu': 'Μ',
+        '\\Nu': 'Ν', '\\Xi': 'Ξ', '\\Pi': 'Π', '\\Rho': 'Ρ',
+        '\\Sigma': 'Σ', '\\Tau': 'Τ', '\\Upsilon': 'Υ', '\\Phi': 'Φ',
+        '\\Chi': 'Χ', '\\Psi': 'Ψ', '\\Omega': 'Ω'
+    }
+
+    # Math symbols
+    MATH_SYMBOLS = {
+        '\\times': '×', '\\div': '÷', '\\pm': '±', '\\mp': '∓',
+        '\\cdot': '·', '\\ast': '*', '\\star': '★', '\\circ': '∘',
+        '\\bullet': '•', '\\oplus': '⊕', '\\ominus': '⊖', '\\otimes': '⊗',
+        '\\oslash': '⊘', '\\odot': '⊙', '\\dagger': '†', '\\ddagger': '‡',
+        '\\amalg': '⨿', '\\vee': '∨', '\\wedge': '∧', '\\cap': '∩',
+        '\\cup': '∪', '\\sqcap': '⊓', '\\sqcup': '⊔', '\\uplus': '⊎',
+        '\\setminus': '∖'
+    }
+
+    # Relation symbols
+    RELATION_SYMBOLS = {
+        '\\leq': '≤', '\\geq': '≥', '\\neq': '≠', '\\approx': '≈',
+        '\\le': '≤', '\\ge': '≥', '\\ne': '≠', '\\leqslant': '⩽', '\\geqslant': '⩾',
+        '\\equiv': '≡', '\\sim': '∼', '\\simeq': '≃', '\\propto': '∝',
+        '\\cong': '≅', '\\doteq': '≐',
+        '\\subset': '⊂', '\\subseteq': '⊆', '\\supset': '⊃', '\\supseteq': '⊇',
+        '\\in': '∈', '\\ni': '∋', '\\notin': '∉', '\\ll': '≪',
+        '\\gg': '≫', '\\prec': '≺', '\\succ': '≻', '\\perp': '⊥',
+        '\\parallel': '∥', '\\mid': '∣', '\\nmid': '∤'
+    }
+
+    # Arrow symbols
+    ARROW_SYMBOLS = {
+        '\\rightarrow': '→', '\\leftarrow': '←', '\\leftrightarrow': '↔',
+        '\\to': '→', '\\gets': '←', '\\longrightarrow': '⟶', '\\longleftarrow': '⟵',
+        '\\Rightarrow': '⇒', '\\Leftarrow': '⇐', '\\Leftrightarrow': '⇔',
+        '\\Longrightarrow': '⟹', '\\iff': '⟺', '\\implies': '⟹',
+        '\\uparrow': '↑', '\\downarrow': '↓', '\\updownarrow': '↕',
+        '\\nearrow': '↗', '\\searrow': '↘', '\\swarrow': '↙', '\\nwarrow': '↖',
+        '\\mapsto': '↦', '\\hookrightarrow': '↪', '\\hookleftarrow': '↩'
+    }
+
+    # Other symbols
+    OTHER_SYMBOLS = {
+        '\\infty': '∞', '\\partial': '∂', '\\nabla': '∇', '\\forall': '∀',
+        '\\exists': '∃', '\\nexists': '∄', '\\emptyset': '∅', '\\varnothing': '∅',
+        '\\complement': '∁', '\\neg': '¬', '\\lnot': '¬', '\\land': '∧',
+        '\\lor': '∨', '\\angle': '∠', '\\measuredangle': '∡', '\\sphericalangle': '∢',
+        '\\prime': '′', '\\backprime': '‵', '\\ldots': '…', '\\cdots': '⋯',
+        '\\dots': '…', '\\hbar': 'ℏ', '\\ell': 'ℓ', '\\Re': 'ℜ', '\\Im': 'ℑ',
+        '\\aleph': 'ℵ', '\\wp': '℘',
+        '\\vdots': '⋮', '\\ddots': '⋱', '\\therefore': '∴', '\\because': '∵',
+        '\\qed': '∎', '\\blacksquare': '■', '\\square': '□', '\\triangle': '△',
+        '\\bigtriangleup': '△', '\\bigtriangledown': '▽', '\\diamond': '◊',
+        '\\lozenge': '◊', '\\blacklozenge': '⧫', '\\bigcirc': '○',
+        '\\copyright': '©', '\\pounds': '£', '\\yen': '¥', '\\euro': '€',
+        '\\section': '§', '\\paragraph': '¶', '\\dagger': '†', '\\ddagger': '‡'
+    }
+
+    # Delimiters (also valid after \left / \right)
+    DELIMITERS = {
+        '\\langle': '⟨', '\\rangle': '⟩', '\\lceil': '⌈', '\\rceil': '⌉',
+        '\\lfloor': '⌊', '\\rfloor': '⌋', '\\lvert': '|', '\\rvert': '|',
+        '\\lVert': '‖', '\\rVert': '‖', '\\vert': '|', '\\Vert': '‖',
+        '\\{': '{', '\\}': '}', '\\|': '‖', '\\lbrace': '{', '\\rbrace': '}'
+    }
+
+    # Big operators → (character, limit location)
+    BIG_OPERATORS = {
+        'sum': ('∑', 'undOvr'), 'prod': ('∏', 'undOvr'), 'coprod': ('∐', 'undOvr'),
+        'bigcup': ('⋃', 'undOvr'), 'bigcap': ('⋂', 'undOvr'),
+        'bigoplus': ('⨁', 'undOvr'), 'bigotimes': ('⨂', 'undOvr'),
+        'bigvee': ('⋁', 'undOvr'), 'bigwedge': ('⋀', 'undOvr'),
+        'int': ('∫', 'subSup'), 'iint': ('∬', 'subSup'),
+        'iiint': ('∭', 'subSup'), 'oint': ('∮', 'subSup')
+    }
+
+    # Upright function names; LIMIT_FUNCTIONS take subscripts underneath
+    FUNCTIONS = {'sin', 'cos', 'tan', 'cot', 'sec', 'csc',
+                 'sinh', 'cosh', 'tanh', 'coth',
+                 'arcsin', 'arccos', 'arctan',
+                 'ln', 'log', 'exp', 'det', 'dim',
+                 'lim', 'sup', 'inf', 'max', 'min',
+                 'gcd', 'lcm', 'deg', 'ker', 'arg', 'Pr',
+                 'liminf', 'limsup'}
+    LIMIT_FUNCTIONS = {'lim', 'sup', 'inf', 'max', 'min', 'liminf', 'limsup', 'det', 'gcd', 'Pr'}
+
+    # Accents → combining character
+    ACCENTS = {
+        'hat': '\u0302', 'widehat': '\u0302', 'tilde': '\u0303', 'widetilde': '\u0303',
+        'bar': '\u0305', 'vec': '\u20d7', 'dot': '\u0307', 'ddot': '\u0308',
+        'check': '\u030c', 'breve': '\u0306', 'acute': '\u0301', 'grave': '\u0300'
+    }
+
+    # Spacing commands → Unicode spaces
+    SPACES = {
+        ',': '\u2009', ':': '\u205f', '>': '\u205f', ';': '\u2004', ' ': ' ',
+        'quad': '\u2003', 'qquad': '\u2003\u2003', 'enspace': '\u2002',
+        '!': '', 'thinspace': '\u2009', 'medspace': '\u205f', 'thickspace': '\u2004'
+    }
+
+    # Matrix environments → (opening, closing) delimiter
+    MATRIX_ENVS = {
+        'matrix': ('', ''), 'smallmatrix': ('', ''), 'array': ('', ''),
+        'pmatrix': ('(', ')'), 'bmatrix': ('[', ']'), 'Bmatrix': ('{', '}'),
+        'vmatrix': ('|', '|'), 'Vmatrix': ('‖', '‖'), 'cases': ('{', '')
+    }
+    # Equation-array environments (& alignment points are dropped)
+    EQARRAY_ENVS = {'aligned', 'align', 'alignat', 'gathered', 'gather', 'split',
+                    'eqnarray', 'multline'}
+
+    # Commands with no output of their own
+    IGNORED = {'displaystyle', 'textstyle', 'scriptstyle', 'scriptscriptstyle',
+               'limits', 'nolimits', 'left', 'right', 'big', 'Big', 'bigg', 'Bigg',
+               'bigl', 'bigr', 'Bigl', 'Bigr', 'biggl', 'biggr', 'Biggl', 'Biggr',
+               'middle', 'nonumber', 'notag', 'label', 'tag',
+               'tiny', 'scriptsize', 'footnotesize', 'small', 'normalsize',
+               'large', 'Large', 'LARGE', 'huge', 'Huge'}
+
+    # Commands whose argument is plain upright text
+    TEXT_COMMANDS = {'text', 'textrm', 'textnormal', 'mbox', 'textup', 'operatorname', 'textit', 'textbf'}
+
+    # Font commands → OMML run style (p: plain, b: bold, i: italic)
+    FONT_STYLES = {'mathrm': 'p', 'mathbf': 'b', 'boldsymbol': 'bi', 'bm': 'bi',
+                   'mathit': 'i', 'mathsf': 'p', 'mathtt': 'p', 'mathcal': None,
+                   'mathscr': None, 'mathfrak': None, 'mathbb': 'p'}
+
+    # Double-struck capitals outside the Mathematical Alphanumeric block
+    DOUBLE_STRUCK = {'C': 'ℂ', 'H': 'ℍ', 'N': 'ℕ', 'P': 'ℙ', 'Q': 'ℚ', 'R': 'ℝ', 'Z': 'ℤ'}
+
+    # Command name (without backslash) → Unicode, built once for O(1) lookup
+    SYMBOLS = {}
+    for _table in (GREEK_LETTERS, MATH_SYMBOLS, RELATION_SYMBOLS, ARROW_SYMBOLS,
+                   OTHER_SYMBOLS, DELIMITERS):
+        SYMBOLS.update({name[1:]: char for name, char in _table.items()})
+    del _table
+
+    def convert(self, latex):
+        """Convert LaTeX to an OMML <m:oMath> element (memoized per string)"""
+        if not latex:
+            return ""
+        return self._convert_cached(latex)
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _convert_cached(latex):
+        body = _Parser(latex).parse()
+        return f'<m:oMath xmlns:m="{OMML_NS}">{body}</m:oMath>'
+
+
+# Atoms of a parsed sequence:
+#   ('t', text, style)               - character run (style None = math italic)
+#   ('x', xml)                       - finished OMML element(s)
+#   ('n', char, limloc, sub, sup)    - n-ary operator waiting for its operand
+Atom = Tuple
+
+
+def _run(text: str, style: Optional[str] = None) -> str:
+    if not text:
+        return ''
+    props = f'<m:rPr><m:sty m:val="{style}"/></m:rPr>' if style else ''
+    return f'<m:r>{props}<m:t xml:space="preserve">{escape(text)}</m:t></m:r>'
+
+
+def _attr(value: str) -> str:
+    """Escape a character for an m:val attribute (delimiters may be '"', '<', '&')"""
+    return escape(value, {'"': '&quot;'})
+
+
+def _wrap(tag: str, xml: str) -> str:
+    return f'<m:{tag}>{xml}</m:{tag}>' if xml else f'<m:{tag}/>'
+
+
+def _delimited(xml: str, open_chr: str, close_chr: str) -> str:
+    return (f'<m:d><m:dPr><m:begChr m:val="{_attr(open_chr)}"/>'
+            f'<m:endChr m:val="{_attr(close_chr)}"/></m:dPr>{_wrap("e", xml)}</m:d>')
+
+
+class _Parser:
+    """Recursive-descent LaTeX parser over a single token list"""
+
+    C = LaTeXToOMML
+
+    def __init__(self, latex: str):
+        self.src = latex
+        # (kind, value, start, end) with kind in cmd / sym / char; whitespace is dropped
+        self.tokens = []
+        for m in TOKEN_RE.finditer(latex):
+            if m.group(1) is not None:
+                self.tokens.append(('cmd', m.group(1), m.start(), m.end()))
+            elif m.group(2) is not None:
+                self.tokens.append(('sym', m.group(2), m.start(), m.end()))
+            elif m.group(4) is not None:
+                self.tokens.append(('char', m.group(4), m.start(), m.end()))
+        self.pos = 0
+
+    def parse(self) -> str:
+        xml = ''
+        while self.pos < len(self.tokens):
+            xml += self._xml(self._sequence())
+            # Unbalanced closing brace: skip it and keep going
+            self.pos += 1
+        return xml
+
+    # ---- token helpers ----
+    def _peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def _is(self, kind: str, value: str) -> bool:
+        tok = self._peek()
+        return tok is not None and tok[0] == kind and tok[1] == value
+
+    def _at_stop(self, stops) -> bool:
+        tok = self._peek()
+        if tok is None:
+            return True
+        return (tok[0], tok[1]) in stops
+
+    # ---- sequences ----
+    def _sequence(self, stops=frozenset({('char', '}')})) -> List[Atom]:
+        atoms: List[Atom] = []
+        while not self._at_stop(stops):
+            tok = self._peek()
+            if tok[0] == 'char' and tok[1] in '^_':
+                self._scripts(atoms)
+            elif tok[0] == 'char' and tok[1] == "'":
+                self.pos += 1
+                atoms.append(('t', '′', 'p'))
+            else:
+                atoms.extend(self._atom())
+        return atoms
+
+    def _scripts(self, atoms: List[Atom]):
+        """Attach ^ / _ (in either order) to the last atom"""
+        sub = sup = None
+        while self._peek() and self._peek()[0] == 'char' and self._peek()[1] in '^_':
+            mark = self._peek()[1]
+            self.pos += 1
+            arg = self._argument()
+            if mark == '_':
+                sub = arg
+            else:
+                sup = arg
+        base = atoms.pop() if atoms else ('t', '', None)
+
+        if base[0] == 'n':
+            atoms.append(('n', base[1], base[2], sub if sub is not None else base[3],
+                          sup if sup is not None else base[4]))
+            return
+        if base[0] == 't' and base[2] == 'p' and base[1] in self.C.LIMIT_FUNCTIONS and sub is not None:
+            xml = f'<m:limLow>{_wrap("e", _run(base[1], "p"))}{_wrap("lim", sub)}</m:limLow>'
+            if sup is not None:
+                xml = f'<m:sSup>{_wrap("e", xml)}{_wrap("sup", sup)}</m:sSup>'
+            atoms.append(('x', xml))
+            return
+
+        base_xml = self._xml([base])
+        if sub is not None and sup is not None:
+            xml = f'<m:sSubSup>{_wrap("e", base_xml)}{_wrap("sub", sub)}{_wrap("sup", sup)}</m:sSubSup>'
+        elif sub is not None:
+            xml = f'<m:sSub>{_wrap("e", base_xml)}{_wrap("sub", sub)}</m:sSub>'
+        else:
+            xml = f'<m:sSup>{_wrap("e", base_xml)}{_wrap("sup", sup)}</m:sSup>'
+        atoms.append(('x', xml))
+
+    def _argument(self) -> str:
+        """Braced group or single atom, as XML"""
+        tok = self._peek()
+        if tok is None:
+            return ''
+        if tok[0] == 'char' and tok[1] == '{':
+            return self._xml(self._group())
+        return self._xml(self._atom())
+
+    def _group(self) -> List[Atom]:
+        """{ ... } → atoms (the opening brace is the current token)"""
+        self.pos += 1
+        atoms = self._sequence()
+        if self._is('char', '}'):
+            self.pos += 1
+        return atoms
+
+    def _raw_group(self) -> str:
+        """Source text of a { ... } group, without interpretation"""
+        if not self._is('char', '{'):
+            tok = self._peek()
+            if tok is None:
+                return ''
+            self.pos += 1
+            return tok[1]
+        start = self.tokens[self.pos][3]
+        depth = 0
+        while self.pos < len(self.tokens):
+            kind, value, s, e = self.tokens[self.pos]
+            self.pos += 1
+            if kind == 'char' and value == '{':
+                depth += 1
+            elif kind == 'char' and value == '}':
+                depth -= 1
+                if depth == 0:
+                    return self.src[start:s]
+        return self.src[start:]
+
+    def _optional(self) -> Optional[str]:
+        """[ ... ] argument as XML, if present"""
+        if not self._is('char', '['):
+            return None
+        self.pos += 1
+        atoms = self._sequence(stops=frozenset({('char', ']'), ('char', '}')}))
+        if self._is('char', ']'):
+            self.pos += 1
+        return self._xml(atoms)
+
+    # ---- atoms ----
+    def _atom(self) -> List[Atom]:
+        kind, value, _, _ = self.tokens[self.pos]
+        self.pos += 1
+
+        if kind == 'char':
+            if value == '{':
+                self.pos -= 1
+                return [('x', self._xml(self._group()))]
+            if value in '&~':
+                return [('t', ' ', None)] if value == '~' else []
+            return [('t', value, 'p' if not value.isalpha() else None)]
+
+        if kind == 'sym':
+            if value in self.C.SPACES:
+                return [('t', self.C.SPACES[value], 'p')] if self.C.SPACES[value] else []
+            if value == '\\':
+                return []
+            return [('t', self.C.SYMBOLS.get(value, value), 'p')]
+
+        return self._command(value)
+
+    def _command(self, name: str) -> List[Atom]:
+        C = self.C
+        if name in C.SYMBOLS:
+            char = C.SYMBOLS[name]
+            return [('t', char, None if name in _GREEK_LOWER else 'p')]
+        if name in C.BIG_OPERATORS:
+            char, limloc = C.BIG_OPERATORS[name]
+            return [('n', char, limloc, None, None)]
+        if name in C.FUNCTIONS:
+            return [('t', name, 'p')]
+        if name in C.SPACES:
+            return [('t', C.SPACES[name], 'p')] if C.SPACES[name] else []
+        if name in ('frac', 'dfrac', 'tfrac', 'cfrac'):
+            num = self._argument()
+            den = self._argument()
+            return [('x', f'<m:f>{_wrap("num", num)}{_wrap("den", den)}</m:f>')]
+        if name in ('binom', 'dbinom', 'tbinom'):
+            top = self._argument()
+            bottom = self._argument()
+            frac = (f'<m:f><m:fPr><m:type m:val="noBar"/></m:fPr>'
+                    f'{_wrap("num", top)}{_wrap("den", bottom)}</m:f>')
+            return [('x', _delimited(frac, '(', ')'))]
+        if name == 'sqrt':
+            degree = self._optional()
+            body = self._argument()
+            if degree:
+                return [('x', f'<m:rad>{_wrap("deg", degree)}{_wrap("e", body)}</m:rad>')]
+            return [('x', f'<m:rad><m:radPr><m:degHide m:val="1"/></m:radPr><m:deg/>{_wrap("e", body)}</m:rad>')]
+        if name in C.ACCENTS:
+            body = self._argument()
+            return [('x', f'<m:acc><m:accPr><m:chr m:val="{_attr(C.ACCENTS[name])}"/></m:accPr>{_wrap("e", body)}</m:acc>')]
+        if name in ('overline', 'underline'):
+            body = self._argument()
+            pos = 'top' if name == 'overline' else 'bot'
+            return [('x', f'<m:bar><m:barPr><m:pos m:val="{pos}"/></m:barPr>{_wrap("e", body)}</m:bar>')]
+        if name in ('overbrace', 'underbrace'):
+            body = self._argument()
+            chr_, pos = ('⏞', 'top') if name == 'overbrace' else ('⏟', 'bot')
+            return [('x', f'<m:groupChr><m:groupChrPr><m:chr m:val="{_attr(chr_)}"/><m:pos m:val="{pos}"/>'
+                          f'</m:groupChrPr>{_wrap("e", body)}</m:groupChr>')]
+        if name == 'left':
+            return self._left_right()
+        if name in C.TEXT_COMMANDS:
+            return [('t', self._raw_group(), 'p')]
+        if name in C.FONT_STYLES:
+            return self._styled(name)
+        if name == 'begin':
+            return self._environment()
+        if name in ('hspace', 'vspace', 'label', 'tag'):
+            self._raw_group()
+            return [('t', ' ', 'p')] if name == 'hspace' else []
+        if name in C.IGNORED:
+            return []
+        if name == 'not':
+            atoms = self._atom() if self._peek() else []
+            if atoms and atoms[0][0] == 't':
+                return [('t', atoms[0][1] + '\u0338', atoms[0][2])]
+            return atoms
+        # Unknown command: keep its name as text
+        return [('t', name, 'p')]
+
+    def _styled(self, name: str) -> List[Atom]:
+        if not self._is('char', '{'):
+            atoms = self._atom() if self._peek() else []
+        else:
+            atoms = self._group()
+        style = self.C.FONT_STYLES[name]
+        result = []
+        for atom in atoms:
+            if atom[0] == 't':
+                text = atom[1]
+                if name == 'mathbb':
+                    text = ''.join(_double_struck(c) for c in text)
+                result.append(('t', text, style if style else atom[2]))
+            else:
+                result.append(atom)
+        return result
+
+    def _left_right(self) -> List[Atom]:
+        open_chr = self._delimiter()
+        atoms = self._sequence(stops=frozenset({('cmd', 'right'), ('char', '}')}))
+        close_chr = ''
+        if self._is('cmd', 'right'):
+            self.pos += 1
+            close_chr = self._delimiter()
+        return [('x', _delimited(self._xml(atoms), open_chr, close_chr))]
+
+    def _delimiter(self) -> str:
+        tok = self._peek()
+        if tok is None:
+            return ''
+        self.pos += 1
+        kind, value = tok[0], tok[1]
+        if kind == 'char':
+            return '' if value == '.' else value
+        return self.C.SYMBOLS.get(value, value)
+
+    def _environment(self) -> List[Atom]:
+        env = self._raw_group().strip().rstrip('*')
+        if env in ('array', 'alignat'):
+            # Column spec / column count
+            self._raw_group()
+
+        rows = []
+        row = []
+        stops = frozenset({('char', '&'), ('sym', '\\'), ('cmd', 'end'), ('char', '}')})
+        while True:
+            row.append(self._xml(self._sequence(stops=stops)))
+            tok = self._peek()
+            if tok is None:
+                break
+            self.pos += 1
+            if tok[0] == 'char' and tok[1] == '&':
+                continue
+            if tok[0] == 'sym':
+                rows.append(row)
+                row = []
+                continue
+            if tok[0] == 'cmd':
+                self._raw_group()
+            break
+        if any(row):
+            rows.append(row)
+
+        if env in self.C.EQARRAY_ENVS:
+            xml = ''.join(_wrap('e', ''.join(cells)) for cells in rows)
+            return [('x', f'<m:eqArr>{xml}</m:eqArr>')]
+
+        width = max((len(cells) for cells in rows), default=1)
+        matrix = ''.join(
+            '<m:mr>' + ''.join(_wrap('e', cell) for cell in cells + [''] * (width - len(cells))) + '</m:mr>'
+            for cells in rows
+        )
+        xml = f'<m:m>{matrix}</m:m>'
+        open_chr, close_chr = self.C.MATRIX_ENVS.get(env, ('', ''))
+        if open_chr or close_chr:
+            xml = _delimited(xml, open_chr, close_chr)
+        return [('x', xml)]
+
+    # ---- output ----
+    def _xml(self, atoms: List[Atom]) -> str:
+        """Atoms → XML, merging adjacent text of one style into a single run"""
+        out = []
+        text, style = '', None
+        i = 0
+        while i < len(atoms):
+            atom = atoms[i]
+            if atom[0] == 't':
+                if text and atom[2] != style:
+                    out.append(_run(text, style))
+                    text = ''
+                text += atom[1]
+                style = atom[2]
+                i += 1
+                continue
+            if text:
+                out.append(_run(text, style))
+                text = ''
+            if atom[0] == 'n':
+                # The operand of an n-ary operator is the atom that follows it
+                operand = ''
+                if i + 1 < len(atoms):
+                    operand = self._xml([atoms[i + 1]])
+                    i += 1
+                out.append(self._nary(atom, operand))
+            else:
+                out.append(atom[1])
+            i += 1
+        if text:
+            out.append(_run(text, style))
+        return ''.join(out)
+
+    @staticmethod
+    def _nary(atom: Atom, operand: str) -> str:
+        _, char, limloc, sub, sup = atom
+        props = f'<m:chr m:val="{_attr(char)}"/><m:limLoc m:val="{limloc}"/>'
+        if sub is None:
+            props += '<m:subHide m:val="1"/>'
+        if sup is None:
+            props += '<m:supHide m:val="1"/>'
+        return (f'<m:nary><m:naryPr>{props}</m:naryPr>'
+                f'{_wrap("sub", sub or "")}{_wrap("sup", sup or "")}{_wrap("e", operand)}</m:nary>')
+
+
+_GREEK_LOWER = {name[1:] for name in LaTeXToOMML.GREEK_LETTERS if name[1].islower()}
+
+
+def _double_struck(c: str) -> str:
+    """Letter → double-struck form (\\mathbb)"""
+    if c in LaTeXToOMML.DOUBLE_STRUCK:
+        return LaTeXToOMML.DOUBLE_STRUCK[c]
+    if 'A' <= c <= 'Z':
+        return chr(0x1D538 + ord(c) - ord('A'))
+    if 'a' <= c <= 'z':
+        return chr(0x1D552 + ord(c) - ord('a'))
+    if '0' <= c <= '9':
+        return chr(0x1D7D8 + ord(c) - ord('0'))
+    return c
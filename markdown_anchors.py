@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Formula anchors in the output markdown
+Every formula is written as <!--f:page:det-->$latex$<!--/f--> (det is the
+model.json layout_dets index), so create_fixed_md can replace fixed LaTeX
+at exactly those positions, even when the same LaTeX appears several times.
+"""
+
+import json
+import re
+
+FORMULA_ANCHOR_RE = re.compile(r'<!--f:(\d+):(\d+)-->(.*?)<!--/f-->', re.S)
+
+
+def formula_markdown(page_idx: int, det_idx: int, latex: str, inline: bool) -> str:
+    """Anchored formula markdown (det_idx is the model.json layout_dets index)"""
+    body = f"${latex}$" if inline else f"\n$$\n{latex}\n$$\n"
+    return f"<!--f:{page_idx}:{det_idx}-->{body}<!--/f-->"
+
+
+def create_fixed_md(txt_dir):
+    """Create output_fixed.md from model_fixed.json
+
+    Fixed LaTeX is written at the <!--f:page:det--> anchors emitted by
+    _generate_markdown, in a single pass over the markdown.
+    """
+    model_fixed_path = txt_dir / "model_fixed.json"
+    output_md_path = txt_dir / f"{txt_dir.parent.name}.md"
+    if not output_md_path.exists():
+        output_md_path = txt_dir / "output.md"
+    output_fixed_md_path = txt_dir / "output_fixed.md"
+    
+    # Read fixed model data: (page_idx, det_idx) -> fixed LaTeX
+    with open(model_fixed_path, 'r', encoding='utf-8') as f:
+        fixed_data = json.load(f)
+    
+    fixed_latex = {}
+    for position, page in enumerate(fixed_data):
+        page_idx = page.get('page_idx', position)
+        for det_idx, det in enumerate(page.get('layout_dets', [])):
+            if 'latex' in det:
+                fixed_latex[(page_idx, det_idx)] = det['latex']
+    
+    # Read original markdown if exists
+    if output_md_path.exists():
+        with open(output_md_path, 'r', encoding='utf-8') as f:
+            original_md = f.read()
+    else:
+        # Create new markdown if original doesn't exist
+        original_md = ''.join(
+            formula_markdown(page_idx, det_idx, latex, False) + "\n\n"
+            for (page_idx, det_idx), latex in fixed_latex.items()
+        )
+    
+    # Substitute at the anchors, writing the text between them unchanged
+    with open(output_fixed_md_path, 'w', encoding='utf-8') as f:
+        pos = 0
+        for match in FORMULA_ANCHOR_RE.finditer(original_md):
+            f.write(original_md[pos:match.start()])
+            key = (int(match.group(1)), int(match.group(2)))
+            if key in fixed_latex:
+                inline = not match.group(3).startswith('\n$$')
+                f.write(formula_markdown(key[0], key[1], fixed_latex[key], inline))
+            else:
+                f.write(match.group(0))
+            pos = match.end()
+        f.write(original_md[pos:])
+    
+    return output_fixed_md_path
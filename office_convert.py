@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+DOCX → PDF with LibreOffice headless (soffice --convert-to pdf)
+Works without Microsoft Word. A pool of converter slots, each with its own
+user profile, lets several documents convert in parallel: soffice refuses
+to run twice on one profile, and a profile that is already initialized
+starts much faster than a fresh one, so profiles are kept between jobs.
+"""
+
+import os
+import queue
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple, Union
+
+# Default locations of soffice when it is not on PATH
+SOFFICE_CANDIDATES = [
+    r"C:\Program Files\LibreOffice\program\soffice.exe",
+    r"C:\Program Files (x86)\LibreOffice\program\soffice.exe",
+    "/Applications/LibreOffice.app/Contents/MacOS/soffice",
+    "/usr/lib/libreoffice/program/soffice",
+    "/opt/libreoffice/program/soffice",
+]
+
+SOFFICE_FLAGS = ['--headless', '--invisible', '--norestore', '--nologo',
+                 '--nodefault', '--nolockcheck']
+
+
+def find_soffice() -> Optional[str]:
+    """Path of the soffice executable, or None if LibreOffice is not installed"""
+    for name in ('soffice', 'libreoffice'):
+        path = shutil.which(name)
+        if path:
+            return path
+    for candidate in SOFFICE_CANDIDATES:
+        if os.path.exists(candidate):
+            return candidate
+    return None
+
+
+class LibreOfficePool:
+    """Pool of soffice converter slots with one persistent user profile each"""
+
+    def __init__(self, workers: Optional[int] = None, soffice: Optional[str] = None,
+                 profile_root: Optional[Union[str, Path]] = None, timeout: float = 300,
+                 warm: bool = False):
+        """
+        Args:
+            workers: parallel conversions (default: min(4, CPU count))
+            soffice: soffice executable (default: find_soffice())
+            profile_root: directory of the per-slot profiles
+                (default: ~/.cache/smartnougat/libreoffice)
+            timeout: seconds per conversion
+            warm: initialize every slot profile in the background right away
+                (default: each profile is initialized on its first conversion,
+                so a single conversion starts only one soffice)
+        """
+        self.soffice = soffice or find_soffice()
+        if self.soffice is None:
+            raise FileNotFoundError("LibreOffice (soffice) not found")
+        self.workers = workers or min(4, os.cpu_count() or 1)
+        self.timeout = timeout
+        self.profile_root = Path(profile_root or Path.home() / ".cache" / "smartnougat" / "libreoffice")
+
+        self._slots = queue.Queue()
+        self._warm = set()
+        self._warm_lock = threading.Lock()
+        for i in range(self.workers):
+            self._slots.put(self.profile_root / f"profile_{i}")
+
+        self._executor = ThreadPoolExecutor(max_workers=self.workers,
+                                            thread_name_prefix="soffice")
+        if warm:
+            for _ in range(self.workers):
+                self._executor.submit(self._with_slot, self._warm_up)
+
+    def _command(self, profile: Path, *args) -> List[str]:
+        return [self.soffice, f"-env:UserInstallation={profile.resolve().as_uri()}",
+                *SOFFICE_FLAGS, *args]
+
+    def _with_slot(self, func, *args):
+        profile = self._slots.get()
+        try:
+            return func(profile, *args)
+        finally:
+            self._slots.put(profile)
+
+    def _warm_up(self, profile: Path):
+        """Create the profile once so later conversions skip first-start setup"""
+        with self._warm_lock:
+            if profile in self._warm:
+                return
+        profile.mkdir(parents=True, exist_ok=True)
+        if not (profile / "user").exists():
+            subprocess.run(self._command(profile, '--terminate_after_init'),
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                           timeout=self.timeout)
+        with self._warm_lock:
+            self._warm.add(profile)
+
+    def _convert(self, profile: Path, docx_path: Path, pdf_path: Path) -> Path:
+        self._warm_up(profile)
+        # soffice names the output after the input, so every job gets its own outdir
+        with tempfile.TemporaryDirectory(dir=pdf_path.parent, prefix=".soffice_") as tmp:
+            result = subprocess.run(
+                self._command(profile, '--convert-to', 'pdf', '--outdir', tmp, str(docx_path)),
+                capture_output=True, text=True, timeout=self.timeout
+            )
+            produced = Path(tmp) / f"{docx_path.stem}.pdf"
+            if not produced.exists():
+                message = (result.stderr or result.stdout or '').strip()
+                raise RuntimeError(f"LibreOffice conversion failed ({result.returncode}): {message}")
+            os.replace(produced, pdf_path)
+        return pdf_path
+
+    def submit(self, docx_path: Union[str, Path], pdf_path: Optional[Union[str, Path]] = None):
+        """Queue one conversion; returns a Future of the PDF path"""
+        docx_path = Path(docx_path).resolve()
+        pdf_path = Path(pdf_path) if pdf_path else docx_path.with_suffix('.pdf')
+        pdf_path.parent.mkdir(parents=True, exist_ok=True)
+        return self._executor.submit(self._with_slot, self._convert, docx_path, pdf_path)
+
+    def convert(self, docx_path: Union[str, Path], pdf_path: Optional[Union[str, Path]] = None) -> Path:
+        """Convert one DOCX, blocking until the PDF is written"""
+        return self.submit(docx_path, pdf_path).result()
+
+    def convert_many(self, jobs: Iterable[Tuple[Union[str, Path], Optional[Union[str, Path]]]]) -> List[Path]:
+        """Convert (docx_path, pdf_path) pairs in parallel, in input order"""
+        futures = [self.submit(docx_path, pdf_path) for docx_path, pdf_path in jobs]
+        return [future.result() for future in futures]
+
+    def close(self):
+        """Wait for queued conversions and stop the worker threads"""
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="DOCX → PDF with LibreOffice headless")
+    parser.add_argument('docx', nargs='+', help='DOCX files')
+    parser.add_argument('-o', '--outdir', help='Output directory (default: next to each DOCX)')
+    parser.add_argument('-j', '--workers', type=int, help='Parallel conversions')
+    args = parser.parse_args()
+
+    if find_soffice() is None:
+        print("Error: LibreOffice (soffice) not found")
+        sys.exit(1)
+
+    jobs = [(path, Path(args.outdir) / f"{Path(path).stem}.pdf" if args.outdir else None)
+            for path in args.docx]
+    with LibreOfficePool(workers=args.workers) as pool:
+        for pdf_path in pool.convert_many(jobs):
+            print(f"[Success] {pdf_path}")
+
+
+if __name__ == "__main__":
+    main()
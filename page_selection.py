@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Page selection
+Parses page specs such as "1-5,9,12:" into a sorted, de-duplicated array
+of 0-based page indices for a document with a known page count. The PDF,
+DOCX and GUI paths share this parser so a spec means the same everywhere.
+"""
+
+import re
+from typing import Iterator, List, Optional, Tuple
+
+import numpy as np
+
+# One comma-separated item: "7", "3-5", "3:5", "12-", ":20"
+_ITEM_RE = re.compile(r'^\s*(\d*)\s*([-:])?\s*(\d*)\s*$')
+
+
+def parse_page_ranges(spec: str) -> List[Tuple[int, Optional[int]]]:
+    """
+    Parse a page spec into 1-based inclusive (start, end) ranges
+
+    end is None for open ranges ("12-", "12:"). An empty spec selects
+    every page. Raises ValueError on malformed items.
+    """
+    spec = (spec or '').strip()
+    if not spec:
+        return [(1, None)]
+
+    ranges = []
+    for item in spec.split(','):
+        if not item.strip():
+            continue
+        match = _ITEM_RE.match(item)
+        if not match or not (match.group(1) or match.group(3)):
+            raise ValueError(f"잘못된 페이지 범위 형식: {item.strip()!r} (예: '1-5', '1,3,5', '9,12:')")
+        start_text, separator, end_text = match.groups()
+        start = int(start_text) if start_text else 1
+        if not separator:
+            end = start
+        else:
+            end = int(end_text) if end_text else None
+        if start < 1 or (end is not None and end < start):
+            raise ValueError(f"잘못된 페이지 범위: {item.strip()!r}")
+        ranges.append((start, end))
+
+    if not ranges:
+        raise ValueError(f"잘못된 페이지 범위 형식: {spec!r}")
+    return ranges
+
+
+def select_pages(spec: str, total_pages: int) -> np.ndarray:
+    """
+    Page spec → sorted unique 0-based page indices (int32)
+
+    Ranges are clipped to total_pages; pages past the end are dropped.
+    The result may be empty.
+    """
+    selected = np.zeros(max(total_pages, 0), dtype=bool)
+    for start, end in parse_page_ranges(spec):
+        stop = total_pages if end is None else min(end, total_pages)
+        if start <= stop:
+            selected[start - 1:stop] = True
+    return np.flatnonzero(selected).astype(np.int32)
+
+
+def iter_runs(indices) -> Iterator[Tuple[int, int]]:
+    """Consecutive runs of sorted page indices as inclusive (first, last) pairs"""
+    indices = np.asarray(indices, dtype=np.int64)
+    if indices.size == 0:
+        return
+    breaks = np.flatnonzero(np.diff(indices) != 1) + 1
+    for run in np.split(indices, breaks):
+        yield int(run[0]), int(run[-1])
+
+
+def format_page_ranges(indices) -> str:
+    """0-based page indices → compact 1-based spec, e.g. "1-5,9,12-20" """
+    return ','.join(str(first + 1) if first == last else f"{first + 1}-{last + 1}"
+                    for first, last in iter_runs(indices))
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Structured progress events
+The processor reports progress as JSON objects instead of log text, either to
+a callback or as one JSON line per event on a stream (--progress-fd), so the
+GUI and batch tools don't have to scrape Korean log lines.
+
+Every event has "event" and "elapsed" (seconds since start):
+    start       input, output_dir
+    pages       total (pages to process), source ('pdf' | 'docx_omml')
+    stage_start name                        (a document-level stage begins)
+    stage       name, seconds               (that stage finished)
+    page        page (1-based), done, total, formulas, formulas_total, seconds, eta
+    done        pages, formulas, seconds, stages ({name: total seconds})
+    error       message
+"""
+
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional, TextIO
+
+# Event lines always start with this, so they can be told apart from log
+# lines when both share one stream
+EVENT_PREFIX = '{"event"'
+
+
+class ProgressReporter:
+    """Emits progress events to a JSON-lines stream and/or a callback"""
+
+    def __init__(self, stream: Optional[TextIO] = None,
+                 callback: Optional[Callable[[Dict], None]] = None):
+        """
+        Args:
+            stream: text stream for JSON lines (e.g. open_progress_stream(fd))
+            callback: called with each event dict on the processing thread
+        """
+        self.stream = stream
+        self.callback = callback
+        self._reset()
+
+    def _reset(self):
+        self.start_time = time.time()
+        self.stages = {}
+        self.total_pages = 0
+        self.pages_done = 0
+        self.formulas_total = 0
+        self._page_seconds = 0.0
+
+    @property
+    def elapsed(self) -> float:
+        return time.time() - self.start_time
+
+    def emit(self, event: str, **fields):
+        if self.stream is None and self.callback is None:
+            return
+        payload = {'event': event, 'elapsed': round(self.elapsed, 3), **fields}
+        if self.stream is not None:
+            try:
+                self.stream.write(json.dumps(payload, ensure_ascii=False) + '\n')
+                self.stream.flush()
+            except (OSError, ValueError):
+                # A closed reader must not stop processing
+                self.stream = None
+        if self.callback is not None:
+            self.callback(payload)
+
+    def start(self, input_path, output_dir):
+        """Begin a document: resets the clock and the counters"""
+        self._reset()
+        self.emit('start', input=str(input_path), output_dir=str(output_dir))
+
+    def set_pages(self, total: int, source: str = 'pdf'):
+        self.total_pages = total
+        self.emit('pages', total=total, source=source)
+
+    @contextmanager
+    def stage(self, name: str):
+        """Time a processing stage; repeated stages accumulate in self.stages"""
+        self.emit('stage_start', name=name)
+        stage_start = time.time()
+        try:
+            yield
+        finally:
+            seconds = time.time() - stage_start
+            self.stages[name] = self.stages.get(name, 0.0) + seconds
+            self.emit('stage', name=name, seconds=round(seconds, 3))
+
+    def page_done(self, page_num: int, formulas: int, seconds: float):
+        """One page finished (page_num is the 0-based page of the source document)"""
+        self.pages_done += 1
+        self.formulas_total += formulas
+        self._page_seconds += seconds
+        remaining = max(self.total_pages - self.pages_done, 0)
+        eta = self._page_seconds / self.pages_done * remaining
+        self.emit('page', page=page_num + 1, done=self.pages_done, total=self.total_pages,
+                  formulas=formulas, formulas_total=self.formulas_total,
+                  seconds=round(seconds, 3), eta=round(eta, 1))
+
+    def finish(self, pages: int, formulas: int):
+        self.emit('done', pages=pages, formulas=formulas, seconds=round(self.elapsed, 3),
+                  stages={name: round(seconds, 3) for name, seconds in self.stages.items()})
+
+    def fail(self, message: str):
+        self.emit('error', message=message)
+
+
+def open_progress_stream(fd: int) -> TextIO:
+    """Text stream for progress JSON lines on a file descriptor (1/2 share stdout/stderr)"""
+    if fd == 1:
+        return sys.stdout
+    if fd == 2:
+        return sys.stderr
+    return os.fdopen(fd, 'w', encoding='utf-8', buffering=1)
+
+
+def parse_event(line: str) -> Optional[Dict]:
+    """Progress event from one output line, or None for ordinary log lines"""
+    line = line.strip()
+    if not line.startswith(EVENT_PREFIX):
+        return None
+    try:
+        return json.loads(line)
+    except ValueError:
+        return None
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Compact columnar results store (model.npz)
+Stores the model.json detections as flat numpy columns plus UTF-8 string
+tables, so loaders can read a single page without parsing JSON. The archive
+is written uncompressed, which lets the reader memory-map each column and
+touch only the bytes of the pages it reads.
+"""
+
+import struct
+import zipfile
+from pathlib import Path
+from typing import Dict, Iterator, List, Union
+
+import numpy as np
+
+FORMAT_VERSION = 2
+
+
+def _pack_strings(strings: List[str]):
+    """UTF-8 blob + offsets (offsets[i]:offsets[i+1] is string i)"""
+    encoded = [s.encode('utf-8') for s in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(b) for b in encoded])
+    blob = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+    return blob, offsets
+
+
+def save_results_npz(model_data: List[Dict], path: Union[str, Path]) -> Path:
+    """
+    Write model.json-style page list as model.npz
+
+    Columns:
+        page_idx (P,), page_size (P, 2), det_start (P+1,) - page i owns
+        detections det_start[i]:det_start[i+1]
+        bbox (N, 4), score (N,), latex_score (N,, NaN if unknown),
+        category_id (N,), latex_blob/latex_offsets - LaTeX string table,
+        decode_blob/decode_offsets - decode method per detection,
+        merge_blob/merge_offsets - merge kind ('' if not merged),
+        merged_from (M,) with merged_start (N+1,) - detection k merged
+        merged_from[merged_start[k]:merged_start[k+1]],
+        no_image (N,) - 1 for detections without a crop image (DOCX OMML)
+    """
+    path = Path(path)
+    dets = [det for page in model_data for det in page.get('layout_dets', [])]
+
+    det_start = np.zeros(len(model_data) + 1, dtype=np.int64)
+    det_start[1:] = np.cumsum([len(page.get('layout_dets', [])) for page in model_data])
+
+    bbox = np.array([[det['poly'][0], det['poly'][1], det['poly'][4], det['poly'][5]]
+                     for det in dets], dtype=np.int32).reshape(-1, 4)
+    latex_score = np.array([np.nan if det.get('latex_score') is None else det['latex_score']
+                            for det in dets], dtype=np.float32)
+    latex_blob, latex_offsets = _pack_strings([det.get('latex', '') for det in dets])
+    decode_blob, decode_offsets = _pack_strings([det.get('decode', 'greedy') for det in dets])
+    merge_blob, merge_offsets = _pack_strings([det.get('merge', '') for det in dets])
+    merged_lists = [det.get('merged_from') or [] for det in dets]
+    merged_start = np.zeros(len(dets) + 1, dtype=np.int64)
+    merged_start[1:] = np.cumsum([len(m) for m in merged_lists])
+    merged_from = np.array([i for m in merged_lists for i in m], dtype=np.int32)
+
+    np.savez(
+        path,
+        version=np.array(FORMAT_VERSION),
+        page_idx=np.array([page['page_idx'] for page in model_data], dtype=np.int32),
+        page_size=np.array([page['page_size'] for page in model_data], dtype=np.int32).reshape(-1, 2),
+        det_start=det_start,
+        bbox=bbox,
+        score=np.array([det['score'] for det in dets], dtype=np.float32),
+        latex_score=latex_score,
+        category_id=np.array([det['category_id'] for det in dets], dtype=np.uint8),
+        latex_blob=latex_blob,
+        latex_offsets=latex_offsets,
+        decode_blob=decode_blob,
+        decode_offsets=decode_offsets,
+        merge_blob=merge_blob,
+        merge_offsets=merge_offsets,
+        merged_from=merged_from,
+        merged_start=merged_start,
+        no_image=np.array([bool(det.get('no_image')) for det in dets], dtype=np.uint8)
+    )
+    return path
+
+
+def _map_member(path: Path, info: zipfile.ZipInfo):
+    """Memory-map an uncompressed .npy member of an .npz, or None if it cannot be mapped"""
+    if info.compress_type != zipfile.ZIP_STORED:
+        return None
+    with open(path, 'rb') as f:
+        # Local file header: fixed 30 bytes, then the name and extra field
+        f.seek(info.header_offset)
+        header = f.read(30)
+        name_len, extra_len = struct.unpack('<HH', header[26:30])
+        f.seek(info.header_offset + 30 + name_len + extra_len)
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+        else:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+        offset = f.tell()
+    if dtype.hasobject or not shape or 0 in shape:
+        return None
+    return np.memmap(path, dtype=dtype, mode='r', offset=offset, shape=shape,
+                     order='F' if fortran_order else 'C')
+
+
+class ResultsReader:
+    """Random-access reader for model.npz"""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self._npz = np.load(self.path)
+        self._members = {info.filename[:-4]: info for info in self._npz.zip.infolist()
+                         if info.filename.endswith('.npy')}
+        self.page_idx = self._npz['page_idx']
+        self.det_start = self._npz['det_start']
+        self._columns = {}
+
+    def _col(self, name: str) -> np.ndarray:
+        # Columns are memory-mapped, so slicing one page reads only that page's
+        # bytes; members that cannot be mapped (compressed, empty) are loaded
+        if name not in self._columns:
+            column = _map_member(self.path, self._members[name])
+            self._columns[name] = column if column is not None else self._npz[name]
+        return self._columns[name]
+
+    def has(self, name: str) -> bool:
+        return name in self._members
+
+    def _string(self, table: str, det: int) -> str:
+        offsets = self._col(f'{table}_offsets')
+        blob = self._col(f'{table}_blob')
+        return bytes(blob[offsets[det]:offsets[det + 1]]).decode('utf-8')
+
+    def __len__(self) -> int:
+        return len(self.page_idx)
+
+    @property
+    def num_formulas(self) -> int:
+        return int(self.det_start[-1])
+
+    def latex(self, det: int) -> str:
+        """LaTeX of global detection index det"""
+        return self._string('latex', det)
+
+    def page(self, i: int) -> Dict:
+        """Page i (position in file, not page_idx) in model.json layout"""
+        start, end = int(self.det_start[i]), int(self.det_start[i + 1])
+        bbox = self._col('bbox')[start:end]
+        score = self._col('score')[start:end]
+        latex_score = self._col('latex_score')[start:end]
+        category_id = self._col('category_id')[start:end]
+
+        # FORMAT_VERSION 1 files have no decode/merge columns
+        extended = self.has('decode_blob')
+        if extended:
+            merged_start = self._col('merged_start')[start:end + 1]
+            merged_from = self._col('merged_from')
+            no_image = self._col('no_image')[start:end]
+
+        layout_dets = []
+        for k, det in enumerate(range(start, end)):
+            x1, y1, x2, y2 = (int(v) for v in bbox[k])
+            entry = {
+                'category_id': int(category_id[k]),
+                'poly': [x1, y1, x2, y1, x2, y2, x1, y2],
+                'score': float(score[k]),
+                'latex_score': None if np.isnan(latex_score[k]) else float(latex_score[k])
+            }
+            if extended:
+                entry['decode'] = self._string('decode', det)
+            entry['latex'] = self.latex(det)
+            if extended and merged_start[k + 1] > merged_start[k]:
+                entry['merged_from'] = [int(v) for v in merged_from[merged_start[k]:merged_start[k + 1]]]
+                entry['merge'] = self._string('merge', det)
+            if extended and no_image[k]:
+                entry['no_image'] = True
+            layout_dets.append(entry)
+
+        return {
+            'page_idx': int(self.page_idx[i]),
+            'page_size': [int(v) for v in self._col('page_size')[i]],
+            'layout_dets': layout_dets
+        }
+
+    def __iter__(self) -> Iterator[Dict]:
+        for i in range(len(self)):
+            yield self.page(i)
+
+    def close(self):
+        self._npz.close()
@@ -21,9 +21,23 @@ from PIL import Image
 import numpy as np
 from loguru import logger
 from typing import List, Dict, Optional, Union, Tuple
+import re
+import shutil
 import hashlib
+from contextlib import contextmanager
 import cv2
 
+from vector_math import VectorFormulaReader
+from spatial_index import GridIndex
+from results_store import save_results_npz
+from page_selection import select_pages, iter_runs, format_page_ranges
+from docx_math import read_docx_math
+from content_cache import ContentCache, file_digest
+from progress_events import ProgressReporter, open_progress_stream
+from stage_profiler import StageProfiler
+from viewer_generator import write_viewer
+from markdown_anchors import formula_markdown, create_fixed_md
+
 # Nougat 관련 imports
 nougat_path = Path(r"/mnt/c/git/nougat-latex-ocr/nougat-latex-ocr")
 if nougat_path.exists():
@@ -69,7 +83,13 @@ try:
     DOCX_AVAILABLE = True
 except ImportError:
     DOCX_AVAILABLE = False
-    logger.warning("docx2pdf가 설치되지 않았습니다. DOCX 지원이 비활성화됩니다.")
+    logger.warning("docx2pdf가 설치되지 않았습니다. DOCX는 Word(win32com) 또는 LibreOffice로만 변환합니다.")
+
+# LibreOffice headless (Word 없이 DOCX → PDF, Linux 워커용)
+from office_convert import LibreOfficePool, find_soffice
+LIBREOFFICE_AVAILABLE = find_soffice() is not None
+if LIBREOFFICE_AVAILABLE:
+    logger.info("LibreOffice 사용 가능 - Word 없이 DOCX 변환 지원")
 
 # Windows COM 지원 (선택사항)
 try:
@@ -81,17 +101,75 @@ except ImportError:
     WIN32COM_AVAILABLE = False
     logger.info("win32com이 없습니다. 전체 DOCX만 처리 가능")
 
-
 class SmartNougatStandalone:
     """완전히 독립적인 Nougat 기반 문서 처리 파이프라인"""
     
-    def __init__(self, device: str = 'auto', models_dir: Optional[str] = None):
+    # 저신뢰 수식 재디코딩 정책
+    FALLBACK_POLICIES = ('none', 'beam', 'expand', 'both')
+    
+    # layout.pdf 생성 방식
+    LAYOUT_MODES = ('full', 'annotated', 'overlay', 'none')
+    
+    # 수식 페이지 사전 판별용 수학 폰트 이름 조각 (소문자)
+    MATH_FONT_HINTS = ('cmmi', 'cmsy', 'cmex', 'msam', 'msbm', 'eufm', 'rsfs',
+                       'math', 'symbol', 'stix', 'euclid', 'mt extra', 'mtextra')
+    
+    # 수학 기호 유니코드 범위 (그리스 문자, 화살표, 연산자, 수학 영숫자 등)
+    MATH_UNICODE_RANGES = ((0x0370, 0x03FF), (0x2070, 0x209F), (0x2190, 0x21FF),
+                           (0x2200, 0x22FF), (0x2300, 0x23FF), (0x27C0, 0x27EF),
+                           (0x2980, 0x29FF), (0x2A00, 0x2AFF), (0x1D400, 0x1D7FF))
+    
+    # 일반 텍스트 폰트로 조판된 수식 판별 (기울임 변수 옆 ASCII 연산자, 변수-연산자-항 패턴)
+    ASCII_MATH_OPERATORS = set('=+-<>/^*|')
+    ASCII_MATH_RE = re.compile(r'(?<![A-Za-z])[A-Za-z]\s*[=<>+]\s*[A-Za-z0-9(]|\d\s*[=<>]\s*\d')
+    # 위/아래 첨자 판별: 줄 기준선에서 글자 크기 대비 이만큼 이상 벗어나고 더 작은 글자
+    SCRIPT_SHIFT_RATIO = 0.15
+    SCRIPT_SIZE_RATIO = 0.9
+    
+    # 페이지 렌더링 캐시 키: PDF 간접 참조와 따라가지 않을 역참조 (페이지 트리, 구조 트리)
+    PDF_REF_RE = re.compile(r'(\d+) \d+ R\b')
+    PDF_BACKREF_RE = re.compile(r'/(?:Parent|P)\s+\d+ \d+ R\b')
+    
+    def __init__(self, device: str = 'auto', models_dir: Optional[str] = None,
+                 fallback_policy: str = 'beam', min_logprob: float = -0.3,
+                 fallback_beams: int = 4, adaptive_crop: bool = True,
+                 merge_detections: bool = True, prefilter: bool = True,
+                 two_pass: bool = False, crop_zoom: float = 3.0,
+                 vector_fast_path: bool = True, layout_mode: str = 'full',
+                 save_subset_pdf: bool = False, office_workers: Optional[int] = None,
+                 docx_math: bool = True, cache_dir: Optional[str] = None,
+                 cache_size_gb: float = 5.0, progress: Optional[ProgressReporter] = None,
+                 trace: bool = False):
         """
         SmartNougat 초기화
         
         Args:
             device: 'cuda', 'cpu', 또는 'auto' (자동 감지)
             models_dir: 모델 디렉토리 경로
+            fallback_policy: 저신뢰 수식 재디코딩 방식 ('none', 'beam', 'expand', 'both')
+            min_logprob: 평균 토큰 로그확률이 이 값보다 낮으면 재디코딩
+            fallback_beams: 재디코딩 시 사용할 빔 개수
+            adaptive_crop: 잉크 기준으로 수식 crop을 맞출지 여부 (False면 고정 15%/3% 확장)
+            merge_detections: 포함된 박스 제거 및 같은 기준선의 조각 박스 병합 여부
+            prefilter: 텍스트/폰트 분석으로 수식이 없는 페이지의 렌더링·감지 생략 여부
+            two_pass: 1배 렌더링으로 감지 후 수식 영역만 고해상도로 다시 렌더링할지 여부
+            crop_zoom: two_pass 모드에서 수식 영역 렌더링 배율
+            vector_fast_path: 텍스트 레이어의 글리프로 단순 인라인 수식을 직접 복원할지 여부
+            layout_mode: layout.pdf 생성 방식
+                'full' - 처리한 페이지마다 박스 그리기 (처리한 페이지만 저장)
+                'annotated' - 수식 박스가 있는 페이지만 저장
+                'overlay' - 박스를 주석으로 추가 (전체 처리 시 원본 복사본에 증분 저장,
+                            페이지 범위 처리 시 처리한 페이지만 저장)
+                'none' - 생성하지 않음
+            save_subset_pdf: 페이지 범위 지정 시 선택한 페이지만 담은 PDF를 처리 후 따로 저장할지 여부
+            office_workers: LibreOffice 변환 슬롯 수 (Word가 없을 때 DOCX 변환, 기본: 1 - 문서는
+                한 번에 하나씩 변환하며 슬롯 프로필은 첫 변환 때 초기화)
+            docx_math: DOCX의 OMML 수식을 렌더링 없이 직접 LaTeX로 변환할지 여부
+                (OLE/MathType 수식이 있으면 기존 PDF 경로 사용)
+            cache_dir: 변환 PDF 등 내용 주소 기반 캐시 디렉토리 (기본: models_dir/cache)
+            cache_size_gb: 캐시 크기 제한 (GB, 초과 시 오래 쓰지 않은 항목부터 삭제, 0이면 캐시 사용 안 함)
+            progress: 진행 이벤트(JSON) 보고 대상 (GUI/배치 도구용, 기본: 보고하지 않음)
+            trace: 단계별 구간을 Chrome trace 형식(trace.json)으로도 저장할지 여부
         """
         # 디바이스 설정
         if device == 'auto':
@@ -104,6 +182,37 @@ class SmartNougatStandalone:
         # 모델 디렉토리
         self.models_dir = models_dir or os.path.expanduser("~/.cache/smartnougat")
         
+        # 실행/페이지 범위와 관계없이 재사용하는 캐시 (DOCX 변환 PDF 등)
+        self.cache = ContentCache(cache_dir or os.path.join(self.models_dir, "cache"),
+                                  max_bytes=int(cache_size_gb * 1024 ** 3))
+        
+        # 진행 이벤트 (페이지 진행, 단계별 시간, 수식 수, 남은 시간)
+        self.progress = progress or ProgressReporter()
+        
+        # 단계별 시간 측정 (processing_summary.json의 stage_timings, 선택적으로 trace.json)
+        self.profiler = StageProfiler()
+        self.trace = trace
+        
+        # 신뢰도 기반 재디코딩 설정
+        if fallback_policy not in self.FALLBACK_POLICIES:
+            raise ValueError(f"알 수 없는 재디코딩 정책: {fallback_policy}")
+        self.fallback_policy = fallback_policy
+        self.min_logprob = min_logprob
+        self.fallback_beams = fallback_beams
+        self.adaptive_crop = adaptive_crop
+        self.merge_detections = merge_detections
+        self.prefilter = prefilter
+        self.two_pass = two_pass
+        self.crop_zoom = crop_zoom
+        self.vector_fast_path = vector_fast_path
+        if layout_mode not in self.LAYOUT_MODES:
+            raise ValueError(f"알 수 없는 layout 방식: {layout_mode}")
+        self.layout_mode = layout_mode
+        self.save_subset_pdf = save_subset_pdf
+        self.office_workers = office_workers
+        self._office_pool = None  # LibreOffice 변환 풀 (첫 DOCX 변환 시 생성, 문서 간 재사용)
+        self.docx_math = docx_math
+        
         # 모델 초기화
         self._init_models()
         
@@ -214,20 +323,28 @@ class SmartNougatStandalone:
             logger.warning(f"OCR 모델 로딩 실패: {e}")
             return None
             
+    @contextmanager
+    def _stage(self, name: str):
+        """문서 단위 처리 단계 (진행 이벤트 + 단계별 시간 측정)"""
+        with self.progress.stage(name), self.profiler.span(name):
+            yield
+            
     def process_document(self, input_path: str, output_dir: str, 
-                        page_range: Optional[str] = None) -> Dict:
+                        page_range: Optional[str] = None, finish: bool = True) -> Dict:
         """
         문서 처리 메인 함수
         
         Args:
             input_path: 입력 파일 경로 (PDF/DOCX)
             output_dir: 출력 디렉토리
-            page_range: 페이지 범위 (예: "1-5", "3,5,7")
+            page_range: 페이지 범위 (예: "1-5", "3,5,7", "1-5,9,12:")
+            finish: 처리 시간/요약 저장/완료(done) 이벤트까지 수행할지 여부 (후처리 단계가
+                    이어지면 False로 두고 호출한 쪽에서 후처리 후 finish_document 호출)
             
         Returns:
             처리 결과 딕셔너리
         """
-        start_time = time.time()
+        self._start_time = time.time()
         input_path = Path(input_path)
         
         # 입력 검증
@@ -245,99 +362,168 @@ class SmartNougatStandalone:
         
         logger.info(f"문서 처리 시작: {input_path}")
         logger.info(f"출력 디렉토리: {output_path}")
-        
-        # DOCX → PDF 변환 (필수)
-        if input_path.suffix.lower() == '.docx':
-            # 먼저 전체 DOCX를 PDF로 변환
-            if not DOCX_AVAILABLE:
-                raise ImportError("DOCX 처리를 위해 docx2pdf를 설치하세요: pip install docx2pdf")
-            pdf_path = self._convert_docx_to_pdf(input_path, output_path)
-            
-            # 페이지 범위가 있으면 추출
-            if page_range:
-                pdf_path = self._extract_pages(pdf_path, page_range, output_path)
-        else:
-            pdf_path = input_path
-            
-            # PDF의 페이지 범위 처리
-            if page_range:
-                pdf_path = self._extract_pages(pdf_path, page_range, output_path)
+        self.progress.start(input_path, output_path)
+        self.profiler.reset()
+        
+        # DOCX 수식이 모두 OMML이면 PDF 변환/렌더링/인식 없이 직접 LaTeX로 변환
+        result = None
+        if input_path.suffix.lower() == '.docx' and self.docx_math:
+            with self._stage('docx_math'):
+                result = self._process_docx_math(input_path, output_path, page_range)
+            
+        if result is None:
+            # DOCX → PDF 변환
+            if input_path.suffix.lower() == '.docx':
+                # 먼저 전체 DOCX를 PDF로 변환
+                if not (DOCX_AVAILABLE or WIN32COM_AVAILABLE or LIBREOFFICE_AVAILABLE):
+                    raise ImportError("DOCX 처리를 위해 LibreOffice를 설치하거나 docx2pdf를 설치하세요: pip install docx2pdf")
+                with self._stage('convert'):
+                    pdf_path = self._convert_docx_to_pdf(input_path, output_path)
+            else:
+                pdf_path = input_path
             
-        # PDF 처리
-        result = self._process_pdf(pdf_path, output_path)
+            # PDF는 한 번만 열어 페이지 수 확인, 처리, 선택 페이지 PDF 저장에 함께 사용
+            pdf_doc = fitz.open(pdf_path)
+            try:
+                # 페이지 범위는 원본 문서의 페이지 인덱스 배열로 변환 (중간 PDF를 만들지 않음)
+                page_indices = None
+                if page_range:
+                    total_pages = len(pdf_doc)
+                    page_indices = select_pages(page_range, total_pages)
+                    if len(page_indices) == 0:
+                        raise ValueError(f"페이지 범위에 해당하는 페이지가 없습니다: {page_range} (전체 {total_pages}페이지)")
+                
+                # PDF 처리
+                result = self._process_pdf(pdf_doc, pdf_path, output_path, page_indices)
+                
+                # 선택한 페이지만 담은 PDF는 요청한 경우에만 처리 후 저장
+                if page_indices is not None and self.save_subset_pdf:
+                    with self._stage('subset_pdf'):
+                        self._write_page_subset(pdf_doc, pdf_path, page_indices, output_path)
+            finally:
+                pdf_doc.close()
+        
+        if finish:
+            self.finish_document(result)
+        return result
+        
+    def finish_document(self, result: Dict) -> Dict:
+        """
+        처리 시간과 단계별 시간 기록, 요약/trace 저장, 완료 이벤트
+        
+        process_document(finish=False) 뒤에 후처리 단계(fix_latex, fixed_viewer 등)를
+        _stage로 실행했다면 그 단계들까지 끝난 뒤 호출해 요약에 포함시킨다.
+        """
+        output_path = Path(result['output_dir'])
         
         # 처리 시간
-        result['processing_time'] = time.time() - start_time
+        result['processing_time'] = time.time() - self._start_time
+        result['stage_timings'] = self.profiler.summary()
+        self._log_stage_timings(result['stage_timings'])
         
         # 요약 저장
         self._save_processing_summary(result, output_path)
+        if self.trace:
+            trace_path = self.profiler.write_chrome_trace(output_path / 'trace.json')
+            logger.info(f"Chrome trace 저장: {trace_path}")
+        self.progress.finish(result['pages'], result['total_formulas'])
         
         logger.info(f"문서 처리 완료: {result['processing_time']:.2f}초")
         
         return result
         
-    def _process_pdf(self, pdf_path: Path, output_path: Path) -> Dict:
-        """PDF 처리 핵심 로직"""
+    def _process_pdf(self, pdf_doc, pdf_path: Path, output_path: Path,
+                     page_indices: Optional[np.ndarray] = None) -> Dict:
+        """
+        PDF 처리 핵심 로직
+        
+        Args:
+            pdf_doc: 열린 원본 PDF 문서 (호출한 쪽에서 닫음)
+            pdf_path: 원본 PDF 경로 (페이지 범위를 잘라낸 중간 PDF가 아님)
+            page_indices: 처리할 원본 페이지 번호 (0부터, 정렬된 select_pages 결과, None이면 전체)
+        """
         logger.info("PDF 처리 시작...")
         
         # 실제 처리에 사용된 PDF 경로 저장
         self.processed_pdf_path = pdf_path
         
-        # 원본 페이지 번호 오프셋 계산 (pages_로 시작하는 파일인 경우)
-        self.page_offset = 0
-        if "pages_" in pdf_path.name:
-            # 파일명에서 페이지 범위 추출 (예: 1_Ai_pages_9.pdf -> 9)
-            import re
-            match = re.search(r'pages_(\d+)', pdf_path.name)
-            if match:
-                self.page_offset = int(match.group(1)) - 1  # 0-based index
-        
         # PyMuPDF 캐시 초기화
         fitz.TOOLS.store_shrink(100)  # 캐시 크기를 100%로 축소 (모두 삭제)
         
-        # PDF 열기
-        pdf_doc = fitz.open(pdf_path)
-        total_pages = len(pdf_doc)
+        # 페이지 렌더링 캐시 키용 간접 객체 해시 (문서 단위)
+        self._xref_digests = {}
+        
+        if page_indices is None:
+            page_indices = list(range(len(pdf_doc)))
+        else:
+            page_indices = page_indices.tolist()
+        total_pages = len(page_indices)
+        self.progress.set_pages(total_pages, source='pdf')
         
         # 디렉토리 구조 생성
         dirs = self._create_directory_structure(output_path)
         
+        # layout.pdf 대상 문서 (페이지 처리가 끝날 때마다 박스를 그림)
+        layout_in_place = self.layout_mode == 'overlay' and total_pages == len(pdf_doc)
+        layout_doc = self._open_layout_target(pdf_path, output_path, layout_in_place)
+        
         # 결과 저장용
         all_pages_data = []
         all_formulas = []
+        skipped_pages = []
         
-        # 페이지별 처리
-        for page_num in range(total_pages):
-            # 원본 페이지 번호 계산
-            original_page_num = page_num + self.page_offset
-            logger.info(f"페이지 {original_page_num + 1} 처리 중... (파일 내 {page_num + 1}/{total_pages})")
+        # 페이지별 처리 (page_num은 원본 문서의 페이지 번호)
+        for position, page_num in enumerate(page_indices):
+            logger.info(f"페이지 {page_num + 1} 처리 중... ({position + 1}/{total_pages})")
+            page_start = time.time()
             
             page = pdf_doc[page_num]
-            page_data = self._process_single_page(page, original_page_num, dirs)
+            with self.profiler.span('page', page=page_num + 1):
+                page_data = self._process_single_page(page, page_num, dirs)
+            if page_data.get('skipped'):
+                skipped_pages.append({
+                    'page_num': page_num,
+                    'reason': page_data['skip_reason']
+                })
             
             all_pages_data.append(page_data)
             all_formulas.extend(page_data.get('formulas', []))
             
+            # 처리 완료된 페이지에 바로 레이아웃 박스 표시
+            if layout_doc is not None:
+                with self.profiler.span('layout_boxes'):
+                    self._add_layout_page(layout_doc, pdf_doc, page_num, page_data, layout_in_place)
+                    
+            self.progress.page_done(page_num, len(page_data.get('formulas', [])),
+                                    time.time() - page_start)
+            
             # 메모리 관리 - 매 5페이지마다 캐시 정리
             # PyMuPDF는 렌더링된 페이지를 메모리에 캐시로 보관
             # 대용량 PDF 처리시 메모리 부족 방지를 위해 주기적으로 정리
-            if (page_num + 1) % 5 == 0:
+            if (position + 1) % 5 == 0:
                 fitz.TOOLS.store_shrink(50)  # 캐시 50% 축소
                 logger.debug(f"캐시 정리 완료 (페이지 {page_num + 1})")
             
         # 결과 저장
-        self._save_results(all_pages_data, all_formulas, output_path)
+        with self._stage('save_results'):
+            self._save_results(all_pages_data, all_formulas, output_path)
+        
+        # Layout PDF 저장
+        if layout_doc is not None:
+            with self._stage('layout_pdf'):
+                self._finish_layout_pdf(layout_doc, output_path, layout_in_place)
         
         # HTML 뷰어 생성
-        self._generate_html_viewer(all_pages_data, pdf_path, output_path)
+        with self._stage('viewer'):
+            self._generate_html_viewer(output_path)
         
-        pdf_doc.close()
         
         return {
             'success': True,
             'output_dir': str(output_path),
             'pages': total_pages,
             'total_formulas': len(all_formulas),
+            'skipped_pages': skipped_pages,
             'formula_details': all_formulas
         }
         
@@ -355,68 +541,343 @@ class SmartNougatStandalone:
             
         return dirs
         
+    def _get_page_text(self, page) -> Optional[Dict]:
+        """
+        텍스트 레이어를 글리프 단위로 한 번 추출 (page.get_text("rawdict"))
+        
+        사전 판별, 위치 정보가 있는 텍스트 추출, 벡터 수식 복원이 모두 이 결과를 공유한다.
+        """
+        try:
+            return page.get_text("rawdict", flags=11)  # preserve ligatures, preserve whitespace
+        except Exception as e:
+            logger.warning(f"PDF 텍스트 추출 실패: {e}")
+            return None
+            
+    def _page_has_math(self, page, page_text: Optional[Dict]) -> Tuple[bool, str]:
+        """
+        수식 포함 여부 사전 판별
+        
+        텍스트 레이어의 폰트 이름과 문자 유니코드 범위를 검사하고, 일반 텍스트
+        폰트로 조판된 수식도 놓치지 않도록 보수적으로 판별한다: 기울임체 한두 글자
+        옆의 ASCII 연산자, 'x = 2' 같은 변수-연산자-항 패턴, 기준선에서 벗어난
+        작은 글자(위/아래 첨자)가 있으면 수식 페이지로 본다. 텍스트 레이어가
+        없거나 이미지가 있는 페이지는 판별할 수 없으므로 전체 수식 처리 경로로 보낸다.
+        
+        Returns:
+            (수식 처리 필요 여부, 판별 사유)
+        """
+        if page_text is None:
+            return True, 'error'
+        try:
+            if page.get_images():
+                return True, 'image'
+        except Exception as e:
+            logger.debug(f"페이지 이미지 확인 실패: {e}")
+            return True, 'error'
+            
+        has_text = False
+        for block in page_text.get('blocks', []):
+            for line in block.get('lines', []):
+                spans = []
+                for span in line.get('spans', []):
+                    text = ''.join(ch.get('c', '') for ch in span.get('chars', []))
+                    if not text.strip():
+                        continue
+                    has_text = True
+                    font = span.get('font', '').lower()
+                    if any(hint in font for hint in self.MATH_FONT_HINTS):
+                        return True, 'math_font'
+                    for ch in text:
+                        code = ord(ch)
+                        if any(lo <= code <= hi for lo, hi in self.MATH_UNICODE_RANGES):
+                            return True, 'math_unicode'
+                    spans.append((span, text))
+                    
+                reason = self._line_has_plain_math(spans)
+                if reason:
+                    return True, reason
+                            
+        if not has_text:
+            return True, 'no_text'
+        return False, 'no_math'
+        
+    def _line_has_plain_math(self, spans: List[Tuple[Dict, str]]) -> Optional[str]:
+        """
+        일반 텍스트 폰트로 조판된 수식 흔적 (한 줄의 (rawdict span, 텍스트) 목록)
+        
+        Returns:
+            판별 사유 ('ascii_math', 'italic_operator', 'script') 또는 None
+        """
+        if not spans:
+            return None
+        if self.ASCII_MATH_RE.search(''.join(text for _, text in spans)):
+            return 'ascii_math'
+            
+        # 기울임체 변수 (PyMuPDF span flags 2 = italic) 바로 옆의 ASCII 연산자
+        for i, (span, text) in enumerate(spans):
+            word = text.strip()
+            italic = span.get('flags', 0) & 2 or any(
+                key in span.get('font', '').lower() for key in ('italic', 'oblique'))
+            if not italic or not (1 <= len(word) <= 2) or not word[0].isalpha():
+                continue
+            before = spans[i - 1][1].rstrip()[-1:] if i > 0 else ''
+            after = spans[i + 1][1].lstrip()[:1] if i + 1 < len(spans) else ''
+            if before in self.ASCII_MATH_OPERATORS or after in self.ASCII_MATH_OPERATORS:
+                return 'italic_operator'
+                
+        # 위/아래 첨자: 가장 큰 글자의 기준선에서 벗어난 더 작은 글자
+        main_span = max(spans, key=lambda item: item[0].get('size', 0))[0]
+        main_size = main_span.get('size', 0)
+        if main_size <= 0 or 'origin' not in main_span:
+            return None
+        baseline = main_span['origin'][1]
+        for span, text in spans:
+            if span is main_span or 'origin' not in span:
+                continue
+            shifted = abs(span['origin'][1] - baseline) >= self.SCRIPT_SHIFT_RATIO * main_size
+            smaller = span.get('size', main_size) <= self.SCRIPT_SIZE_RATIO * main_size
+            if shifted and smaller and any(ch.isalnum() for ch in text):
+                return 'script'
+        return None
+        
     def _process_single_page(self, page, page_num: int, dirs: Dict[str, Path]) -> Dict:
         """단일 페이지 처리"""
+        # 텍스트 레이어 (사전 판별, 텍스트 추출, 벡터 수식 복원에서 공유)
+        with self.profiler.span('text_layer'):
+            page_text = self._get_page_text(page)
+        
+        # 수식이 없는 페이지는 렌더링/감지 없이 텍스트만 추출
+        if self.prefilter:
+            with self.profiler.span('prefilter'):
+                needs_math, reason = self._page_has_math(page, page_text)
+            if not needs_math:
+                logger.info(f"페이지 {page_num + 1}: 수식 없음 - 렌더링/감지 생략")
+                with self.profiler.span('text_extract'):
+                    text_blocks = self._extract_text(page, None, page_text=page_text)
+                return {
+                    'page_num': page_num,
+                    'page_size': [int(page.rect.width * 2), int(page.rect.height * 2)],
+                    'formulas': [],
+                    'text_blocks': text_blocks,
+                    'reading_order': self._build_reading_order(text_blocks, []),
+                    'page_image': None,
+                    'skipped': True,
+                    'skip_reason': reason
+                }
+                
         # 페이지를 이미지로 변환
-        mat = fitz.Matrix(2, 2)  # 2배 확대
-        pix = page.get_pixmap(matrix=mat)
-        img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
-        img_array = np.array(img)
-        
-        # 페이지 이미지 저장
+        # two_pass 모드는 1배로 렌더링해 감지만 하고, 수식 영역은 따로 고해상도 렌더링
+        # bbox는 어느 모드든 2배 좌표계로 저장
+        render_scale = 1 if self.two_pass else 2
         page_img_path = dirs['pages'] / f"page_{page_num}.png"
-        img.save(page_img_path)
+        img = self._render_page(page, render_scale, page_img_path)
+        img_array = np.array(img)
         
         # 수식 감지
-        formulas = self._detect_formulas(img_array, page_num)
+        with self.profiler.span('yolo'):
+            if self.two_pass:
+                # 1배 이미지에는 1888 입력이 과도하므로 작은 입력 크기 사용
+                formulas = self._detect_formulas(img_array, page_num, scale=2 / render_scale, imgsz=1280)
+            else:
+                formulas = self._detect_formulas(img_array, page_num)
+        
+        # 벡터 PDF 글리프 리더 (단순 인라인 수식은 Nougat 없이 복원)
+        vector_reader = None
+        if self.vector_fast_path and formulas and page_text is not None:
+            vector_reader = VectorFormulaReader(page, raw=page_text)
         
         # 수식 이미지 추출 및 LaTeX 변환
         for idx, formula in enumerate(formulas):
-            # bbox 확장
-            expanded_bbox = self._expand_bbox(
-                formula['bbox'], 
-                img_array.shape, 
-                expand_ratio_x=0.15, 
-                expand_ratio_y=0.03
-            )
-            
-            # 수식 이미지 추출
-            formula_img = self._extract_image_region(img_array, expanded_bbox)
+            with self.profiler.span('crop'):
+                # 수식 crop의 원본 이미지와 그 안에서의 bbox
+                if self.two_pass:
+                    source_array, source_bbox = self._render_formula_region(page, formula['bbox'])
+                else:
+                    source_array, source_bbox = img_array, formula['bbox']
+                    
+                # bbox 확장 (잉크 기준 조정 또는 고정 비율)
+                if self.adaptive_crop:
+                    expanded_bbox = self._adaptive_bbox(source_array, source_bbox)
+                else:
+                    expanded_bbox = self._expand_bbox(
+                        source_bbox, 
+                        source_array.shape, 
+                        expand_ratio_x=0.15, 
+                        expand_ratio_y=0.03
+                    )
+                
+                # 수식 이미지 추출
+                formula_img = self._extract_image_region(source_array, expanded_bbox)
+            
+            # 단순 인라인 수식은 글리프 데이터로 직접 복원
+            latex = None
+            if vector_reader is not None and formula['category_id'] == 13:
+                with self.profiler.span('vector_read'):
+                    latex = vector_reader.read(formula['bbox'])
+                
+            if latex:
+                latex_score, decode = None, 'vector'
+            else:
+                # Nougat으로 LaTeX 변환 (greedy)
+                latex, latex_score = self._recognize_formula_with_nougat(formula_img)
+                decode = 'greedy'
+            
+            # 신뢰도가 낮으면 정책에 따라 재디코딩
+            if self._needs_fallback(latex_score):
+                latex, latex_score, decode, formula_img = self._redecode_low_confidence(
+                    source_array, source_bbox, formula_img, latex, latex_score
+                )
             
-            # 이미지 저장
+            # 이미지 저장 (실제 인식에 사용된 crop)
             formula_filename = f"formula_page{page_num}_{idx:03d}.png"
             formula_path = dirs['images'] / formula_filename
-            Image.fromarray(formula_img).save(formula_path)
-            
-            # Nougat으로 LaTeX 변환
-            latex = self._recognize_formula_with_nougat(formula_img)
+            with self.profiler.span('png_encode', kind='formula'):
+                Image.fromarray(formula_img).save(formula_path)
             
             # 정보 업데이트
             formula['image_path'] = str(formula_path)
             formula['latex'] = latex
+            formula['latex_score'] = latex_score
+            formula['decode'] = decode
             formula['page_num'] = page_num
             formula['index'] = idx
             
         # 텍스트 추출 (OCR 또는 PDF 텍스트)
-        text_blocks = self._extract_text(page, img_array)
+        with self.profiler.span('text_extract'):
+            text_blocks = self._extract_text(page, img_array, img_scale=render_scale,
+                                             page_text=page_text)
+        
+        # 텍스트 라인과 수식의 읽기 순서
+        reading_order = self._build_reading_order(text_blocks, formulas)
         
         return {
             'page_num': page_num,
-            'page_size': [pix.width, pix.height],
+            'page_size': [img.width * 2 // render_scale, img.height * 2 // render_scale],
             'formulas': formulas,
             'text_blocks': text_blocks,
-            'page_image': str(page_img_path)
+            'reading_order': reading_order,
+            'page_image': str(page_img_path),
+            'page_image_scale': render_scale
         }
         
-    def _detect_formulas(self, img_array: np.ndarray, page_num: int) -> List[Dict]:
-        """수식 위치 감지"""
+    def _render_page(self, page, scale: int, page_img_path: Path) -> Image.Image:
+        """
+        페이지를 RGB 이미지로 렌더링하고 page_img_path에 PNG로 저장
+        
+        페이지 내용 해시 + 해상도로 공유 캐시를 조회해, 이전 실행에서 렌더링한
+        페이지는 다시 렌더링/인코딩하지 않고 캐시 파일을 출력 폴더에 링크한다.
+        """
+        key = self._page_raster_key(page, scale) if self.cache.enabled else None
+        if key and self.cache.fetch('pages', key, '.png', page_img_path):
+            try:
+                with self.profiler.span('render_cached'), Image.open(page_img_path) as cached:
+                    return cached.convert("RGB")
+            except OSError:
+                logger.warning(f"손상된 페이지 캐시 무시: {key[:12]}")
+                
+        with self.profiler.span('render', scale=scale):
+            pix = page.get_pixmap(matrix=fitz.Matrix(scale, scale))
+            img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
+        with self.profiler.span('png_encode', kind='page'):
+            img.save(page_img_path)
+        if key:
+            self.cache.put('pages', key, '.png', page_img_path)
+        return img
+        
+    def _page_raster_key(self, page, scale: int) -> Optional[str]:
+        """
+        렌더링 결과를 결정하는 페이지 내용의 해시 (캐시 사용 불가 시 None)
+        
+        페이지 객체에서 참조로 도달할 수 있는 모든 간접 객체(콘텐츠 스트림,
+        /Resources 아래의 폰트, 이미지, XObject, ExtGState, ColorSpace, Pattern,
+        Shading 등)의 사전과 원본 스트림, 문서의 선택적 콘텐츠(레이어) 설정과
+        해상도를 해시한다. /Parent, /P 역참조는 따라가지 않는다. 주석이 있는
+        페이지는 캐시하지 않는다.
+        """
+        try:
+            if page.first_annot is not None:
+                return None
+            doc = page.parent
+            digest = hashlib.sha256()
+            digest.update(f"{tuple(page.rect)}|{page.rotation}|{72 * scale}dpi|rgb\n".encode())
+            
+            roots = [page.xref]
+            kind, value = doc.xref_get_key(doc.pdf_catalog(), "OCProperties")
+            if kind != 'null':
+                digest.update(value.encode())
+                roots.extend(int(ref) for ref in self.PDF_REF_RE.findall(value))
+                
+            stack = roots[::-1]
+            seen = set()
+            while stack:
+                xref = stack.pop()
+                if xref <= 0 or xref in seen:
+                    continue
+                seen.add(xref)
+                object_digest, refs = self._object_digest(doc, xref)
+                digest.update(object_digest)
+                stack.extend(reversed(refs))
+            return digest.hexdigest()
+        except Exception as e:
+            logger.debug(f"페이지 캐시 키 계산 실패: {e}")
+            return None
+            
+    def _object_digest(self, doc, xref: int) -> Tuple[bytes, List[int]]:
+        """간접 객체 하나의 (사전 + 원본 스트림) 해시와 참조하는 객체 번호 (문서 단위로 캐시)"""
+        if xref not in self._xref_digests:
+            text = doc.xref_object(xref, compressed=True)
+            object_digest = hashlib.sha256(text.encode())
+            if doc.xref_is_stream(xref):
+                object_digest.update(doc.xref_stream_raw(xref))
+            refs = [int(ref) for ref in self.PDF_REF_RE.findall(self.PDF_BACKREF_RE.sub('', text))]
+            self._xref_digests[xref] = (object_digest.digest(), refs)
+        return self._xref_digests[xref]
+        
+    def _render_formula_region(self, page, bbox: List[int]) -> Tuple[np.ndarray, List[int]]:
+        """
+        수식 영역만 고해상도로 렌더링 (two_pass 모드)
+        
+        적응형 crop과 재디코딩 확장이 쓸 수 있도록 여유를 두고 렌더링하며,
+        렌더링된 이미지와 그 안에서의 수식 bbox를 반환한다.
+        
+        Args:
+            bbox: 2배 좌표계의 수식 bbox
+        """
+        x1, y1, x2, y2 = bbox
+        pad_x = int((x2 - x1) * 0.3) + 16
+        pad_y = int((y2 - y1) * 0.15) + 16
+        
+        # 2배 좌표 → PDF 좌표
+        clip = fitz.Rect((x1 - pad_x) / 2, (y1 - pad_y) / 2,
+                         (x2 + pad_x) / 2, (y2 + pad_y) / 2) & page.rect
+        mat = fitz.Matrix(self.crop_zoom, self.crop_zoom)
+        pix = page.get_pixmap(matrix=mat, clip=clip)
+        region = np.array(Image.frombytes("RGB", [pix.width, pix.height], pix.samples))
+        
+        # 2배 좌표 → 렌더링된 영역 내 좌표 (pix.x, pix.y는 영역의 원점)
+        zoom = self.crop_zoom / 2
+        local_bbox = [
+            int(x1 * zoom) - pix.x, int(y1 * zoom) - pix.y,
+            int(x2 * zoom) - pix.x, int(y2 * zoom) - pix.y
+        ]
+        return region, local_bbox
+        
+    def _detect_formulas(self, img_array: np.ndarray, page_num: int,
+                         scale: float = 1.0, imgsz: int = 1888) -> List[Dict]:
+        """
+        수식 위치 감지
+        
+        Args:
+            scale: 감지 bbox에 곱할 배율 (2배 좌표계로 맞추기 위함)
+            imgsz: YOLO 입력 크기
+        """
         formulas = []
         
         if self.mfd_model is not None:
             # YOLO MFD 사용
             results = self.mfd_model.predict(
                 img_array, 
-                imgsz=1888, 
+                imgsz=imgsz, 
                 conf=0.25, 
                 iou=0.45, 
                 verbose=False
@@ -427,7 +888,7 @@ class SmartNougatStandalone:
                     results.boxes.conf.cpu(), 
                     results.boxes.cls.cpu())
             ):
-                x1, y1, x2, y2 = [int(p.item()) for p in xyxy]
+                x1, y1, x2, y2 = [int(p.item() * scale) for p in xyxy]
                 
                 formula = {
                     'bbox': [x1, y1, x2, y2],
@@ -438,6 +899,13 @@ class SmartNougatStandalone:
                 
                 formulas.append(formula)
                 
+            # 중복/조각 박스 후처리
+            if self.merge_detections and len(formulas) > 1:
+                raw_count = len(formulas)
+                formulas = self._merge_detections(formulas)
+                if len(formulas) != raw_count:
+                    logger.debug(f"페이지 {page_num}: 감지 {raw_count}개 → 병합 후 {len(formulas)}개")
+                
         else:
             # MFD 모델이 없으면 수식을 감지할 수 없음
             logger.error("MFD 모델이 없습니다. 수식을 감지할 수 없습니다.")
@@ -447,6 +915,84 @@ class SmartNougatStandalone:
         logger.info(f"페이지 {page_num}에서 {len(formulas)}개의 수식을 감지했습니다")
         return formulas
         
+    def _merge_detections(self, formulas: List[Dict], contain_ratio: float = 0.9,
+                          gap_ratio: float = 0.6, baseline_ratio: float = 0.3) -> List[Dict]:
+        """
+        YOLO 감지 결과 후처리
+        
+        1. 다른 박스에 contain_ratio 이상 포함된 박스 제거 (블록 안의 인라인 등)
+        2. 같은 카테고리이면서 기준선이 같고 가로 간격이 좁은 조각 박스 병합
+        
+        병합/제거된 원본 감지 인덱스는 'merged_from'에 기록된다.
+        """
+        boxes = np.array([f['bbox'] for f in formulas], dtype=np.float32)
+        x1, y1, x2, y2 = boxes.T
+        areas = np.maximum(x2 - x1, 0) * np.maximum(y2 - y1, 0)
+        heights = np.maximum(y2 - y1, 1)
+        
+        # 1. 포함 관계: inter[i, j] / area[i] >= contain_ratio 이면 i는 j에 포함
+        inter_w = np.clip(np.minimum(x2[:, None], x2[None, :]) - np.maximum(x1[:, None], x1[None, :]), 0, None)
+        inter_h = np.clip(np.minimum(y2[:, None], y2[None, :]) - np.maximum(y1[:, None], y1[None, :]), 0, None)
+        inter = inter_w * inter_h
+        contained = inter >= contain_ratio * np.maximum(areas[:, None], 1)
+        # 자기 자신 제외, 동일 크기 박스는 인덱스가 작은 쪽을 남김
+        order = np.arange(len(formulas))
+        larger = (areas[None, :] > areas[:, None]) | (
+            (areas[None, :] == areas[:, None]) & (order[None, :] < order[:, None]))
+        contained &= larger
+        np.fill_diagonal(contained, False)
+        
+        # 각 포함 박스를 가장 큰 컨테이너에 귀속
+        parent = np.arange(len(formulas))
+        suppressed = contained.any(axis=1)
+        for i in np.flatnonzero(suppressed):
+            parent[i] = np.flatnonzero(contained[i])[np.argmax(areas[contained[i]])]
+            
+        # 2. 같은 기준선의 가로 인접 조각: 세로 겹침, 하단선 차이, 가로 간격 조건
+        min_h = np.minimum(heights[:, None], heights[None, :])
+        v_overlap = inter_h >= 0.5 * min_h
+        same_baseline = np.abs(y2[:, None] - y2[None, :]) <= baseline_ratio * min_h
+        h_gap = np.maximum(x1[:, None], x1[None, :]) - np.minimum(x2[:, None], x2[None, :])
+        close = h_gap <= gap_ratio * min_h
+        cats = np.array([f['category_id'] for f in formulas])
+        same_cat = cats[:, None] == cats[None, :]
+        adjacent = v_overlap & same_baseline & close & same_cat
+        adjacent &= ~suppressed[:, None] & ~suppressed[None, :]
+        np.fill_diagonal(adjacent, False)
+        
+        # union-find로 인접 조각 그룹화
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+            
+        for i, j in zip(*np.nonzero(np.triu(adjacent))):
+            ri, rj = find(i), find(j)
+            if ri != rj:
+                parent[max(ri, rj)] = min(ri, rj)
+                
+        groups: Dict[int, List[int]] = {}
+        for i in range(len(formulas)):
+            groups.setdefault(int(find(i)), []).append(i)
+            
+        merged = []
+        for root in sorted(groups):
+            members = groups[root]
+            formula = dict(formulas[root])
+            if len(members) > 1:
+                member_boxes = boxes[members]
+                formula['bbox'] = [
+                    int(member_boxes[:, 0].min()), int(member_boxes[:, 1].min()),
+                    int(member_boxes[:, 2].max()), int(member_boxes[:, 3].max())
+                ]
+                formula['confidence'] = float(max(formulas[m]['confidence'] for m in members))
+                formula['merged_from'] = members
+                formula['merge'] = 'contained' if all(suppressed[m] for m in members if m != root) else 'adjacent'
+            merged.append(formula)
+            
+        return merged
+        
     def _expand_bbox(self, bbox: List[int], img_shape: Tuple, 
                      expand_ratio_x: float = 0.25, 
                      expand_ratio_y: float = 0.03) -> List[int]:
@@ -467,6 +1013,62 @@ class SmartNougatStandalone:
         
         return [new_x1, new_y1, new_x2, new_y2]
         
+    def _adaptive_bbox(self, img_array: np.ndarray, bbox: List[int],
+                       margin: int = 8, ink_threshold: int = 200,
+                       max_expand_ratio_x: float = 0.15,
+                       max_expand_ratio_y: float = 0.1) -> List[int]:
+        """
+        잉크 기준 bbox 조정
+        
+        crop의 행/열 projection profile로 잉크 영역을 찾아 고정 margin만 남기고
+        여백을 잘라낸다. 잉크가 crop 가장자리에 닿는 경우에만 그 방향으로
+        최대 확장 비율까지 넓힌다.
+        """
+        h, w = img_array.shape[:2]
+        x1, y1, x2, y2 = [int(v) for v in bbox]
+        x1, y1 = max(0, x1), max(0, y1)
+        x2, y2 = min(w, x2), min(h, y2)
+        if x2 <= x1 or y2 <= y1:
+            return [x1, y1, x2, y2]
+            
+        # 가장자리에 잉크가 있을 때 확장 가능한 한계
+        box_w, box_h = x2 - x1, y2 - y1
+        lim_x1 = max(0, x1 - int(box_w * max_expand_ratio_x))
+        lim_x2 = min(w, x2 + int(box_w * max_expand_ratio_x))
+        lim_y1 = max(0, y1 - int(box_h * max_expand_ratio_y))
+        lim_y2 = min(h, y2 + int(box_h * max_expand_ratio_y))
+        step = max(2 * margin, box_h // 2)
+        
+        while True:
+            region = img_array[y1:y2, x1:x2]
+            ink = (region.min(axis=2) if region.ndim == 3 else region) < ink_threshold
+            cols = np.flatnonzero(ink.any(axis=0))
+            rows = np.flatnonzero(ink.any(axis=1))
+            
+            if cols.size == 0:
+                # 잉크가 없으면 기존 고정 비율 확장 사용
+                return self._expand_bbox(bbox, img_array.shape, 0.15, 0.03)
+                
+            grown = False
+            if cols[0] == 0 and x1 > lim_x1:
+                x1, grown = max(lim_x1, x1 - step), True
+            if cols[-1] == x2 - x1 - 1 and x2 < lim_x2:
+                x2, grown = min(lim_x2, x2 + step), True
+            if rows[0] == 0 and y1 > lim_y1:
+                y1, grown = max(lim_y1, y1 - step), True
+            if rows[-1] == y2 - y1 - 1 and y2 < lim_y2:
+                y2, grown = min(lim_y2, y2 + step), True
+            if not grown:
+                break
+                
+        # 잉크 bbox + 고정 margin
+        return [
+            max(0, x1 + int(cols[0]) - margin),
+            max(0, y1 + int(rows[0]) - margin),
+            min(w, x1 + int(cols[-1]) + 1 + margin),
+            min(h, y1 + int(rows[-1]) + 1 + margin)
+        ]
+        
     def _extract_image_region(self, img_array: np.ndarray, bbox: List[int]) -> np.ndarray:
         """이미지 영역 추출"""
         x1, y1, x2, y2 = bbox
@@ -486,11 +1088,61 @@ class SmartNougatStandalone:
             
         return img_array[y1:y2, x1:x2]
         
-    def _recognize_formula_with_nougat(self, formula_img: np.ndarray) -> str:
-        """Nougat으로 수식 인식"""
+    def _needs_fallback(self, latex_score: Optional[float]) -> bool:
+        """재디코딩이 필요한 저신뢰 결과인지 판단"""
+        if self.fallback_policy == 'none' or latex_score is None:
+            return False
+        return latex_score < self.min_logprob
+        
+    def _redecode_low_confidence(self, img_array: np.ndarray, bbox: List[int],
+                                 formula_img: np.ndarray, latex: str,
+                                 latex_score: float) -> Tuple[str, float, str, np.ndarray]:
+        """
+        저신뢰 수식 재디코딩
+        
+        정책에 따라 빔 서치 또는 더 넓게 확장한 crop으로 다시 인식하고
+        평균 토큰 로그확률이 가장 높은 결과를 선택한다.
+        
+        Returns:
+            (latex, latex_score, decode 방식, 사용된 수식 이미지)
+        """
+        best = (latex, latex_score, 'greedy', formula_img)
+        num_beams = self.fallback_beams if self.fallback_policy in ('beam', 'both') else 1
+        
+        candidates = []
+        if num_beams > 1:
+            candidates.append(('beam', formula_img))
+        if self.fallback_policy in ('expand', 'both'):
+            wider_bbox = self._expand_bbox(
+                bbox, 
+                img_array.shape, 
+                expand_ratio_x=0.3, 
+                expand_ratio_y=0.15
+            )
+            decode = 'expand+beam' if num_beams > 1 else 'expand'
+            candidates.append((decode, self._extract_image_region(img_array, wider_bbox)))
+            
+        for decode, candidate_img in candidates:
+            cand_latex, cand_score = self._recognize_formula_with_nougat(
+                candidate_img, num_beams=num_beams
+            )
+            if cand_latex and cand_score is not None and cand_score > best[1]:
+                best = (cand_latex, cand_score, decode, candidate_img)
+                
+        logger.debug(f"저신뢰 수식 재디코딩: {latex_score:.3f} → {best[1]:.3f} ({best[2]})")
+        return best
+        
+    def _recognize_formula_with_nougat(self, formula_img: np.ndarray,
+                                       num_beams: int = 1) -> Tuple[str, Optional[float]]:
+        """
+        Nougat으로 수식 인식
+        
+        Returns:
+            (LaTeX 문자열, 생성 토큰의 평균 로그확률). 실패 시 ("", None)
+        """
         if self.nougat_model is None:
             logger.warning("Nougat 모델이 없습니다")
-            return ""
+            return "", None
             
         try:
             # numpy array를 PIL Image로 변환
@@ -515,7 +1167,7 @@ class SmartNougatStandalone:
             ).input_ids
             
             # 생성
-            with torch.no_grad():
+            with torch.no_grad(), self.profiler.span('nougat_generate', beams=num_beams) as span:
                 outputs = model.generate(
                     pixel_values.to(self.device),
                     decoder_input_ids=decoder_input_ids.to(self.device),
@@ -524,10 +1176,17 @@ class SmartNougatStandalone:
                     pad_token_id=tokenizer.pad_token_id,
                     eos_token_id=tokenizer.eos_token_id,
                     use_cache=True,
-                    num_beams=1,
+                    num_beams=num_beams,
                     bad_words_ids=[[tokenizer.unk_token_id]],
                     return_dict_in_generate=True,
+                    output_scores=True,
                 )
+                span['tokens'] = int(outputs.sequences.shape[1] - decoder_input_ids.shape[1])
+                
+            # 시퀀스 점수 (평균 토큰 로그확률)
+            score = self._sequence_logprob(
+                model, outputs, decoder_input_ids.shape[1], tokenizer.pad_token_id
+            )
                 
             # 디코딩
             sequence = tokenizer.batch_decode(outputs.sequences)[0]
@@ -535,44 +1194,85 @@ class SmartNougatStandalone:
                 tokenizer.pad_token, "").replace(tokenizer.bos_token, "")
             sequence = process_raw_latex_code(sequence)
             
-            return sequence.strip()
+            return sequence.strip(), score
             
         except Exception as e:
             logger.error(f"Nougat 인식 실패: {e}")
-            return ""
+            return "", None
+            
+    def _sequence_logprob(self, model, outputs, prompt_len: int,
+                          pad_token_id: int) -> Optional[float]:
+        """generate 출력에서 생성 토큰의 평균 로그확률 계산"""
+        try:
+            # 빔 서치는 길이 정규화된 로그확률을 직접 제공
+            if getattr(outputs, 'sequences_scores', None) is not None:
+                return float(outputs.sequences_scores[0])
+                
+            transition_scores = model.compute_transition_scores(
+                outputs.sequences, outputs.scores, normalize_logits=True
+            )
+            generated = outputs.sequences[:, prompt_len:]
+            mask = generated != pad_token_id
+            if not mask.any():
+                return None
+            return float(transition_scores[mask].mean())
+            
+        except Exception as e:
+            logger.debug(f"시퀀스 점수 계산 실패: {e}")
+            return None
             
-    def _extract_text(self, page, img_array: np.ndarray) -> List[Dict]:
-        """텍스트 추출"""
+    def _extract_text(self, page, img_array: Optional[np.ndarray],
+                      img_scale: float = 2, page_text: Optional[Dict] = None) -> List[Dict]:
+        """
+        텍스트 추출
+        
+        PDF 텍스트는 라인 단위로 2배 좌표계 bbox와 함께 추출한다. 읽기 순서
+        배치를 위해 글리프 목록('_chars')을 임시로 함께 담는다.
+        
+        Args:
+            img_scale: img_array의 렌더링 배율 (OCR bbox를 2배 좌표계로 맞추기 위함)
+            page_text: _get_page_text 결과 (없으면 새로 추출)
+        """
         text_blocks = []
         
         # 먼저 PDF에서 직접 텍스트 추출 시도
-        try:
-            # UTF-8 인코딩으로 텍스트 추출
-            text = page.get_text("text", flags=11)  # preserve ligatures, preserve whitespace
-            if text.strip():
-                # 텍스트를 라인별로 분리
-                lines = text.split('\n')
-                for line in lines:
-                    if line.strip():
-                        text_blocks.append({
-                            'type': 'text',
-                            'content': line.strip(),
-                            'source': 'pdf'
-                        })
-                        
-                # 텍스트가 있으면 OCR 건너뛰기
-                if text_blocks:
-                    return text_blocks
-        except Exception as e:
-            logger.warning(f"PDF 텍스트 추출 실패: {e}")
+        if page_text is None:
+            page_text = self._get_page_text(page)
+            
+        if page_text is not None:
+            for block_idx, block in enumerate(page_text.get('blocks', [])):
+                for line in block.get('lines', []):
+                    chars = [
+                        (ch['c'], [v * 2 for v in ch['bbox']])
+                        for span in line.get('spans', [])
+                        for ch in span.get('chars', [])
+                    ]
+                    content = ''.join(c for c, _ in chars)
+                    if not content.strip():
+                        continue
+                    text_blocks.append({
+                        'type': 'text',
+                        'content': content.strip(),
+                        'bbox': [int(v * 2) for v in line['bbox']],
+                        'block': block_idx,
+                        'source': 'pdf',
+                        '_chars': chars
+                    })
+                    
+            # 텍스트가 있으면 OCR 건너뛰기
+            if text_blocks:
+                return text_blocks
             
         # OCR 사용 (가능한 경우)
-        if self.ocr_model is not None:
+        if self.ocr_model is not None and img_array is not None:
             try:
-                result = self.ocr_model.ocr(img_array, cls=True)
+                with self.profiler.span('ocr'):
+                    result = self.ocr_model.ocr(img_array, cls=True)
                 for line in result:
                     if line:
                         for box, (text, conf) in line:
+                            if img_scale != 2:
+                                box = [[x * 2 / img_scale, y * 2 / img_scale] for x, y in box]
                             text_blocks.append({
                                 'type': 'text',
                                 'content': text,
@@ -602,8 +1302,16 @@ class SmartNougatStandalone:
                     'category_id': formula['category_id'],
                     'poly': self._bbox_to_poly(formula['bbox']),
                     'score': formula['confidence'],
+                    'latex_score': formula.get('latex_score'),
+                    'decode': formula.get('decode', 'greedy'),
                     'latex': formula['latex']
                 }
+                if formula.get('merged_from'):
+                    det['merged_from'] = formula['merged_from']
+                    det['merge'] = formula['merge']
+                if not formula.get('image_path'):
+                    # 렌더링 없이 변환된 수식 (DOCX OMML) - 뷰어는 이미지 영역을 생략
+                    det['no_image'] = True
                 page_model['layout_dets'].append(det)
                 
             model_data.append(page_model)
@@ -611,9 +1319,14 @@ class SmartNougatStandalone:
         # model.json 저장
         model_path = output_path / 'txt' / 'model.json'
         model_path.parent.mkdir(exist_ok=True)
-        with open(model_path, 'w', encoding='utf-8') as f:
+        with self.profiler.span('json_write', file='model.json'), \
+                open(model_path, 'w', encoding='utf-8') as f:
             json.dump(model_data, f, ensure_ascii=False, indent=2)
             
+        # 컬럼형 바이너리 결과 (페이지 단위 로딩용)
+        with self.profiler.span('npz_write'):
+            save_results_npz(model_data, output_path / 'txt' / 'model.npz')
+            
         # middle.json 저장
         middle_data = {
             'pdf_info': pages_data,
@@ -623,7 +1336,8 @@ class SmartNougatStandalone:
         }
         
         middle_path = output_path / 'txt' / 'middle.json'
-        with open(middle_path, 'w', encoding='utf-8') as f:
+        with self.profiler.span('json_write', file='middle.json'), \
+                open(middle_path, 'w', encoding='utf-8') as f:
             json.dump(middle_data, f, ensure_ascii=False, indent=2)
             
         # 간단한 마크다운 파일도 생성 (Universal 뷰어를 위해)
@@ -632,125 +1346,199 @@ class SmartNougatStandalone:
         with open(md_path, 'w', encoding='utf-8') as f:
             f.write(md_content)
             
-        # Layout PDF 생성 (선택사항)
-        self._generate_layout_pdf(pages_data, output_path)
-            
         logger.info(f"결과가 저장되었습니다: {output_path}")
         
     def _generate_markdown(self, pages_data: List[Dict]) -> str:
-        """페이지 데이터에서 마크다운 생성"""
+        """페이지 데이터에서 마크다운 생성 (reading_order 순서)"""
         md_lines = []
         
         for page_data in pages_data:
             page_num = page_data.get('page_num', 0)
             md_lines.append(f"\n## Page {page_num + 1}\n")
             
-            # 텍스트와 수식을 함께 표시
-            for item in page_data.get('text_blocks', []):
-                if item.get('content'):
-                    md_lines.append(item['content'] + "\n")
-                    
-            for idx, formula in enumerate(page_data.get('formulas', [])):
-                if formula.get('category') == 'inline':
-                    md_lines.append(f"${formula.get('latex', '')}$")
+            formulas = page_data.get('formulas', [])
+            text_blocks = page_data.get('text_blocks', [])
+            
+            for item in page_data.get('reading_order', []):
+                if item['type'] == 'text':
+                    md_lines.append(text_blocks[item['text_block']]['content'] + "\n")
+                elif item['type'] == 'line':
+                    md_lines.append(self._render_line(item['parts'], formulas, page_num) + "\n")
                 else:
-                    md_lines.append(f"\n$$\n{formula.get('latex', '')}\n$$\n")
+                    formula = formulas[item['formula']]
+                    md_lines.append(formula_markdown(page_num, item['formula'], formula.get('latex', ''),
+                                                     formula.get('category') == 'inline'))
                     
         return '\n'.join(md_lines)
         
+    def _render_line(self, parts: List[Dict], formulas: List[Dict], page_num: int = 0) -> str:
+        """인라인 수식이 섞인 라인을 마크다운 문자열로 변환"""
+        pieces = []
+        for part in parts:
+            if 'formula' in part:
+                latex = formulas[part['formula']].get('latex', '')
+                pieces.append(f" {formula_markdown(page_num, part['formula'], latex, True)} ")
+            else:
+                pieces.append(part['text'])
+        return re.sub(r' {2,}', ' ', ''.join(pieces)).strip()
+        
+    @staticmethod
+    def _to_rect(bbox) -> Optional[List[float]]:
+        """bbox(사각형 또는 OCR 다각형)를 [x1, y1, x2, y2]로 변환"""
+        if not bbox:
+            return None
+        if isinstance(bbox[0], (list, tuple)):
+            xs = [p[0] for p in bbox]
+            ys = [p[1] for p in bbox]
+            return [min(xs), min(ys), max(xs), max(ys)]
+        return list(bbox)
+        
+    @staticmethod
+    def _center_in(inner, outer) -> bool:
+        """inner 사각형의 중심이 outer 사각형 안에 있는지 여부"""
+        cx = (inner[0] + inner[2]) / 2
+        cy = (inner[1] + inner[3]) / 2
+        return outer[0] <= cx <= outer[2] and outer[1] <= cy <= outer[3]
+        
+    def _build_reading_order(self, text_blocks: List[Dict], formulas: List[Dict]) -> List[Dict]:
+        """
+        텍스트 라인과 수식을 읽기 순서로 배치 (모든 좌표는 2배 좌표계)
+        
+        - 인라인 수식은 세로로 가장 많이 겹치는 라인에 넣고, 수식이 덮는
+          글리프는 수식으로 대체한다.
+        - 블록 수식과 라인을 찾지 못한 수식은 자신이 덮는 라인을 대체하고,
+          같은 단(column)의 라인 사이 세로 위치에 삽입한다.
+        
+        text_blocks의 임시 '_chars'는 여기서 제거된다.
+        """
+        line_rects = [self._to_rect(tb.get('bbox')) for tb in text_blocks]
+        indexed_lines = [i for i, rect in enumerate(line_rects) if rect is not None]
+        line_index = GridIndex([line_rects[i] for i in indexed_lines])
+        line_formulas: Dict[int, List[int]] = {}
+        standalone = []
+        
+        for f_idx, formula in enumerate(formulas):
+            fx1, fy1, fx2, fy2 = formula['bbox']
+            best, best_overlap = None, 0
+            if formula.get('category_id') == 13:
+                for hit in line_index.query(formula['bbox']):
+                    l_idx = indexed_lines[hit]
+                    rect = line_rects[l_idx]
+                    overlap = min(rect[3], fy2) - max(rect[1], fy1)
+                    if overlap > best_overlap:
+                        best, best_overlap = l_idx, overlap
+            if best is not None and best_overlap >= 0.5 * min(
+                    fy2 - fy1, line_rects[best][3] - line_rects[best][1]):
+                line_formulas.setdefault(best, []).append(f_idx)
+            else:
+                standalone.append(f_idx)
+                
+        # 단독 수식에 덮인 라인은 수식 글리프이므로 제외
+        covered = set()
+        for f_idx in standalone:
+            for hit in line_index.query(formulas[f_idx]['bbox']):
+                l_idx = indexed_lines[hit]
+                if self._center_in(line_rects[l_idx], formulas[f_idx]['bbox']):
+                    covered.add(l_idx)
+                    
+        items = []
+        for l_idx, text_block in enumerate(text_blocks):
+            rect = line_rects[l_idx]
+            chars = text_block.pop('_chars', None)
+            if l_idx in covered:
+                continue
+            if l_idx in line_formulas:
+                parts = self._line_parts(text_block, chars, formulas, line_formulas[l_idx])
+                items.append({'type': 'line', 'text_block': l_idx, 'bbox': rect, 'parts': parts})
+            else:
+                items.append({'type': 'text', 'text_block': l_idx, 'bbox': rect})
+                
+        # 단독 수식 삽입: 가로로 겹치는 마지막 위쪽 항목(같은 단) 이후에서
+        # 중심이 수식보다 아래인 첫 항목 또는 단이 바뀌는 지점 앞
+        for f_idx in sorted(standalone, key=lambda i: (formulas[i]['bbox'][1], formulas[i]['bbox'][0])):
+            fx1, fy1, fx2, fy2 = formulas[f_idx]['bbox']
+            f_cy = (fy1 + fy2) / 2
+            last_above = None
+            for i, item in enumerate(items):
+                rect = item['bbox']
+                if rect is None or rect[0] > fx2 or rect[2] < fx1:
+                    continue
+                if (rect[1] + rect[3]) / 2 <= f_cy:
+                    last_above = i
+                    
+            start = last_above + 1 if last_above is not None else 0
+            prev_cy = float('-inf')
+            if last_above is not None:
+                prev_cy = (items[last_above]['bbox'][1] + items[last_above]['bbox'][3]) / 2
+            pos = len(items)
+            for i in range(start, len(items)):
+                rect = items[i]['bbox']
+                if rect is None:
+                    continue
+                cy = (rect[1] + rect[3]) / 2
+                if cy > f_cy or cy < prev_cy:
+                    pos = i
+                    break
+                prev_cy = cy
+            items.insert(pos, {'type': 'formula', 'formula': f_idx, 'bbox': list(formulas[f_idx]['bbox'])})
+            
+        return items
+        
+    def _line_parts(self, text_block: Dict, chars: Optional[List], formulas: List[Dict],
+                    f_idxs: List[int]) -> List[Dict]:
+        """라인을 텍스트 조각과 인라인 수식 참조로 분할"""
+        f_idxs = sorted(f_idxs, key=lambda i: formulas[i]['bbox'][0])
+        if not chars:
+            # 글리프 정보가 없는 라인(OCR)은 텍스트 뒤에 수식을 붙임
+            return [{'text': text_block['content']}] + [{'formula': i} for i in f_idxs]
+            
+        parts = []
+        buf = ''
+        emitted = set()
+        for c, bbox in chars:
+            hit = next((i for i in f_idxs if self._center_in(bbox, formulas[i]['bbox'])), None)
+            if hit is None:
+                buf += c
+                continue
+            if hit not in emitted:
+                if buf:
+                    parts.append({'text': buf})
+                    buf = ''
+                parts.append({'formula': hit})
+                emitted.add(hit)
+        if buf:
+            parts.append({'text': buf})
+            
+        # 덮는 글리프가 없는 수식은 라인 끝에 붙임
+        parts.extend({'formula': i} for i in f_idxs if i not in emitted)
+        return parts
+        
     def _bbox_to_poly(self, bbox: List[int]) -> List[int]:
         """bbox를 polygon 형식으로 변환"""
         x1, y1, x2, y2 = bbox
         return [x1, y1, x2, y1, x2, y2, x1, y2]
         
-    def _generate_html_viewer(self, pages_data: List[Dict], pdf_path: Path, output_path: Path):
-        """HTML 3패널 뷰어 생성"""
+    def _generate_html_viewer(self, output_path: Path):
+        """result_viewer.html 생성 (viewer_generator로 같은 프로세스에서 스트리밍 작성)"""
         try:
-            # create_universal_viewer.py 경로
-            viewer_script = Path(__file__).parent / "create_universal_viewer.py"
-            
-            if viewer_script.exists():
-                # create_universal_viewer.py 실행
-                import subprocess
-                # txt 디렉토리가 있어야 함
-                txt_dir = output_path / 'txt'
-                if txt_dir.exists():
-                    cmd = [sys.executable, str(viewer_script), str(txt_dir)]
-                    result = subprocess.run(cmd, capture_output=True, text=True)
-                    if result.returncode == 0:
-                        logger.info("Universal HTML 뷰어 생성 완료")
-                    else:
-                        logger.warning(f"Universal 뷰어 생성 실패: {result.stderr}")
-                        self._create_simple_html_viewer(pages_data, pdf_path, output_path)
-                else:
-                    logger.warning("txt 디렉토리가 없습니다")
-                    self._create_simple_html_viewer(pages_data, pdf_path, output_path)
+            viewer_path = write_viewer(output_path, 'result')
+            if viewer_path is None:
+                logger.warning("HTML 뷰어 생성 실패: model.json이 없습니다")
             else:
-                # 간단한 HTML 뷰어 직접 생성
-                self._create_simple_html_viewer(pages_data, pdf_path, output_path)
-                
+                logger.info(f"HTML 뷰어 생성: {viewer_path}")
         except Exception as e:
             logger.warning(f"HTML 뷰어 생성 실패: {e}")
             
-    def _create_simple_html_viewer(self, pages_data: List[Dict], pdf_path: Path, output_path: Path):
-        """간단한 HTML 뷰어 생성"""
-        html_content = """
-<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="UTF-8">
-    <title>SmartNougat 결과</title>
-    <script src="https://polyfill.io/v3/polyfill.min.js?features=es6"></script>
-    <script id="MathJax-script" async src="https://cdn.jsdelivr.net/npm/mathjax@3/es5/tex-mml-chtml.js"></script>
-    <style>
-        body { font-family: Arial, sans-serif; margin: 20px; }
-        .formula { margin: 20px 0; padding: 10px; border: 1px solid #ccc; }
-        .latex { background: #f5f5f5; padding: 10px; }
-        img { max-width: 500px; }
-    </style>
-</head>
-<body>
-    <h1>SmartNougat 처리 결과</h1>
-"""
-        
-        for page_data in pages_data:
-            html_content += f"<h2>페이지 {page_data['page_num'] + 1}</h2>"
-            
-            for formula in page_data.get('formulas', []):
-                html_content += f"""
-                <div class="formula">
-                    <h3>수식 {formula['index'] + 1}</h3>
-                    <img src="../{formula['image_path']}" alt="수식 이미지">
-                    <div class="latex">
-                        <h4>LaTeX:</h4>
-                        <pre>{formula['latex']}</pre>
-                        <h4>렌더링:</h4>
-                        $$
-                        {formula['latex']}
-                        $$
-                    </div>
-                </div>
-"""
-                
-        html_content += """
-</body>
-</html>
-"""
-        
-        html_path = output_path / "result_viewer.html"
-        with open(html_path, 'w', encoding='utf-8') as f:
-            f.write(html_content)
-            
-        logger.info(f"HTML 뷰어 생성: {html_path}")
-        
     def _save_processing_summary(self, result: Dict, output_path: Path):
         """처리 요약 저장"""
         summary = {
             'processing_time': result['processing_time'],
             'total_pages': result['pages'],
             'total_formulas': result['total_formulas'],
+            'skipped_pages': result.get('skipped_pages', []),
             'output_directory': str(output_path),
             'timestamp': datetime.now().isoformat(),
+            'stage_timings': result.get('stage_timings', {}),
             'formulas': result['formula_details']
         }
         
@@ -758,189 +1546,236 @@ class SmartNougatStandalone:
         with open(summary_path, 'w', encoding='utf-8') as f:
             json.dump(summary, f, ensure_ascii=False, indent=2)
             
-    def _extract_docx_pages_with_com(self, docx_path: Path, page_range: str, output_path: Path) -> Path:
-        """win32com을 사용하여 DOCX에서 특정 페이지 추출"""
-        if not WIN32COM_AVAILABLE:
-            logger.warning("win32com이 없어서 전체 문서를 변환합니다")
+    def _open_layout_target(self, pdf_path: Path, output_path: Path, in_place: bool):
+        """
+        layout.pdf 박스를 그릴 문서 준비
+        
+        기본은 빈 문서를 만들고 처리가 끝난 페이지를 이미 열린 원본(pdf_doc)에서
+        복사해 붙인다 (원본을 다시 열지 않고, 처리한/표시할 페이지만 저장).
+        in_place('overlay'로 전체 페이지를 처리할 때)이면 원본 파일을 복사한 뒤
+        그 복사본에 주석만 추가해 마지막에 증분 저장한다.
+        """
+        if self.layout_mode == 'none':
             return None
             
         try:
-            pythoncom.CoInitialize()
-            word = win32com.client.Dispatch("Word.Application")
-            word.Visible = False
-            
-            # 문서 열기
-            doc = word.Documents.Open(str(docx_path.absolute()))
-            
-            # 페이지 범위 파싱
-            pages = self._parse_page_range_for_word(page_range, doc)
-            
-            # 새 문서 생성
-            new_doc = word.Documents.Add()
-            
-            # 페이지별로 복사
-            for page_num in pages:
-                # 페이지 선택
-                doc.Activate()
-                word.Selection.GoTo(What=1, Which=1, Count=page_num)  # wdGoToPage=1
-                word.Selection.GoTo(What=1, Which=1, Count=page_num+1)
-                word.Selection.MoveUp()
-                word.Selection.Extend()
-                word.Selection.GoTo(What=1, Which=1, Count=page_num)
-                
-                # 복사 및 붙여넣기
-                word.Selection.Copy()
-                new_doc.Activate()
-                word.Selection.Paste()
+            if not in_place:
+                return fitz.open()
                 
-                # 페이지 나누기 추가 (마지막 페이지 제외)
-                if page_num != pages[-1]:
-                    word.Selection.InsertBreak(7)  # wdPageBreak
-            
-            # PDF로 저장
-            pdf_path = output_path / f"{docx_path.stem}_pages_{page_range.replace(':', '-')}.pdf"
-            new_doc.SaveAs2(str(pdf_path.absolute()), FileFormat=17)  # wdFormatPDF=17
-            
-            # 정리
-            new_doc.Close()
-            doc.Close()
-            word.Quit()
-            pythoncom.CoUninitialize()
-            
-            logger.info(f"DOCX 페이지 추출 완료: {pdf_path}")
-            return pdf_path
-            
+            layout_pdf_path = output_path / "layout.pdf"
+            shutil.copyfile(pdf_path, layout_pdf_path)
+            return fitz.open(layout_pdf_path)
         except Exception as e:
-            logger.error(f"win32com 페이지 추출 실패: {e}")
-            if 'word' in locals():
-                word.Quit()
-            pythoncom.CoUninitialize()
+            logger.warning(f"Layout PDF 준비 실패: {e}")
             return None
             
-    def _parse_page_range_for_word(self, page_range: str, doc) -> List[int]:
-        """Word 문서의 페이지 범위 파싱"""
-        # 전체 페이지 수 가져오기
-        doc.Repaginate()
-        total_pages = doc.ComputeStatistics(2)  # wdStatisticPages=2
-        
-        pages = []
-        page_range = page_range.strip()
-        
-        if '-' in page_range and ',' not in page_range:
-            parts = page_range.split('-')
-            if len(parts) == 2:
-                if parts[0] and parts[1]:
-                    start, end = int(parts[0]), int(parts[1])
-                    pages = list(range(start, end+1))
-                elif parts[0]:
-                    start = int(parts[0])
-                    pages = list(range(start, total_pages+1))
-                elif parts[1]:
-                    end = int(parts[1])
-                    pages = list(range(1, end+1))
-        elif ',' in page_range:
-            pages = [int(p.strip()) for p in page_range.split(',') if p.strip()]
-        elif ':' in page_range:
-            start, end = map(int, page_range.split(':'))
-            pages = list(range(start, end+1))
+    @staticmethod
+    def _has_formula_boxes(page_data: Dict) -> bool:
+        """수식 박스가 있는 페이지인지 ('annotated' 모드의 페이지 선택 기준)"""
+        return any(len(formula.get('bbox', [])) == 4 for formula in page_data.get('formulas', []))
+        
+    def _add_layout_page(self, layout_doc, pdf_doc, page_num: int, page_data: Dict, in_place: bool):
+        """처리가 끝난 페이지에 레이아웃 박스 표시 (in_place가 아니면 원본 페이지를 복사해 추가)"""
+        if in_place:
+            page = layout_doc[page_num]
         else:
-            pages = [int(page_range)]
-            
-        # 유효한 페이지만 필터링
-        return [p for p in pages if 1 <= p <= total_pages]
-    
-    def _generate_layout_pdf(self, pages_data: List[Dict], output_path: Path):
-        """레이아웃 분석 결과를 시각화한 PDF 생성"""
+            # 'annotated'는 수식 박스가 있는 페이지만 (텍스트 박스만 있는 페이지는 제외)
+            if self.layout_mode == 'annotated' and not self._has_formula_boxes(page_data):
+                return
+            # final=False: 페이지 간에 공유하는 폰트/이미지를 한 번만 복사
+            layout_doc.insert_pdf(pdf_doc, from_page=page_num, to_page=page_num, final=False)
+            page = layout_doc[-1]
+        self._draw_layout_boxes(page, page_data, as_annotations=(self.layout_mode == 'overlay'))
+        
+    def _draw_layout_boxes(self, page, page_data: Dict, as_annotations: bool = False):
+        """레이아웃 분석 결과(수식/텍스트 박스)를 페이지에 표시"""
+        boxes = []
+        
+        # 수식 박스: 인라인은 파란색, 블록은 빨간색
+        for formula in page_data.get('formulas', []):
+            bbox = formula.get('bbox', [])
+            if len(bbox) == 4:
+                color = (0, 0, 1) if formula.get('category_id') == 13 else (1, 0, 0)
+                boxes.append((bbox, color, 2))
+                
+        # 텍스트 블록 박스 (녹색)
+        for text_block in page_data.get('text_blocks', []):
+            rect = self._to_rect(text_block.get('bbox'))
+            if rect:
+                boxes.append((rect, (0, 1, 0), 1))
+                
+        for (x1, y1, x2, y2), color, width in boxes:
+            # 2배 확대된 좌표를 원본 크기로 변환
+            rect = fitz.Rect(x1 / 2, y1 / 2, x2 / 2, y2 / 2)
+            try:
+                if as_annotations:
+                    annot = page.add_rect_annot(rect)
+                    annot.set_colors(stroke=color)
+                    annot.set_border(width=width)
+                    annot.update()
+                else:
+                    page.draw_rect(rect, color=color, width=width)
+            except Exception as e:
+                logger.debug(f"레이아웃 박스 표시 실패: {e}")
+        
+    def _finish_layout_pdf(self, layout_doc, output_path: Path, in_place: bool):
+        """layout.pdf 저장 (in_place는 원본 복사본에 증분 저장, 아니면 추가한 페이지만 저장)"""
+        layout_pdf_path = output_path / "layout.pdf"
         try:
-            # 실제 처리에 사용된 PDF 사용
-            if hasattr(self, 'processed_pdf_path') and self.processed_pdf_path.exists():
-                source_pdf = self.processed_pdf_path
-            else:
-                # fallback: output 디렉토리에서 PDF 찾기
-                pdf_files = list(output_path.glob("*.pdf"))
-                if not pdf_files:
+            if in_place:
+                # 복사본에는 추가된 주석 객체만 덧붙임
+                if layout_doc.can_save_incrementally():
+                    layout_doc.saveIncr()
+                else:
+                    temp_path = output_path / "layout.tmp.pdf"
+                    layout_doc.save(str(temp_path))
+                    layout_doc.close()
+                    os.replace(temp_path, layout_pdf_path)
+                    logger.info(f"Layout PDF 생성: {layout_pdf_path}")
                     return
-                    
-                source_pdf = None
-                # 먼저 원본 PDF를 찾음 (pages_가 붙지 않은 파일)
-                for pdf in pdf_files:
-                    if pdf.name.endswith('.pdf') and "pages_" not in pdf.name and "layout" not in pdf.name:
-                        source_pdf = pdf
-                        break
+                layout_doc.close()
                 
-                # 원본이 없으면 pages_ 파일 사용
-                if not source_pdf:
-                    for pdf in pdf_files:
-                        if "pages_" in pdf.name:
-                            source_pdf = pdf
-                            break
-                        
-                if not source_pdf:
+            else:
+                if layout_doc.page_count == 0:
+                    logger.info("수식 박스가 없어 Layout PDF를 생성하지 않습니다")
+                    layout_doc.close()
                     return
+                layout_doc.save(str(layout_pdf_path))
+                layout_doc.close()
                 
-            # PDF 열기
-            doc = fitz.open(source_pdf)
+            logger.info(f"Layout PDF 생성: {layout_pdf_path}")
             
-            # 각 페이지에 박스 그리기
-            for page_data in pages_data:
-                page_num = page_data.get('page_num', 0)
+        except Exception as e:
+            logger.warning(f"Layout PDF 생성 실패: {e}")
+            if not layout_doc.is_closed:
+                layout_doc.close()
+    
+    def _process_docx_math(self, docx_path: Path, output_path: Path,
+                           page_range: Optional[str] = None) -> Optional[Dict]:
+        """
+        DOCX 수식 직접 변환 (word/document.xml의 OMML → LaTeX)
+        
+        모든 수식이 OMML인 경우에만 처리하고, OMML 수식이 없거나 OLE(수식 편집기/
+        MathType) 수식 또는 그림(w:drawing, v:imagedata - 그림으로 넣은 수식일 수
+        있음)이 있으면 None을 반환해 PDF 렌더링 + 인식 경로로 보낸다.
+        페이지는 Word가 마지막으로 저장한 페이지 나눔 기준이며 좌표는 없다.
+        페이지 범위가 주어졌는데 Word 페이지 정보가 없거나 선택 결과가 비면
+        역시 None을 반환한다 (PDF 변환 후 실제 페이지로 선택).
+        """
+        try:
+            docx = read_docx_math(docx_path)
+        except Exception as e:
+            logger.warning(f"DOCX 수식 직접 읽기 실패: {e}")
+            return None
+            
+        if docx.image_equations:
+            logger.info(f"OLE 수식 {docx.image_equations}개 - 이미지 인식 경로로 처리합니다")
+            return None
+        if docx.pictures:
+            logger.info(f"그림 {docx.pictures}개 (그림으로 넣은 수식일 수 있음) - 이미지 인식 경로로 처리합니다")
+            return None
+        if not docx.formula_count:
+            logger.info("DOCX에 OMML 수식이 없습니다 - 이미지 인식 경로로 처리합니다")
+            return None
+            
+        page_indices = list(range(docx.page_count))
+        if page_range:
+            # Word가 한 번도 배치하지 않은 문서는 페이지 정보가 없으므로 PDF 변환 후 페이지 선택
+            if not docx.rendered_breaks:
+                logger.info("DOCX에 Word 페이지 나눔 정보가 없습니다 - 페이지 범위는 PDF 변환 경로로 처리합니다")
+                return None
+            page_indices = select_pages(page_range, docx.page_count).tolist()
+            if not page_indices:
+                logger.info(f"페이지 범위 {page_range}가 DOCX 페이지 정보(전체 {docx.page_count}페이지)와 맞지 않습니다 - PDF 변환 경로로 처리합니다")
+                return None
                 
-                # 페이지 오프셋 조정 (pages_ 파일의 경우)
-                if hasattr(self, 'page_offset'):
-                    doc_page_num = page_num - self.page_offset
-                else:
-                    doc_page_num = page_num
+        logger.info(f"DOCX OMML 수식 {docx.formula_count}개 직접 변환 ({len(page_indices)}/{docx.page_count}페이지)")
+        self._create_directory_structure(output_path)
+        page_size = docx.page_size or [0, 0]
+        self.progress.set_pages(len(page_indices), source='docx_omml')
+        
+        all_pages_data = []
+        all_formulas = []
+        for page_num in page_indices:
+            formulas = []
+            text_blocks = []
+            reading_order = []
+            for paragraph in docx.pages[page_num]:
+                parts = []
+                for part in paragraph:
+                    if 'latex' not in part:
+                        parts.append({'text': part['text']})
+                        continue
+                    f_idx = len(formulas)
+                    formulas.append({
+                        'bbox': [0, 0, 0, 0],
+                        'confidence': 1.0,
+                        'category': 'block' if part['display'] else 'inline',
+                        'category_id': 14 if part['display'] else 13,
+                        'latex': part['latex'],
+                        'latex_score': None,
+                        'decode': 'omml',
+                        'image_path': '',
+                        'page_num': page_num,
+                        'index': f_idx
+                    })
+                    parts.append({'formula': f_idx})
                     
-                if doc_page_num >= len(doc) or doc_page_num < 0:
-                    continue
+                text = ''.join(p.get('text', '') for p in parts).strip()
+                if len(parts) == 1 and 'formula' in parts[0]:
+                    reading_order.append({'type': 'formula', 'formula': parts[0]['formula'], 'bbox': None})
+                elif any('formula' in p for p in parts):
+                    text_blocks.append({'content': text, 'bbox': None})
+                    reading_order.append({'type': 'line', 'text_block': len(text_blocks) - 1,
+                                          'bbox': None, 'parts': parts})
+                else:
+                    text_blocks.append({'content': text, 'bbox': None})
+                    reading_order.append({'type': 'text', 'text_block': len(text_blocks) - 1, 'bbox': None})
                     
-                page = doc[doc_page_num]
-                
-                # 수식 박스 그리기
-                for formula in page_data.get('formulas', []):
-                    bbox = formula.get('bbox', [])
-                    if len(bbox) == 4:
-                        # 2배 확대된 좌표를 원본 크기로 변환
-                        x1, y1, x2, y2 = bbox
-                        rect = fitz.Rect(x1/2, y1/2, x2/2, y2/2)
-                        # 인라인 수식: 파란색, 블록 수식: 빨간색
-                        if formula.get('category_id') == 13:  # inline
-                            color = (0, 0, 1)  # 파란색
-                        else:  # block
-                            color = (1, 0, 0)  # 빨간색
-                        page.draw_rect(rect, color=color, width=2)
-                        
-                # 텍스트 블록 박스 그리기 (녹색)
-                for text_block in page_data.get('text_blocks', []):
-                    if 'bbox' in text_block and text_block['bbox']:
-                        bbox = text_block['bbox']
-                        if isinstance(bbox[0], list):  # OCR bbox 형식
-                            x_coords = [p[0]/2 for p in bbox]
-                            y_coords = [p[1]/2 for p in bbox]
-                            rect = fitz.Rect(min(x_coords), min(y_coords), 
-                                           max(x_coords), max(y_coords))
-                        else:
-                            # 2배 확대된 좌표를 원본 크기로 변환
-                            x1, y1, x2, y2 = bbox
-                            rect = fitz.Rect(x1/2, y1/2, x2/2, y2/2)
-                        page.draw_rect(rect, color=(0, 1, 0), width=1)
+            all_pages_data.append({
+                'page_num': page_num,
+                'page_size': page_size,
+                'formulas': formulas,
+                'text_blocks': text_blocks,
+                'reading_order': reading_order,
+                'page_image': None
+            })
+            all_formulas.extend(formulas)
+            self.progress.page_done(page_num, len(formulas), 0.0)
             
-            # 저장
-            layout_pdf_path = output_path / "layout.pdf"
-            doc.save(str(layout_pdf_path))
-            doc.close()
-            
-            logger.info(f"Layout PDF 생성: {layout_pdf_path}")
+        self._save_results(all_pages_data, all_formulas, output_path)
+        with self._stage('viewer'):
+            self._generate_html_viewer(output_path)
+        
+        return {
+            'success': True,
+            'output_dir': str(output_path),
+            'pages': len(page_indices),
+            'total_formulas': len(all_formulas),
+            'skipped_pages': [],
+            'formula_details': all_formulas,
+            'source': 'docx_omml'
+        }
+        
+    def close(self):
+        """LibreOffice 변환 풀 종료 (문서 처리를 모두 마친 뒤 호출)"""
+        if self._office_pool is not None:
+            self._office_pool.close()
+            self._office_pool = None
             
-        except Exception as e:
-            logger.warning(f"Layout PDF 생성 실패: {e}")
-    
     def _convert_docx_to_pdf(self, docx_path: Path, output_path: Path) -> Path:
         """DOCX를 PDF로 변환"""
         # 출력 디렉토리 확인 및 생성
         output_path.mkdir(parents=True, exist_ok=True)
         
         pdf_path = output_path / f"{docx_path.stem}.pdf"
+        
+        # 같은 내용의 DOCX는 한 번만 변환 (DOCX 내용 해시로 캐시, 페이지 범위는 변환 후 선택)
+        docx_key = file_digest(docx_path) if self.cache.enabled else None
+        if docx_key and self.cache.fetch('docx_pdf', docx_key, '.pdf', pdf_path):
+            logger.info(f"변환된 PDF 캐시 사용: {docx_key[:12]}")
+            return pdf_path
+            
         logger.info(f"DOCX → PDF 변환: {docx_path} → {pdf_path}")
         
         # win32com 사용 시도 (수식 보존이 더 좋음)
@@ -981,145 +1816,58 @@ class SmartNougatStandalone:
                 
                 pythoncom.CoUninitialize()
                 logger.info("win32com으로 DOCX → PDF 변환 성공")
-                return pdf_path
+                return self._store_docx_pdf(pdf_path, docx_key)
                 
             except Exception as e:
                 import traceback
                 logger.warning(f"win32com 변환 실패: {e}")
                 logger.debug(f"상세 오류: {traceback.format_exc()}")
-                # docx2pdf로 폴백
+                # docx2pdf / LibreOffice로 폴백
         
-        # docx2pdf 사용 (폴백)
-        if not DOCX_AVAILABLE:
-            raise ImportError("docx2pdf가 설치되지 않았습니다. pip install docx2pdf")
+        # docx2pdf 사용 (Word가 필요하므로 Windows/macOS에서만)
+        if DOCX_AVAILABLE and sys.platform in ('win32', 'darwin'):
+            try:
+                docx2pdf_convert(str(docx_path), str(pdf_path))
+                logger.info("docx2pdf로 DOCX → PDF 변환 완료")
+                return self._store_docx_pdf(pdf_path, docx_key)
+            except Exception as e:
+                logger.warning(f"docx2pdf 변환 실패: {e}")
+                if not LIBREOFFICE_AVAILABLE:
+                    raise
+        
+        # LibreOffice headless (Word가 없을 때)
+        if not LIBREOFFICE_AVAILABLE:
+            raise ImportError("Word 또는 LibreOffice가 필요합니다. LibreOffice를 설치하거나 pip install docx2pdf")
             
-        docx2pdf_convert(str(docx_path), str(pdf_path))
-        logger.info("docx2pdf로 DOCX → PDF 변환 완료")
+        if self._office_pool is None:
+            self._office_pool = LibreOfficePool(workers=self.office_workers or 1)
+        self._office_pool.convert(docx_path, pdf_path)
+        logger.info("LibreOffice로 DOCX → PDF 변환 완료")
         
-        return pdf_path
+        return self._store_docx_pdf(pdf_path, docx_key)
         
-    def _extract_pages(self, pdf_path: Path, page_range: str, output_path: Path) -> Path:
-        """페이지 추출"""
-        # 페이지 범위 파싱
-        pages = []
+    def _store_docx_pdf(self, pdf_path: Path, docx_key: Optional[str]) -> Path:
+        """변환된 PDF를 캐시에 등록 (실패해도 변환 결과는 그대로 사용)"""
+        if docx_key and self.cache.put('docx_pdf', docx_key, '.pdf', pdf_path) is None:
+            logger.warning("변환 PDF 캐시 저장 실패")
+        return pdf_path
         
-        try:
-            # 공백 제거
-            page_range = page_range.strip()
-            
-            if '-' in page_range and ',' not in page_range:
-                # 범위 형식: "1-5" 또는 "-5" 또는 "5-"
-                parts = page_range.split('-')
-                if len(parts) == 2:
-                    if parts[0] and parts[1]:  # "1-5"
-                        start, end = int(parts[0]), int(parts[1])
-                        pages = list(range(start-1, end))
-                    elif parts[0]:  # "5-" (5페이지부터 끝까지)
-                        start = int(parts[0])
-                        doc_temp = fitz.open(pdf_path)
-                        pages = list(range(start-1, len(doc_temp)))
-                        doc_temp.close()
-                    elif parts[1]:  # "-5" (처음부터 5페이지까지)
-                        end = int(parts[1])
-                        pages = list(range(0, end))
-            elif ',' in page_range:
-                # 콤마 구분 형식: "1,3,5"
-                pages = [int(p.strip())-1 for p in page_range.split(',') if p.strip()]
-            elif ':' in page_range:
-                # 콜론 형식 처리: "1:20", ":20", "1:"
-                parts = page_range.split(':')
-                if len(parts) == 2:
-                    if parts[0] and parts[1]:  # "1:20"
-                        start, end = int(parts[0]), int(parts[1])
-                        pages = list(range(start-1, end))
-                    elif parts[0]:  # "1:" (1페이지부터 끝까지)
-                        start = int(parts[0])
-                        doc_temp = fitz.open(pdf_path)
-                        pages = list(range(start-1, len(doc_temp)))
-                        doc_temp.close()
-                    elif parts[1]:  # ":20" (처음부터 20페이지까지)
-                        end = int(parts[1])
-                        pages = list(range(0, end))
-            else:
-                # 단일 페이지
-                pages = [int(page_range)-1]
-                
-        except Exception as e:
-            logger.error(f"페이지 범위 파싱 오류: {e}")
-            raise ValueError(f"잘못된 페이지 범위 형식: {page_range}. 예: '1-5', '1,3,5', '10'.")
-            
-        # 페이지 추출
-        doc = fitz.open(pdf_path)
+    def _write_page_subset(self, pdf_doc, pdf_path: Path, page_indices: np.ndarray,
+                           output_path: Path) -> Path:
+        """선택한 페이지만 담은 PDF 저장 (save_subset_pdf, 처리에 사용한 원본 문서에서 복사)"""
+        subset_path = output_path / f"{pdf_path.stem}_pages_{format_page_ranges(page_indices)}.pdf"
         new_doc = fitz.open()
         
-        for page_num in pages:
-            if 0 <= page_num < len(doc):
-                new_doc.insert_pdf(doc, from_page=page_num, to_page=page_num)
-                
-        # 저장 - PDF/A 형식으로 저장하여 폰트 포함
-        extracted_path = output_path / f"{pdf_path.stem}_pages_{page_range}.pdf"
-        # 폰트 포함을 위한 옵션 설정
-        new_doc.save(
-            str(extracted_path),
-            garbage=4,  # 최대 압축
-            clean=True,  # 불필요한 객체 제거
-            deflate=True,  # 압축 사용
-            deflate_images=True,  # 이미지 압축
-            deflate_fonts=True  # 폰트 압축
-        )
-        
-        doc.close()
+        # 연속된 페이지는 한 번에 복사
+        for first, last in iter_runs(page_indices):
+            new_doc.insert_pdf(pdf_doc, from_page=first, to_page=last)
+            
+        # 재압축 없이 저장 (garbage=1: 참조되지 않는 객체만 제거)
+        new_doc.save(str(subset_path), garbage=1)
         new_doc.close()
         
-        return extracted_path
-
-
-def create_fixed_md(txt_dir):
-    """Create output_fixed.md from model_fixed.json"""
-    model_fixed_path = txt_dir / "model_fixed.json"
-    output_md_path = txt_dir / "output.md"
-    output_fixed_md_path = txt_dir / "output_fixed.md"
-    
-    # Read fixed model data
-    with open(model_fixed_path, 'r', encoding='utf-8') as f:
-        fixed_data = json.load(f)
-    
-    # Read original markdown if exists
-    if output_md_path.exists():
-        with open(output_md_path, 'r', encoding='utf-8') as f:
-            original_md = f.read()
-    else:
-        # Create new markdown if original doesn't exist
-        original_md = ""
-        for item in fixed_data:
-            original_md += f"\n$$\n{item.get('latex_original', item.get('latex', ''))}\n$$\n\n"
-    
-    # Create a mapping of original LaTeX to fixed LaTeX
-    latex_mapping = {}
-    for item in fixed_data:
-        if 'latex' in item:  # Check if latex key exists
-            if item.get('latex_original'):
-                # If there was a fix, map original to fixed
-                latex_mapping[item['latex_original']] = item['latex']
-            else:
-                # If no fix, keep the same
-                latex_mapping[item['latex']] = item['latex']
-    
-    # Replace LaTeX in markdown
-    fixed_md = original_md
-    for original, fixed in latex_mapping.items():
-        if original and fixed and original != fixed:
-            # Replace $$original$$ with $$fixed$$
-            fixed_md = fixed_md.replace(f"$$\n{original}\n$$", f"$$\n{fixed}\n$$")
-            fixed_md = fixed_md.replace(f"$${original}$$", f"$${fixed}$$")
-            # Also try with inline math
-            fixed_md = fixed_md.replace(f"${original}$", f"${fixed}$")
-    
-    # Save fixed markdown
-    with open(output_fixed_md_path, 'w', encoding='utf-8') as f:
-        f.write(fixed_md)
-    
-    return output_fixed_md_path
+        logger.info(f"선택 페이지 PDF 저장: {subset_path}")
+        return subset_path
 
 
 def main():
@@ -1129,9 +1877,52 @@ def main():
     )
     parser.add_argument('input', help='입력 파일 경로 (PDF/DOCX)')
     parser.add_argument('-o', '--output', default='./output', help='출력 디렉토리')
-    parser.add_argument('-p', '--pages', help='페이지 범위 (예: 1-5 또는 1,3,5)')
+    parser.add_argument('-p', '--pages', help='페이지 범위 (예: 1-5, 1,3,5, 1-5,9,12:)')
     parser.add_argument('--local-mathjax', action='store_true', help='로컬 MathJax 사용 (오프라인 모드)')
+    parser.add_argument('--link-images', action='store_true',
+                        help='뷰어에 수식 이미지를 base64로 넣지 않고 images/ 경로로 참조 (lazy loading)')
+    parser.add_argument('--virtual-viewer', action='store_true',
+                        help='페이지별 데이터 샤드를 지연 로딩하는 result_viewer_virtual.html 추가 생성 (대용량 문서용)')
+    parser.add_argument('--prerender-svg', action='store_true',
+                        help='뷰어 생성 시 node MathJax로 수식을 SVG로 미리 렌더링 (LaTeX 해시로 캐시, mathjax/에서 npm install 필요)')
     parser.add_argument('--device', default='auto', choices=['auto', 'cuda', 'cpu'])
+    parser.add_argument('--fallback', default='beam',
+                        choices=list(SmartNougatStandalone.FALLBACK_POLICIES),
+                        help='저신뢰 수식 재디코딩 방식 (기본: beam)')
+    parser.add_argument('--min-logprob', type=float, default=-0.3,
+                        help='재디코딩 기준 평균 토큰 로그확률 (기본: -0.3)')
+    parser.add_argument('--fallback-beams', type=int, default=4,
+                        help='재디코딩 시 빔 개수 (기본: 4)')
+    parser.add_argument('--fixed-crop', action='store_true',
+                        help='잉크 기준 crop 대신 고정 15%%/3%% bbox 확장 사용')
+    parser.add_argument('--no-merge', action='store_true',
+                        help='감지 박스 중복 제거/조각 병합 비활성화')
+    parser.add_argument('--no-prefilter', action='store_true',
+                        help='수식 없는 페이지 사전 판별 비활성화 (모든 페이지 렌더링/감지)')
+    parser.add_argument('--two-pass', action='store_true',
+                        help='1배 렌더링으로 감지 후 수식 영역만 고해상도로 렌더링')
+    parser.add_argument('--crop-zoom', type=float, default=3.0,
+                        help='--two-pass 수식 영역 렌더링 배율 (기본: 3.0)')
+    parser.add_argument('--no-vector', action='store_true',
+                        help='텍스트 레이어 기반 단순 인라인 수식 복원 비활성화 (모두 Nougat 사용)')
+    parser.add_argument('--layout', default='full',
+                        choices=list(SmartNougatStandalone.LAYOUT_MODES),
+                        help='layout.pdf 생성 방식: full(전체), annotated(수식이 있는 페이지만), '
+                             'overlay(주석+증분 저장), none (기본: full)')
+    parser.add_argument('--no-docx-math', action='store_true',
+                        help='DOCX OMML 수식 직접 변환 비활성화 (항상 PDF 변환 후 이미지 인식)')
+    parser.add_argument('--cache-dir', default=None,
+                        help='변환 PDF 등 캐시 디렉토리 (기본: ~/.cache/smartnougat/cache)')
+    parser.add_argument('--cache-size', type=float, default=5.0,
+                        help='캐시 크기 제한 GB, 초과 시 오래 쓰지 않은 항목부터 삭제 (0: 사용 안 함, 기본: 5)')
+    parser.add_argument('--office-workers', type=int, default=None,
+                        help='Word가 없을 때 LibreOffice DOCX 변환 슬롯 수 (기본: 1)')
+    parser.add_argument('--save-subset', action='store_true',
+                        help='-p 지정 시 선택한 페이지만 담은 PDF도 저장 (처리에는 원본을 직접 사용)')
+    parser.add_argument('--trace', action='store_true',
+                        help='단계별 처리 구간을 Chrome trace 형식(trace.json)으로 저장 (chrome://tracing, Perfetto)')
+    parser.add_argument('--progress-fd', type=int, default=None,
+                        help='진행 이벤트를 JSON 줄로 쓸 파일 디스크립터 (1: stdout, 2: stderr, GUI/배치 도구용)')
     parser.add_argument('--debug', action='store_true', help='디버그 모드')
     
     args = parser.parse_args()
@@ -1142,13 +1933,37 @@ def main():
     else:
         logger.add(sys.stderr, level="INFO")
         
+    # 진행 이벤트
+    progress = ProgressReporter(open_progress_stream(args.progress_fd)) if args.progress_fd is not None else None
+        
     # SmartNougat 실행
+    processor = None
     try:
-        processor = SmartNougatStandalone(device=args.device)
+        processor = SmartNougatStandalone(
+            device=args.device,
+            fallback_policy=args.fallback,
+            min_logprob=args.min_logprob,
+            fallback_beams=args.fallback_beams,
+            adaptive_crop=not args.fixed_crop,
+            merge_detections=not args.no_merge,
+            prefilter=not args.no_prefilter,
+            two_pass=args.two_pass,
+            crop_zoom=args.crop_zoom,
+            vector_fast_path=not args.no_vector,
+            layout_mode=args.layout,
+            save_subset_pdf=args.save_subset,
+            office_workers=args.office_workers,
+            docx_math=not args.no_docx_math,
+            cache_dir=args.cache_dir,
+            cache_size_gb=args.cache_size,
+            progress=progress,
+            trace=args.trace
+        )
         result = processor.process_document(
             args.input,
             args.output,
-            page_range=args.pages
+            page_range=args.pages,
+            finish=False
         )
         
         # 결과 출력
@@ -1156,7 +1971,8 @@ def main():
         print(f"[출력] 디렉토리: {result['output_dir']}")
         print(f"[페이지] 총: {result['pages']}")
         print(f"[수식] 총 {result['total_formulas']}개 발견")
-        print(f"[시간] 처리 시간: {result['processing_time']:.2f}초")
+        if result.get('skipped_pages'):
+            print(f"[생략] 수식 없는 페이지 {len(result['skipped_pages'])}개")
         
         # LaTeX 수정 처리
         print(f"\n[추가 처리] LaTeX 문법 수정 중...")
@@ -1167,11 +1983,12 @@ def main():
             try:
                 # fix_latex.py 실행
                 import subprocess
-                fix_result = subprocess.run(
-                    [sys.executable, "fix_latex.py", str(model_json_path)],
-                    capture_output=True,
-                    text=True
-                )
+                with processor._stage('fix_latex'):
+                    fix_result = subprocess.run(
+                        [sys.executable, "fix_latex.py", str(model_json_path)],
+                        capture_output=True,
+                        text=True
+                    )
                 
                 if fix_result.returncode == 0:
                     print("[✓] LaTeX 수정 완료")
@@ -1182,36 +1999,42 @@ def main():
                         create_fixed_md(txt_dir)
                         print("[✓] output_fixed.md 생성 완료")
                         
-                        # Fixed HTML viewer 생성 - 0714 버전으로 OMML 지원
-                        viewer_cmd = [sys.executable, "create_viewer_0714.py", str(result['output_dir'])]
+                        # Fixed HTML viewer 생성 - 같은 프로세스에서 스트리밍 작성 (서브프로세스 없음)
+                        # --local-mathjax는 기본값이 로컬 MathJax이므로 추가 처리 없음
+                        with processor._stage('fixed_viewer'):
+                            viewer_path = write_viewer(
+                                result['output_dir'], '0714',
+                                embed_images=not args.link_images,
+                                prerender_svg=args.prerender_svg
+                            )
+                            if viewer_path and args.virtual_viewer:
+                                write_viewer(result['output_dir'], 'virtual', prerender_svg=args.prerender_svg)
                         
-                        # 사용자가 명시적으로 옵션을 지정한 경우에만 추가
-                        if hasattr(args, 'local_mathjax') and args.local_mathjax:
-                            viewer_cmd.append("--local-mathjax")
-                        # 기본값은 자동 감지이므로 아무것도 추가하지 않음
-                        
-                        viewer_result = subprocess.run(
-                            viewer_cmd,
-                            capture_output=True,
-                            text=True
-                        )
-                        
-                        if viewer_result.returncode == 0:
-                            print("[✓] result_viewer_fixed.html 생성 완료")
+                        if viewer_path:
+                            print(f"[✓] {viewer_path.name} 생성 완료")
                         else:
-                            print(f"[경고] Fixed viewer 생성 실패: {viewer_result.stderr}")
+                            print("[경고] Fixed viewer 생성 실패")
                 else:
                     print(f"[경고] LaTeX 수정 실패: {fix_result.stderr}")
                     
             except Exception as e:
                 print(f"[경고] 추가 처리 중 오류: {e}")
+                
+        # 후처리 단계까지 끝난 뒤 처리 시간, 단계별 시간 요약 저장과 완료 이벤트
+        processor.finish_document(result)
+        print(f"[시간] 처리 시간: {result['processing_time']:.2f}초")
         
     except Exception as e:
         logger.error(f"처리 실패: {e}")
+        if progress is not None:
+            progress.fail(str(e))
         if args.debug:
             import traceback
             traceback.print_exc()
         sys.exit(1)
+    finally:
+        if processor is not None:
+            processor.close()
 
 
 if __name__ == "__main__":
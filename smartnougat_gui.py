@@ -10,7 +10,6 @@ import subprocess
 import threading
 import os
 import sys
-import re
 import time
 import queue
 from pathlib import Path
@@ -18,6 +17,9 @@ import json
 from datetime import datetime
 from tkinterdnd2 import DND_FILES, TkinterDnD
 
+from page_selection import parse_page_ranges
+from progress_events import parse_event
+
 class SmartNougatGUI:
     def __init__(self, root):
         self.root = root
@@ -39,6 +41,7 @@ class SmartNougatGUI:
         self.found_formulas = tk.IntVar(value=0)
         self.fixed_formulas = tk.IntVar(value=0)
         self.processing_time = tk.StringVar(value="0초")
+        self.eta = tk.StringVar(value="-")
         
         # Create UI
         self.create_widgets()
@@ -114,6 +117,14 @@ class SmartNougatGUI:
         self.time_label = ttk.Label(stats_frame, textvariable=self.processing_time)
         self.time_label.grid(row=2, column=3, sticky=tk.W)
         
+        ttk.Label(stats_frame, text="남은 시간:").grid(row=3, column=0, sticky=tk.W)
+        self.eta_label = ttk.Label(stats_frame, textvariable=self.eta)
+        self.eta_label.grid(row=3, column=1, sticky=tk.W)
+        
+        ttk.Label(stats_frame, text="현재 단계:").grid(row=3, column=2, sticky=tk.E)
+        self.stage_label = ttk.Label(stats_frame, text="-")
+        self.stage_label.grid(row=3, column=3, sticky=tk.W)
+        
         # Log section
         log_frame = ttk.LabelFrame(main_frame, text="처리 로그", padding="10")
         log_frame.grid(row=4, column=0, columnspan=3, sticky=(tk.W, tk.E, tk.N, tk.S), pady=10)
@@ -207,9 +218,18 @@ class SmartNougatGUI:
             messagebox.showwarning("경고", "파일을 먼저 선택해주세요.")
             return
         
+        # 페이지 범위는 처리 스크립트와 같은 파서로 미리 검사
+        if self.page_range.get().strip():
+            try:
+                parse_page_ranges(self.page_range.get())
+            except ValueError as e:
+                messagebox.showwarning("경고", str(e))
+                return
+        
         self.is_processing = True
         self.start_button.config(state=tk.DISABLED)
         self.stop_button.config(state=tk.NORMAL)
+        self.progress_bar.config(mode='indeterminate', value=0)
         self.progress_bar.start(10)
         
         # Reset statistics
@@ -217,6 +237,10 @@ class SmartNougatGUI:
         self.total_pages.set(0)
         self.found_formulas.set(0)
         self.fixed_formulas.set(0)
+        self.eta.set("-")
+        self.stage_label.config(text="-")
+        self.update_page_label()
+        self.update_formula_label()
         self.start_time = time.time()
         
         # Clear log
@@ -242,6 +266,9 @@ class SmartNougatGUI:
             # Add output folder
             cmd.extend(["-o", self.output_folder.get()])
             
+            # 진행 상황은 로그 대신 JSON 진행 이벤트로 받음 (stdout에 함께 출력)
+            cmd.extend(["--progress-fd", "1"])
+            
             self.output_queue.put(("info", f"실행 명령: {' '.join(cmd)}"))
             
             # Start process
@@ -277,23 +304,13 @@ class SmartNougatGUI:
             self.root.after(0, self.processing_finished)
     
     def parse_output(self, line):
-        """Parse output line and extract information"""
-        self.output_queue.put(("normal", line))
-        
-        # Extract page information
-        page_match = re.search(r'페이지\s*(\d+)/(\d+)', line)
-        if page_match:
-            current, total = map(int, page_match.groups())
-            self.current_page.set(current)
-            self.total_pages.set(total)
-            self.update_page_label()
+        """Parse output line: progress events go to handle_event, the rest to the log"""
+        event = parse_event(line)
+        if event is not None:
+            self.output_queue.put(("event", event))
+            return
         
-        # Extract formula count
-        formula_match = re.search(r'(\d+)개?\s*(?:발견|수식)', line)
-        if formula_match and '수식' in line:
-            count = int(formula_match.group(1))
-            self.found_formulas.set(count)
-            self.update_formula_label()
+        self.output_queue.put(("normal", line))
         
         # Extract fixed count
         if 'LaTeX 수정 완료' in line or 'Fixed' in line:
@@ -308,12 +325,45 @@ class SmartNougatGUI:
         try:
             while True:
                 tag, message = self.output_queue.get_nowait()
-                self.log(message, tag)
+                if tag == "event":
+                    self.handle_event(message)
+                else:
+                    self.log(message, tag)
         except queue.Empty:
             pass
         finally:
             self.root.after(100, self.check_output_queue)
     
+    def handle_event(self, event):
+        """Update statistics from one progress event (see progress_events.py)"""
+        kind = event.get('event')
+        if kind == 'pages':
+            self.total_pages.set(event['total'])
+            self.progress_bar.stop()
+            self.progress_bar.config(mode='determinate', maximum=max(event['total'], 1), value=0)
+            self.update_page_label()
+            self.stage_label.config(text="페이지 처리")
+        elif kind == 'page':
+            self.current_page.set(event['done'])
+            self.total_pages.set(event['total'])
+            self.found_formulas.set(event['formulas_total'])
+            self.progress_bar.config(value=event['done'])
+            self.eta.set(f"{int(event['eta'])}초")
+            self.update_page_label()
+            self.update_formula_label()
+        elif kind == 'stage_start':
+            self.stage_label.config(text=event['name'])
+        elif kind == 'done':
+            self.stage_label.config(text="완료")
+            self.found_formulas.set(event['formulas'])
+            self.eta.set("0초")
+            self.update_formula_label()
+            stages = ', '.join(f"{name} {seconds:.1f}초" for name, seconds in event['stages'].items())
+            if stages:
+                self.log(f"단계별 시간: {stages}", 'info')
+        elif kind == 'error':
+            self.log(event['message'], 'error')
+    
     def update_timer(self):
         """Update processing time"""
         if self.is_processing and self.start_time:
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Per-page spatial index for layout elements
+Uniform grid stored in CSR form (cell_start / cell_items) so that overlap
+queries, nearest-element lookups and point hit-tests touch only nearby cells.
+Built in memory per page (e.g. for reading-order assembly); it is not saved.
+"""
+
+from typing import Optional, Sequence
+
+import numpy as np
+
+
+class GridIndex:
+    """Uniform-grid spatial index over axis-aligned boxes [x1, y1, x2, y2]"""
+
+    def __init__(self, boxes: Sequence, cell_size: Optional[float] = None,
+                 width: Optional[float] = None, height: Optional[float] = None):
+        self.boxes = np.asarray(boxes, dtype=np.float32).reshape(-1, 4)
+        n = len(self.boxes)
+
+        if cell_size is None:
+            # Roughly two text lines per cell
+            heights = self.boxes[:, 3] - self.boxes[:, 1] if n else np.array([32.0])
+            cell_size = max(16.0, float(np.median(heights)) * 2)
+        self.cell_size = float(cell_size)
+
+        max_x = width if width is not None else (float(self.boxes[:, 2].max()) if n else 1.0)
+        max_y = height if height is not None else (float(self.boxes[:, 3].max()) if n else 1.0)
+        self.cols = max(1, int(np.ceil(max_x / self.cell_size)))
+        self.rows = max(1, int(np.ceil(max_y / self.cell_size)))
+
+        if n == 0:
+            self.cell_start = np.zeros(self.cols * self.rows + 1, dtype=np.int32)
+            self.cell_items = np.zeros(0, dtype=np.int32)
+            return
+
+        cx0, cy0, cx1, cy1 = self._cell_range(self.boxes.T)
+
+        # Expand every box into the cells it covers, without a Python loop
+        w = cx1 - cx0 + 1
+        counts = w * (cy1 - cy0 + 1)
+        item_ids = np.repeat(np.arange(n, dtype=np.int32), counts)
+        k = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        cell_x = np.repeat(cx0, counts) + k % np.repeat(w, counts)
+        cell_y = np.repeat(cy0, counts) + k // np.repeat(w, counts)
+        cell_ids = cell_y * self.cols + cell_x
+
+        order = np.argsort(cell_ids, kind='stable')
+        self.cell_items = item_ids[order]
+        per_cell = np.bincount(cell_ids, minlength=self.cols * self.rows)
+        self.cell_start = np.concatenate([[0], np.cumsum(per_cell)]).astype(np.int32)
+
+    def _cell_range(self, rect):
+        """Cell coordinate range covered by one rect or a (4, N) array of rects"""
+        x1, y1, x2, y2 = [np.asarray(v, dtype=np.float32) for v in rect]
+        cx0 = np.clip((x1 // self.cell_size).astype(np.int64), 0, self.cols - 1)
+        cy0 = np.clip((y1 // self.cell_size).astype(np.int64), 0, self.rows - 1)
+        cx1 = np.clip((x2 // self.cell_size).astype(np.int64), 0, self.cols - 1)
+        cy1 = np.clip((y2 // self.cell_size).astype(np.int64), 0, self.rows - 1)
+        return cx0, cy0, np.maximum(cx1, cx0), np.maximum(cy1, cy0)
+
+    def _candidates(self, rect) -> np.ndarray:
+        """Item ids stored in the cells covered by rect"""
+        cx0, cy0, cx1, cy1 = [int(v) for v in self._cell_range(rect)]
+        chunks = []
+        for cy in range(cy0, cy1 + 1):
+            row = cy * self.cols
+            start, end = self.cell_start[row + cx0], self.cell_start[row + cx1 + 1]
+            if end > start:
+                chunks.append(self.cell_items[start:end])
+        if not chunks:
+            return np.zeros(0, dtype=np.int32)
+        return np.unique(np.concatenate(chunks))
+
+    def query(self, rect) -> np.ndarray:
+        """Ids of boxes overlapping rect (touching edges count), in ascending order"""
+        ids = self._candidates(rect)
+        if ids.size == 0:
+            return ids
+        b = self.boxes[ids]
+        hit = (b[:, 0] <= rect[2]) & (b[:, 2] >= rect[0]) & (b[:, 1] <= rect[3]) & (b[:, 3] >= rect[1])
+        return ids[hit]
+
+    def hit_test(self, x: float, y: float) -> np.ndarray:
+        """Ids of boxes containing the point (x, y)"""
+        return self.query([x, y, x, y])
+
+    def nearest(self, rect, mask: Optional[np.ndarray] = None) -> Optional[int]:
+        """
+        Id of the box closest to rect (0 if overlapping), or None
+
+        Args:
+            mask: optional boolean array restricting eligible boxes
+        """
+        if len(self.boxes) == 0:
+            return None
+        x1, y1, x2, y2 = rect
+        extent = self.cell_size * max(self.cols, self.rows)
+        margin = 0.0
+        while True:
+            ids = self._eligible([x1 - margin, y1 - margin, x2 + margin, y2 + margin], mask)
+            if ids.size:
+                dist = self._distances(ids, rect)
+                best = float(dist.min())
+                if best > margin:
+                    # A closer box may lie outside the searched square; every box
+                    # within `best` intersects the rect grown by `best`
+                    ids = self._eligible([x1 - best, y1 - best, x2 + best, y2 + best], mask)
+                    dist = self._distances(ids, rect)
+                return int(ids[np.argmin(dist)])
+            if margin >= extent:
+                return None
+            margin = margin * 2 if margin else self.cell_size
+
+    def _eligible(self, rect, mask: Optional[np.ndarray]) -> np.ndarray:
+        ids = self._candidates(rect)
+        return ids[mask[ids]] if mask is not None and ids.size else ids
+
+    def _distances(self, ids: np.ndarray, rect) -> np.ndarray:
+        """Euclidean gap between rect and each box (0 when overlapping)"""
+        b = self.boxes[ids]
+        dx = np.maximum(0, np.maximum(b[:, 0] - rect[2], rect[0] - b[:, 2]))
+        dy = np.maximum(0, np.maximum(b[:, 1] - rect[3], rect[1] - b[:, 3]))
+        return np.hypot(dx, dy)
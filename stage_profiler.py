@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Per-stage profiling
+Records one span per call of each processing stage (render, PNG encode,
+YOLO, Nougat generate, OCR, ...) and summarizes them as count/total/p50/
+p95/max per stage for processing_summary.json. The raw spans can also be
+exported in Chrome trace format (chrome://tracing, Perfetto).
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Union
+
+import numpy as np
+
+
+class StageProfiler:
+    """Collects timed spans per stage name"""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.origin = time.perf_counter()
+        self._spans = []
+        self._threads = {}
+
+    @contextmanager
+    def span(self, name: str, **args):
+        """
+        Time one call of a stage
+
+        Yields the span's args dict so the caller can attach results, e.g.
+        span['tokens'] = n; a 'tokens' arg adds tokens/s to the summary.
+        """
+        start = time.perf_counter()
+        try:
+            yield args
+        finally:
+            self.add(name, start, time.perf_counter() - start, args)
+
+    def add(self, name: str, start: float, seconds: float, args: Dict = None):
+        """Record a span measured elsewhere (start is a time.perf_counter() value)"""
+        thread = self._threads.setdefault(threading.get_ident(), len(self._threads))
+        self._spans.append((name, start - self.origin, seconds, thread, args or {}))
+
+    def summary(self) -> Dict[str, Dict]:
+        """Per-stage statistics in seconds, slowest total first"""
+        durations = {}
+        tokens = {}
+        for name, _, seconds, _, args in self._spans:
+            durations.setdefault(name, []).append(seconds)
+            if 'tokens' in args:
+                tokens[name] = tokens.get(name, 0) + args['tokens']
+
+        stats = {}
+        for name, values in durations.items():
+            values = np.asarray(values)
+            total = float(values.sum())
+            stage = {
+                'count': int(values.size),
+                'total': round(total, 4),
+                'mean': round(total / values.size, 4),
+                'p50': round(float(np.percentile(values, 50)), 4),
+                'p95': round(float(np.percentile(values, 95)), 4),
+                'max': round(float(values.max()), 4)
+            }
+            if name in tokens:
+                stage['tokens'] = tokens[name]
+                stage['tokens_per_sec'] = round(tokens[name] / total, 1) if total > 0 else None
+            stats[name] = stage
+        return dict(sorted(stats.items(), key=lambda item: -item[1]['total']))
+
+    def write_chrome_trace(self, path: Union[str, Path]) -> Path:
+        """Write the spans as Chrome trace 'complete' events (microseconds)"""
+        pid = os.getpid()
+        events = [
+            {'name': name, 'ph': 'X', 'ts': round(start * 1e6, 1), 'dur': round(seconds * 1e6, 1),
+             'pid': pid, 'tid': thread, 'args': args}
+            for name, start, seconds, thread, args in self._spans
+        ]
+        path = Path(path)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f,
+                      ensure_ascii=False, default=str)
+        return path
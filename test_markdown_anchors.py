@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests for markdown_anchors (run with: python -m pytest test_markdown_anchors.py)
+"""
+
+import json
+
+from markdown_anchors import FORMULA_ANCHOR_RE, create_fixed_md, formula_markdown
+
+
+def test_formula_anchor_round_trip():
+    for latex, inline in [('x^2', True), ('a < b\n+ c', False), ('$', True)]:
+        match = FORMULA_ANCHOR_RE.fullmatch(formula_markdown(4, 7, latex, inline))
+        assert match.group(1, 2) == ('4', '7')
+        assert match.group(3).startswith('\n$$') == (not inline)
+
+
+def test_create_fixed_md_replaces_at_anchors(tmp_path):
+    txt_dir = tmp_path / "doc_smartnougat" / "txt"
+    txt_dir.mkdir(parents=True)
+    original = (
+        "\n## Page 1\n\nText with " + formula_markdown(0, 0, 'x^2', True) + " and "
+        + formula_markdown(0, 1, 'x^2', True) + ".\n"
+        + formula_markdown(0, 2, 'y', False) + "\n"
+        + "\n## Page 3\n\n" + formula_markdown(2, 0, 'a+b', False) + "\nEnd $x^2$\n"
+    )
+    (txt_dir / "doc_smartnougat.md").write_text(original, encoding='utf-8')
+    model_fixed = [
+        {'page_idx': 0, 'layout_dets': [{'latex': 'x^{2}'}, {'category_id': 1}, {'latex': 'y'}]},
+        {'page_idx': 2, 'layout_dets': [{'latex': 'a + b = c'}]}
+    ]
+    (txt_dir / "model_fixed.json").write_text(json.dumps(model_fixed), encoding='utf-8')
+
+    fixed = create_fixed_md(txt_dir).read_text(encoding='utf-8')
+
+    assert fixed == (
+        "\n## Page 1\n\nText with " + formula_markdown(0, 0, 'x^{2}', True) + " and "
+        + formula_markdown(0, 1, 'x^2', True) + ".\n"
+        + formula_markdown(0, 2, 'y', False) + "\n"
+        + "\n## Page 3\n\n" + formula_markdown(2, 0, 'a + b = c', False) + "\nEnd $x^2$\n"
+    )
+    # Anchors survive, so fixing the fixed markdown again changes nothing
+    (txt_dir / "doc_smartnougat.md").write_text(fixed, encoding='utf-8')
+    assert create_fixed_md(txt_dir).read_text(encoding='utf-8') == fixed
+
+
+def test_create_fixed_md_without_markdown(tmp_path):
+    txt_dir = tmp_path / "doc_smartnougat" / "txt"
+    txt_dir.mkdir(parents=True)
+    model_fixed = [{'page_idx': 5, 'layout_dets': [{'latex': 'z'}]}]
+    (txt_dir / "model_fixed.json").write_text(json.dumps(model_fixed), encoding='utf-8')
+
+    fixed = create_fixed_md(txt_dir).read_text(encoding='utf-8')
+    assert fixed == formula_markdown(5, 0, 'z', False) + "\n\n"
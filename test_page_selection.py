@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests for page_selection (run with: python -m pytest test_page_selection.py)
+"""
+
+import numpy as np
+import pytest
+
+from page_selection import format_page_ranges, iter_runs, parse_page_ranges, select_pages
+
+
+def test_parse_mixed_spec():
+    assert parse_page_ranges("1-5, 9 ,12:") == [(1, 5), (9, 9), (12, None)]
+    assert parse_page_ranges("3:5,7-") == [(3, 5), (7, None)]
+
+
+def test_parse_open_start():
+    assert parse_page_ranges(":3") == [(1, 3)]
+    assert parse_page_ranges("-3") == [(1, 3)]
+
+
+def test_parse_empty_selects_all():
+    assert parse_page_ranges("") == [(1, None)]
+    assert parse_page_ranges(None) == [(1, None)]
+
+
+@pytest.mark.parametrize("spec", ["a", "1-2-3", "0", "5-3", ":", ",", "1;2"])
+def test_parse_rejects_malformed(spec):
+    with pytest.raises(ValueError):
+        parse_page_ranges(spec)
+
+
+def test_select_mixed_spec():
+    assert select_pages("1-3,5,8:", 10).tolist() == [0, 1, 2, 4, 7, 8, 9]
+
+
+def test_select_open_ranges():
+    assert select_pages(":3", 10).tolist() == [0, 1, 2]
+    assert select_pages("12:", 15).tolist() == [11, 12, 13, 14]
+    assert select_pages("", 3).tolist() == [0, 1, 2]
+
+
+def test_select_overlap_is_sorted_and_unique():
+    selected = select_pages("5-8,1-6,7,2", 10)
+    assert selected.tolist() == [0, 1, 2, 3, 4, 5, 6, 7]
+    assert selected.dtype == np.int32
+
+
+def test_select_out_of_range():
+    assert select_pages("8-20", 10).tolist() == [7, 8, 9]
+    assert select_pages("12:", 10).tolist() == []
+    assert select_pages("11,3", 10).tolist() == [2]
+    assert select_pages("1-5", 0).tolist() == []
+
+
+def test_iter_runs():
+    assert list(iter_runs([0, 1, 2, 4, 7, 8])) == [(0, 2), (4, 4), (7, 8)]
+    assert list(iter_runs(np.array([3], dtype=np.int32))) == [(3, 3)]
+    assert list(iter_runs([])) == []
+
+
+def test_format_round_trip():
+    selected = select_pages("1-5,9,12:", 14)
+    assert format_page_ranges(selected) == "1-5,9,12-14"
+    assert select_pages(format_page_ranges(selected), 14).tolist() == selected.tolist()
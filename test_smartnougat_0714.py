@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests for SmartNougatStandalone._merge_detections (no models are loaded)
+(run with: python -m pytest test_smartnougat_0714.py)
+"""
+
+import pytest
+
+pytest.importorskip("torch")
+pytest.importorskip("fitz")
+pytest.importorskip("cv2")
+
+from smartnougat_0714 import SmartNougatStandalone  # noqa: E402
+
+
+@pytest.fixture
+def processor():
+    # _merge_detections uses no model state, so skip __init__ (model loading)
+    return SmartNougatStandalone.__new__(SmartNougatStandalone)
+
+
+def det(bbox, category_id=0, confidence=0.5):
+    return {'bbox': bbox, 'category_id': category_id, 'confidence': confidence}
+
+
+def test_merge_contained_box(processor):
+    merged = processor._merge_detections([det([10, 10, 40, 40], 0, 0.9), det([0, 0, 200, 50], 1, 0.6)])
+    assert len(merged) == 1
+    assert merged[0]['bbox'] == [0, 0, 200, 50]
+    assert merged[0]['merged_from'] == [0, 1]
+    assert merged[0]['merge'] == 'contained'
+    assert merged[0]['confidence'] == pytest.approx(0.9)
+
+
+def test_merge_adjacent_fragments(processor):
+    merged = processor._merge_detections([
+        det([0, 0, 50, 20], confidence=0.4),
+        det([55, 2, 100, 20], confidence=0.8),
+        det([104, 1, 150, 21], confidence=0.6)
+    ])
+    assert len(merged) == 1
+    assert merged[0]['bbox'] == [0, 0, 150, 21]
+    assert merged[0]['merged_from'] == [0, 1, 2]
+    assert merged[0]['merge'] == 'adjacent'
+    assert merged[0]['confidence'] == pytest.approx(0.8)
+
+
+def test_merge_keeps_separate_boxes(processor):
+    formulas = [
+        det([0, 0, 50, 20]),
+        det([55, 0, 100, 20], category_id=1),  # other category
+        det([200, 0, 250, 20]),                # gap too wide
+        det([0, 30, 50, 50])                   # next line
+    ]
+    merged = processor._merge_detections(formulas)
+    assert [f['bbox'] for f in merged] == [f['bbox'] for f in formulas]
+    assert not any('merged_from' in f for f in merged)
+
+
+def test_merge_identical_boxes_keep_first(processor):
+    merged = processor._merge_detections([det([0, 0, 50, 20], confidence=0.3), det([0, 0, 50, 20], confidence=0.7)])
+    assert len(merged) == 1
+    assert merged[0]['merged_from'] == [0, 1]
+    assert merged[0]['confidence'] == pytest.approx(0.7)
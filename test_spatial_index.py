@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests for spatial_index (run with: python -m pytest test_spatial_index.py)
+GridIndex results are checked against brute force over random layouts.
+"""
+
+import numpy as np
+import pytest
+
+from spatial_index import GridIndex
+
+
+def random_boxes(rng, n, width=1200, height=1600):
+    x1 = rng.uniform(0, width - 10, n)
+    y1 = rng.uniform(0, height - 10, n)
+    w = rng.uniform(2, 300, n)
+    h = rng.uniform(2, 60, n)
+    return np.stack([x1, y1, np.minimum(x1 + w, width), np.minimum(y1 + h, height)], axis=1).astype(np.float32)
+
+
+def brute_query(boxes, rect):
+    hit = ((boxes[:, 0] <= rect[2]) & (boxes[:, 2] >= rect[0]) &
+           (boxes[:, 1] <= rect[3]) & (boxes[:, 3] >= rect[1]))
+    return np.flatnonzero(hit)
+
+
+def brute_distances(boxes, rect):
+    dx = np.maximum(0, np.maximum(boxes[:, 0] - rect[2], rect[0] - boxes[:, 2]))
+    dy = np.maximum(0, np.maximum(boxes[:, 1] - rect[3], rect[1] - boxes[:, 3]))
+    return np.hypot(dx, dy)
+
+
+@pytest.mark.parametrize("seed, n, cell_size", [(0, 50, None), (1, 400, None), (2, 200, 16.0), (3, 30, 500.0)])
+def test_query_matches_brute_force(seed, n, cell_size):
+    rng = np.random.default_rng(seed)
+    boxes = random_boxes(rng, n)
+    index = GridIndex(boxes, cell_size=cell_size)
+    for rect in random_boxes(rng, 200):
+        assert index.query(rect).tolist() == brute_query(boxes, rect).tolist()
+
+
+def test_query_outside_and_touching():
+    index = GridIndex([[0, 0, 10, 10], [20, 0, 30, 10]], cell_size=16)
+    assert index.query([10, 0, 20, 5]).tolist() == [0, 1]
+    assert index.query([11, 0, 19, 5]).tolist() == []
+    # Rects past the grid are clipped to the border cells
+    assert index.query([25, -50, 500, 500]).tolist() == [1]
+
+
+def test_hit_test_matches_brute_force():
+    rng = np.random.default_rng(4)
+    boxes = random_boxes(rng, 300)
+    index = GridIndex(boxes)
+    for x, y in rng.uniform(0, 1200, (200, 2)):
+        assert index.hit_test(x, y).tolist() == brute_query(boxes, [x, y, x, y]).tolist()
+
+
+def test_nearest_matches_brute_force():
+    rng = np.random.default_rng(5)
+    boxes = random_boxes(rng, 150)
+    index = GridIndex(boxes)
+    mask = rng.random(len(boxes)) < 0.3
+    for rect in random_boxes(rng, 100):
+        best = index.nearest(rect)
+        assert brute_distances(boxes[[best]], rect)[0] == pytest.approx(brute_distances(boxes, rect).min())
+        best = index.nearest(rect, mask)
+        assert mask[best]
+        assert brute_distances(boxes[[best]], rect)[0] == pytest.approx(brute_distances(boxes[mask], rect).min())
+
+
+def test_nearest_empty():
+    assert GridIndex([]).nearest([0, 0, 10, 10]) is None
+    index = GridIndex([[0, 0, 10, 10]])
+    assert index.nearest([0, 0, 1, 1], np.array([False])) is None
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Vector PDF formula reader
+Reconstructs simple inline formulas directly from embedded glyph data
+(page.get_text("rawdict")) so that born-digital PDFs skip Nougat for them
+"""
+
+import unicodedata
+from typing import Dict, List, Optional
+
+
+class VectorFormulaReader:
+    """Read simple inline formulas from PDF glyph, font and position data"""
+
+    # Unicode glyph → LaTeX command
+    GLYPH_TO_LATEX = {
+        'α': '\\alpha', 'β': '\\beta', 'γ': '\\gamma', 'δ': '\\delta',
+        'ε': '\\epsilon', 'ϵ': '\\epsilon', 'ζ': '\\zeta', 'η': '\\eta',
+        'θ': '\\theta', 'ϑ': '\\vartheta', 'ι': '\\iota', 'κ': '\\kappa',
+        'λ': '\\lambda', 'μ': '\\mu', 'ν': '\\nu', 'ξ': '\\xi', 'π': '\\pi',
+        'ρ': '\\rho', 'σ': '\\sigma', 'τ': '\\tau', 'υ': '\\upsilon',
+        'φ': '\\phi', 'ϕ': '\\phi', 'χ': '\\chi', 'ψ': '\\psi', 'ω': '\\omega',
+        'Γ': '\\Gamma', 'Δ': '\\Delta', 'Θ': '\\Theta', 'Λ': '\\Lambda',
+        'Ξ': '\\Xi', 'Π': '\\Pi', 'Σ': '\\Sigma', 'Υ': '\\Upsilon',
+        'Φ': '\\Phi', 'Ψ': '\\Psi', 'Ω': '\\Omega',
+        '−': '-', '×': '\\times', '÷': '\\div', '±': '\\pm', '∓': '\\mp',
+        '·': '\\cdot', '⋅': '\\cdot', '∗': '*', '∘': '\\circ',
+        '≤': '\\leq', '≥': '\\geq', '≠': '\\neq', '≈': '\\approx',
+        '≡': '\\equiv', '∼': '\\sim', '∝': '\\propto', '∈': '\\in',
+        '∉': '\\notin', '⊂': '\\subset', '⊆': '\\subseteq', '⊃': '\\supset',
+        '⊇': '\\supseteq', '∪': '\\cup', '∩': '\\cap', '→': '\\rightarrow',
+        '←': '\\leftarrow', '⇒': '\\Rightarrow', '⇔': '\\Leftrightarrow',
+        '∞': '\\infty', '∂': '\\partial', '∇': '\\nabla', '∀': '\\forall',
+        '∃': '\\exists', '∅': '\\emptyset', '′': "'", '…': '\\ldots',
+        '⋯': '\\cdots', '|': '|', '∣': '|',
+    }
+
+    # Characters that can be emitted as-is
+    PLAIN_CHARS = set('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ'
+                      '0123456789+-=()[],.;:/<>!\'')
+
+    # Upright letter runs that become operator names
+    FUNCTIONS = {'sin', 'cos', 'tan', 'cot', 'sec', 'csc', 'log', 'ln', 'exp',
+                 'lim', 'max', 'min', 'sup', 'inf', 'det', 'gcd'}
+
+    # Fonts carrying big operators, radicals and extensible delimiters
+    COMPLEX_FONT_HINTS = ('cmex', 'msbm', 'eufm', 'rsfs')
+
+    def __init__(self, page, max_chars: int = 24, raw: Optional[Dict] = None):
+        self.page = page
+        self.max_chars = max_chars
+        self._raw = raw
+        self._chars = None
+        self._rules = None
+
+    def _load_chars(self) -> List[Dict]:
+        """Flatten rawdict into a list of glyphs with span font/size"""
+        if self._chars is None:
+            self._chars = []
+            raw = self._raw if self._raw is not None else self.page.get_text("rawdict")
+            for block in raw.get('blocks', []):
+                for line in block.get('lines', []):
+                    for span in line.get('spans', []):
+                        font = span.get('font', '')
+                        for ch in span.get('chars', []):
+                            if not ch.get('c', '').strip():
+                                continue
+                            self._chars.append({
+                                'c': ch['c'],
+                                'bbox': ch['bbox'],
+                                'origin': ch['origin'],
+                                'size': span.get('size', 0),
+                                'font': font,
+                                'italic': bool(span.get('flags', 0) & 2)
+                            })
+        return self._chars
+
+    def _load_rules(self) -> List:
+        """Horizontal vector rules (fraction bars, overlines)"""
+        if self._rules is None:
+            self._rules = []
+            try:
+                for drawing in self.page.get_drawings():
+                    rect = drawing.get('rect')
+                    if rect is not None and rect.height < 1.5 and rect.width > 2:
+                        self._rules.append(rect)
+            except Exception:
+                pass
+        return self._rules
+
+    def read(self, bbox: List[float], scale: float = 2.0) -> Optional[str]:
+        """
+        Reconstruct the formula inside bbox, or None if it is not simple
+
+        Args:
+            bbox: formula bbox in rendered-image coordinates
+            scale: render scale of bbox relative to PDF points
+        """
+        x1, y1, x2, y2 = [v / scale for v in bbox]
+
+        chars = []
+        for ch in self._load_chars():
+            cx0, cy0, cx1, cy1 = ch['bbox']
+            cx, cy = (cx0 + cx1) / 2, (cy0 + cy1) / 2
+            if x1 <= cx <= x2 and y1 <= cy <= y2:
+                chars.append(ch)
+
+        if not chars or len(chars) > self.max_chars:
+            return None
+
+        # Fraction bars or overlines make it a 2D layout
+        for rect in self._load_rules():
+            if rect.x0 < x2 and rect.x1 > x1 and y1 <= (rect.y0 + rect.y1) / 2 <= y2:
+                return None
+
+        for ch in chars:
+            font = ch['font'].lower()
+            if any(hint in font for hint in self.COMPLEX_FONT_HINTS):
+                return None
+
+        chars.sort(key=lambda ch: ch['bbox'][0])
+
+        # Baseline levels relative to the largest glyphs
+        main_size = max(ch['size'] for ch in chars)
+        base_y = min(ch['origin'][1] for ch in chars if ch['size'] >= main_size * 0.95)
+        levels = []
+        for ch in chars:
+            shift = ch['origin'][1] - base_y
+            if ch['size'] < main_size * 0.85 and shift < -0.15 * main_size:
+                levels.append('sup')
+            elif ch['size'] < main_size * 0.85 and shift > 0.1 * main_size:
+                levels.append('sub')
+            elif abs(shift) <= 0.15 * main_size:
+                levels.append('base')
+            else:
+                return None
+
+        # Stacked glyphs (limits, sub+sup on one base) need Nougat
+        for i in range(len(chars) - 1):
+            a, b = chars[i]['bbox'], chars[i + 1]['bbox']
+            overlap = min(a[2], b[2]) - max(a[0], b[0])
+            if overlap > 0.5 * min(a[2] - a[0], b[2] - b[0]) and levels[i] != levels[i + 1]:
+                return None
+
+        tokens = []
+        for ch, level in zip(chars, levels):
+            token = self._glyph_to_latex(ch['c'])
+            if token is None:
+                return None
+            tokens.append((token, level, ch))
+
+        return self._assemble(tokens)
+
+    def _glyph_to_latex(self, c: str) -> Optional[str]:
+        """Map a single glyph to LaTeX, or None if unsupported"""
+        if c in self.GLYPH_TO_LATEX:
+            return self.GLYPH_TO_LATEX[c]
+        # Superscript/subscript code points would lose their position
+        if 0x2070 <= ord(c) <= 0x209F or c in '¹²³':
+            return None
+        # Mathematical alphanumerics (𝑥, 𝐀, ...) fold to ASCII
+        folded = unicodedata.normalize('NFKC', c)
+        if len(folded) == 1 and folded in self.PLAIN_CHARS:
+            return folded
+        return None
+
+    def _assemble(self, tokens: List) -> str:
+        """Join tokens, grouping scripts and naming upright functions"""
+        parts = []
+        i = 0
+        while i < len(tokens):
+            token, level, ch = tokens[i]
+            j = i + 1
+            while j < len(tokens) and tokens[j][1] == level:
+                j += 1
+            run = tokens[i:j]
+            text = self._join(run)
+            if level == 'sup':
+                parts.append(f"^{{{text}}}")
+            elif level == 'sub':
+                parts.append(f"_{{{text}}}")
+            else:
+                parts.append(text)
+            i = j
+        return ''.join(parts).strip()
+
+    def _join(self, run: List) -> str:
+        """Join a run of same-level tokens"""
+        out = []
+        i = 0
+        while i < len(run):
+            # Upright letter runs matching a function name
+            if run[i][0].isalpha() and not run[i][2]['italic']:
+                j = i
+                while j < len(run) and run[j][0].isalpha() and len(run[j][0]) == 1 \
+                        and not run[j][2]['italic']:
+                    j += 1
+                word = ''.join(t[0] for t in run[i:j])
+                if word in self.FUNCTIONS:
+                    out.append(f"\\{word} ")
+                    i = j
+                    continue
+            token = run[i][0]
+            # Commands followed by a letter need a separating space
+            if out and out[-1].startswith('\\') and out[-1][-1].isalpha() and token[0].isalpha():
+                out.append(' ')
+            out.append(token)
+            i += 1
+        return ''.join(out).strip()
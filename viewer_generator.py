@@ -0,0 +1,2436 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Streaming HTML viewer generator
+Pairs model.json (or model.npz) with model_fixed.json once and writes the
+viewer card by card through a pluggable template, so memory stays flat for
+large outputs and the pipeline can call it in-process.
+
+Templates:
+    0714     - vertical cards (result_viewer_0714.html, pipeline default)
+    simple   - vertical cards (result_viewer_fixed.html)
+    panel    - original/fixed LaTeX panels with local-or-CDN MathJax (v2)
+    grid     - two-column cards, MathJax path auto-detected in the page (v3)
+    compare  - original and fixed renderings side by side
+    virtual  - per-page data shards loaded on scroll (result_viewer_virtual.html)
+"""
+
+import json
+import html
+import base64
+import sys
+import os
+import shutil
+import hashlib
+import argparse
+import subprocess
+from pathlib import Path
+from datetime import datetime
+
+from latex_omml import LaTeXToOMML
+from results_store import ResultsReader
+
+
+CDN_MATHJAX = "https://cdn.jsdelivr.net/npm/mathjax@3/es5/tex-svg.js"
+
+
+# Shared viewer styles (plain string, inserted into the HTML templates)
+VIEWER_CSS = '''<style>
+        body {
+            font-family: -apple-system, Arial, sans-serif;
+            line-height: 1.6;
+            color: #333;
+            max-width: 1200px;
+            margin: 0 auto;
+            padding: 20px;
+            background: #f5f5f5;
+        }
+        
+        h1 {
+            text-align: center;
+            color: #333;
+            margin-bottom: 30px;
+        }
+        
+        .stats {
+            background: white;
+            padding: 20px;
+            border-radius: 8px;
+            margin-bottom: 30px;
+            text-align: center;
+            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+        }
+        
+        .formula-card {
+            background: white;
+            margin-bottom: 40px;
+            border-radius: 8px;
+            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+            padding: 20px;
+        }
+        
+        .card-header {
+            display: flex;
+            justify-content: space-between;
+            align-items: center;
+            margin-bottom: 20px;
+            padding-bottom: 15px;
+            border-bottom: 2px solid #e5e7eb;
+            font-size: 16px;
+        }
+        
+        .formula-number {
+            font-weight: bold;
+            color: #2563eb;
+        }
+        
+        .category-inline {
+            color: #10b981;
+            font-weight: 500;
+        }
+        
+        .category-block {
+            color: #8b5cf6;
+            font-weight: 500;
+        }
+        
+        .fixed {
+            color: #10b981;
+            font-weight: 600;
+        }
+        
+        /* 이미지 섹션 */
+        .formula-image {
+            text-align: center;
+            margin-bottom: 25px;
+            padding: 20px;
+            background: white;
+            border-radius: 8px;
+            border: 1px solid #e5e7eb;
+            position: relative;
+            overflow: auto;
+        }
+        
+        .formula-image img {
+            max-width: 100%;
+            height: auto;
+            display: inline-block;
+            transform-origin: center;
+            transition: transform 0.2s ease;
+            transform: scale(1.2);
+        }
+        
+        .formula-image .zoom-controls {
+            background: rgba(37, 99, 235, 0.9);
+        }
+        
+        /* LaTeX 코드 박스 */
+        .latex-box {
+            margin-bottom: 20px;
+            border: 1px solid #e5e7eb;
+            border-radius: 8px;
+            overflow: hidden;
+        }
+        
+        .latex-box h4 {
+            margin: 0;
+            padding: 10px 15px;
+            background: #f3f4f6;
+            font-size: 14px;
+            font-weight: 600;
+            border-bottom: 1px solid #e5e7eb;
+        }
+        
+        .latex-code {
+            padding: 15px;
+            background: #e5e7eb;
+            font-family: 'Monaco', 'Consolas', monospace;
+            font-size: 14px;
+            overflow-x: auto;
+            white-space: pre-wrap;
+            word-break: break-all;
+            font-weight: bold;
+            color: #111827;
+        }
+        
+        /* 렌더링 결과 */
+        .rendered-math {
+            background: #2563eb;
+            padding: 32px 20px;
+            border-radius: 8px;
+            text-align: center;
+            min-height: 80px;
+            position: relative;
+            color: white;
+            overflow: auto;
+        }
+        
+        .rendered-math h4 {
+            position: absolute;
+            top: 10px;
+            left: 15px;
+            margin: 0;
+            font-size: 14px;
+            color: #bfdbfe;
+        }
+        
+        /* 줌 컨트롤 */
+        .zoom-controls {
+            position: absolute;
+            top: 10px;
+            right: 10px;
+            display: flex;
+            gap: 5px;
+            align-items: center;
+        }
+        
+        .zoom-btn {
+            background: rgba(255, 255, 255, 0.2);
+            border: 1px solid rgba(255, 255, 255, 0.3);
+            color: white;
+            width: 30px;
+            height: 30px;
+            border-radius: 4px;
+            cursor: pointer;
+            font-size: 18px;
+            display: flex;
+            align-items: center;
+            justify-content: center;
+        }
+        
+        .zoom-btn:hover {
+            background: rgba(255, 255, 255, 0.3);
+        }
+        
+        .zoom-level {
+            color: white;
+            font-size: 12px;
+            min-width: 40px;
+            text-align: center;
+        }
+        
+        .rendered-math mjx-container {
+            color: white !important;
+            max-width: 100%;
+            overflow-x: auto;
+        }
+        
+        .rendered-math svg {
+            fill: white !important;
+        }
+        
+        .rendered-math svg * {
+            fill: white !important;
+            stroke: white !important;
+        }
+        
+        /* 복사 버튼 */
+        .copy-btn {
+            background: #2563eb;
+            color: white;
+            border: none;
+            padding: 6px 15px;
+            border-radius: 4px;
+            cursor: pointer;
+            font-size: 13px;
+            margin: 10px 15px;
+        }
+        
+        .copy-btn:hover {
+            background: #1d4ed8;
+        }
+        
+        /* 수정 표시 */
+        .status-original {
+            color: #6b7280;
+        }
+        
+        .status-fixed {
+            color: #10b981;
+            font-weight: 600;
+        }
+    </style>'''
+
+# Shared viewer helpers: zoom, copy and white math rendering
+VIEWER_SCRIPT = '''    
+    <script>
+        // 줌 레벨 저장
+        const zoomLevels = {};
+        const imageZoomLevels = {};
+        
+        function zoomIn(id) {
+            const current = zoomLevels[id] || 100;
+            const newZoom = Math.min(current + 10, 300);
+            zoomLevels[id] = newZoom;
+            applyZoom(id, newZoom);
+        }
+        
+        function zoomOut(id) {
+            const current = zoomLevels[id] || 100;
+            const newZoom = Math.max(current - 10, 50);
+            zoomLevels[id] = newZoom;
+            applyZoom(id, newZoom);
+        }
+        
+        function applyZoom(id, zoom) {
+            const element = document.querySelector(`#render-${id} mjx-container`);
+            if (element) {
+                element.style.transform = `scale(${zoom / 100})`;
+                element.style.transformOrigin = 'center';
+            }
+            document.getElementById(`zoom-level-${id}`).textContent = zoom + '%';
+        }
+        
+        // 이미지 줌 함수
+        function zoomInImage(id) {
+            const current = imageZoomLevels[id] || 100;
+            const newZoom = Math.min(current + 10, 300);
+            imageZoomLevels[id] = newZoom;
+            applyImageZoom(id, newZoom);
+        }
+        
+        function zoomOutImage(id) {
+            const current = imageZoomLevels[id] || 100;
+            const newZoom = Math.max(current - 10, 50);
+            imageZoomLevels[id] = newZoom;
+            applyImageZoom(id, newZoom);
+        }
+        
+        function applyImageZoom(id, zoom) {
+            const element = document.getElementById(`img-${id}`);
+            if (element) {
+                element.style.transform = `scale(${zoom / 100})`;
+            }
+            document.getElementById(`image-zoom-level-${id}`).textContent = zoom + '%';
+        }
+        
+        function copyLatex(elementId) {
+            const element = document.getElementById(elementId);
+            const text = element.textContent;
+            
+            navigator.clipboard.writeText(text).then(() => {
+                const button = element.nextElementSibling;
+                const originalText = button.textContent;
+                button.textContent = '✓ Copied';
+                setTimeout(() => {
+                    button.textContent = originalText;
+                }, 2000);
+            }).catch(err => {
+                console.error('Copy failed:', err);
+                // Fallback method
+                const textArea = document.createElement("textarea");
+                textArea.value = text;
+                textArea.style.position = "fixed";
+                textArea.style.top = "-999999px";
+                document.body.appendChild(textArea);
+                textArea.focus();
+                textArea.select();
+                try {
+                    document.execCommand('copy');
+                    const button = element.nextElementSibling;
+                    const originalText = button.textContent;
+                    button.textContent = '✓ Copied';
+                    setTimeout(() => {
+                        button.textContent = originalText;
+                    }, 2000);
+                } catch (err) {
+                    console.error('Fallback copy failed:', err);
+                    alert('Copy failed. Please select and copy manually.');
+                }
+                document.body.removeChild(textArea);
+            });
+        }
+        
+        // Force white color for math
+        function forceMathWhite() {
+            document.querySelectorAll('.rendered-math mjx-container svg').forEach(svg => {
+                svg.style.fill = 'white';
+                svg.querySelectorAll('*').forEach(element => {
+                    element.style.fill = 'white';
+                    if (element.style.stroke && element.style.stroke !== 'none') {
+                        element.style.stroke = 'white';
+                    }
+                });
+            });
+        }
+        
+        // Apply white color after MathJax renders
+        if (window.MathJax && window.MathJax.startup && window.MathJax.startup.promise) {
+            window.MathJax.startup.promise.then(() => {
+                forceMathWhite();
+            });
+        }
+        
+        // Also apply on load
+        window.addEventListener('load', () => {
+            setTimeout(forceMathWhite, 1000);
+        });
+        
+        // Ctrl + 마우스 휠 줌
+        document.addEventListener('wheel', (e) => {
+            if (e.ctrlKey) {
+                e.preventDefault();
+                const mathElement = e.target.closest('.rendered-math');
+                if (mathElement) {
+                    const id = mathElement.id.replace('render-', '');
+                    if (e.deltaY < 0) {
+                        zoomIn(id);
+                    } else {
+                        zoomOut(id);
+                    }
+                }
+            }
+        });
+    </script>
+'''
+
+MATHJAX_PACKAGE_DIR = Path(__file__).resolve().parent / "mathjax" / "node_modules" / "mathjax"
+
+# Separately loadable components the node renderer needs. The bundled tree
+# ships only the combined browser files, and the combined tex-svg.js cannot
+# run under node without the speech-rule-engine's xmldom-sre module, so
+# pre-rendering needs the full package (npm install in mathjax/).
+MATHJAX_SVG_FILES = ("es5/node-main.js", "es5/input/tex.js", "es5/output/svg.js")
+
+
+def mathjax_svg_available():
+    """True when the local MathJax package has everything the SVG pre-render loads"""
+    return all((MATHJAX_PACKAGE_DIR / name).exists() for name in MATHJAX_SVG_FILES)
+
+# node-side renderer: reads a JSON list of LaTeX on stdin and writes
+# {"css": ..., "svgs": [...]} (null for formulas MathJax rejected)
+MATHJAX_SVG_SCRIPT = """
+const latex = JSON.parse(require('fs').readFileSync(0, 'utf8'));
+require(process.env.MATHJAX_PACKAGE).init({
+    loader: {load: ['input/tex', 'output/svg']},
+    svg: {fontCache: 'local'}
+}).then(MathJax => {
+    if (!MathJax) {
+        throw new Error('MathJax input/tex or output/svg component could not be loaded');
+    }
+    const adaptor = MathJax.startup.adaptor;
+    const svgs = latex.map(tex => {
+        try {
+            return adaptor.outerHTML(MathJax.tex2svg(tex, {display: true}));
+        } catch (e) {
+            return null;
+        }
+    });
+    const css = adaptor.textContent(MathJax.svgStylesheet());
+    process.stdout.write(JSON.stringify({css: css, svgs: svgs}));
+}).catch(err => {
+    console.error(err.message);
+    process.exit(1);
+});
+"""
+
+
+def svg_cache_key(latex):
+    """Cache file stem for one display-mode formula"""
+    return hashlib.sha1(latex.encode('utf-8')).hexdigest()
+
+
+def prerender_svgs(latex_list, cache_dir, timeout=600):
+    """Typeset LaTeX to SVG once with a local headless MathJax (node)
+    
+    Results are cached as cache_dir/<sha1 of LaTeX>.svg, so node only runs
+    for formulas not seen before. Returns (svgs, css): svgs maps LaTeX to
+    <mjx-container> markup; formulas missing from it (no node, MathJax
+    error) are left to client-side MathJax.
+    """
+    
+    cache_dir = Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    css_path = cache_dir / "mathjax_svg.css"
+    
+    svgs = {}
+    missing = []
+    for latex in dict.fromkeys(latex_list):
+        svg_path = cache_dir / f"{svg_cache_key(latex)}.svg"
+        if svg_path.exists():
+            svgs[latex] = svg_path.read_text(encoding='utf-8')
+        else:
+            missing.append(latex)
+    
+    node = shutil.which('node')
+    if not missing and css_path.exists():
+        pass
+    elif node is None:
+        print("[Info] node not found, formulas will be typeset in the browser")
+    elif not mathjax_svg_available():
+        print("[Info] local MathJax lacks es5/input/tex.js / es5/output/svg.js "
+              "(run 'npm install' in mathjax/), formulas will be typeset in the browser")
+    else:
+        try:
+            result = subprocess.run(
+                [node, '-e', MATHJAX_SVG_SCRIPT],
+                input=json.dumps(missing),
+                capture_output=True,
+                text=True,
+                encoding='utf-8',
+                timeout=timeout,
+                env=dict(os.environ, MATHJAX_PACKAGE=str(MATHJAX_PACKAGE_DIR))
+            )
+            if result.returncode == 0:
+                rendered = json.loads(result.stdout)
+                css_path.write_text(rendered['css'], encoding='utf-8')
+                for latex, svg in zip(missing, rendered['svgs']):
+                    if svg:
+                        (cache_dir / f"{svg_cache_key(latex)}.svg").write_text(svg, encoding='utf-8')
+                        svgs[latex] = svg
+                print(f"[Info] Pre-rendered {len(missing)} formulas to SVG")
+            else:
+                print(f"[Warning] MathJax SVG pre-render failed: {result.stderr.strip()}")
+        except (OSError, subprocess.TimeoutExpired, ValueError) as e:
+            print(f"[Warning] MathJax SVG pre-render failed: {e}")
+    
+    css = css_path.read_text(encoding='utf-8') if css_path.exists() else ''
+    return svgs, css
+
+
+def mathjax_head(scale, typeset=True):
+    """MathJax config + loader for the viewer <head>
+    
+    typeset=False skips the page-wide pass (formulas typeset on demand);
+    the page's window.onMathJaxReady, if any, runs once MathJax is ready.
+    """
+    
+    startup = '' if typeset else ''',
+            startup: {
+                typeset: false,
+                pageReady: () => MathJax.startup.defaultPageReady().then(() => {
+                    if (window.onMathJaxReady) window.onMathJaxReady();
+                })
+            }'''
+    return f'''<!-- MathJax -->
+    <script>
+        window.MathJax = {{
+            tex: {{
+                inlineMath: [['$', '$'], ['\\\\(', '\\\\)']],
+                displayMath: [['$$', '$$'], ['\\\\[', '\\\\]']],
+                processEscapes: true
+            }},
+            svg: {{
+                fontCache: 'global',
+                scale: {scale * 0.8}
+            }}{startup}
+        }};
+    </script>
+    <script id="MathJax-script" async src="../mathjax/node_modules/mathjax/es5/tex-svg.js"></script>'''
+
+
+def prerendered_head(css, scale):
+    """<style> for pre-rendered SVG formulas (MathJax's own stylesheet)"""
+    
+    return f'''<style>
+{css}
+        .rendered-math > mjx-container {{
+            font-size: {scale * 0.8 * 100:.0f}%;
+        }}
+    </style>'''
+
+# Lazy page loader for the virtual viewer: page shards are plain <script>
+# files (fetch() of local JSON is blocked under file://), cards are built
+# only near the viewport and typeset per page with MathJax.typesetPromise
+VIRTUAL_VIEWER_SCRIPT = """
+    <script>
+        const SmartNougatViewer = (() => {
+            const loaded = {};
+            const requested = {};
+            
+            function escapeHtml(text) {
+                const div = document.createElement('div');
+                div.textContent = text;
+                return div.innerHTML;
+            }
+            
+            function buildCard(f) {
+                const card = document.createElement('div');
+                card.className = 'formula-card';
+                const categoryClass = f.category_id === 13 ? 'category-inline' : 'category-block';
+                const categoryName = f.category_id === 13 ? 'Inline' : 'Block';
+                const statusClass = f.was_fixed ? 'status-fixed' : 'status-original';
+                const statusText = f.was_fixed ? '🔧 Fixed' : '✓ Original';
+                let html = `
+        <div class="card-header">
+            <div>
+                <span class="formula-number">#${f.det_num}</span>
+                Page ${f.page_index + 1} |
+                <span class="${categoryClass}">${categoryName} Formula</span>
+            </div>
+            <span class="${statusClass}">${statusText}</span>
+        </div>`;
+                if (f.has_image) {
+                    html += `
+        <div class="formula-image" id="image-${f.index}">
+            <div class="zoom-controls">
+                <button class="zoom-btn" onclick="zoomOutImage(${f.index})">−</button>
+                <span class="zoom-level" id="image-zoom-level-${f.index}">100%</span>
+                <button class="zoom-btn" onclick="zoomInImage(${f.index})">+</button>
+            </div>
+            <img src="images/${escapeHtml(f.filename)}" loading="lazy" decoding="async" alt="${escapeHtml(f.filename)}" id="img-${f.index}">
+        </div>`;
+                }
+                html += `
+        <div class="latex-box">
+            <h4>원본 LaTeX / Original LaTeX</h4>
+            <div class="latex-code" id="original-${f.index}">${escapeHtml(f.original_latex)}</div>
+            <button class="copy-btn" onclick="copyLatex('original-${f.index}')">Copy LaTeX</button>
+        </div>`;
+                if (f.was_fixed) {
+                    html += `
+        <div class="latex-box">
+            <h4>수정된 LaTeX / Fixed LaTeX</h4>
+            <div class="latex-code" id="fixed-${f.index}">${escapeHtml(f.fixed_latex)}</div>
+            <button class="copy-btn" onclick="copyLatex('fixed-${f.index}')">Copy LaTeX</button>
+        </div>`;
+                }
+                if (f.omml) {
+                    html += `
+        <div class="latex-box">
+            <h4>OMML (Word)</h4>
+            <div class="latex-code" id="omml-${f.index}">${escapeHtml(f.omml)}</div>
+            <button class="copy-btn" onclick="copyLatex('omml-${f.index}')">Copy OMML</button>
+        </div>`;
+                }
+                html += `
+        <div class="rendered-math" id="render-${f.index}">
+            <h4>렌더링 결과 / Rendered Result</h4>
+            <div class="zoom-controls">
+                <button class="zoom-btn" onclick="zoomOut(${f.index})">−</button>
+                <span class="zoom-level" id="zoom-level-${f.index}">100%</span>
+                <button class="zoom-btn" onclick="zoomIn(${f.index})">+</button>
+            </div>
+            ${f.svg || '$$' + escapeHtml(f.fixed_latex) + '$$'}
+        </div>`;
+                card.innerHTML = html;
+                return card;
+            }
+            
+            function render(section) {
+                if (section.dataset.rendered === '1') return;
+                const formulas = loaded[section.dataset.page];
+                const cards = section.querySelector('.cards');
+                const fragment = document.createDocumentFragment();
+                formulas.forEach(f => fragment.appendChild(buildCard(f)));
+                cards.appendChild(fragment);
+                section.dataset.rendered = '1';
+                section.style.minHeight = '';
+                section.style.height = '';
+                typeset(cards);
+            }
+            
+            // MathJax loads async: sections rendered before it is ready are
+            // queued and typeset from startup.pageReady (onMathJaxReady)
+            const pending = new Set();
+            let mathjaxReady = false;
+            
+            function typeset(cards) {
+                if (!mathjaxReady) {
+                    pending.add(cards);
+                    return;
+                }
+                window.MathJax.typesetPromise([cards]).then(forceMathWhite);
+            }
+            
+            window.onMathJaxReady = () => {
+                mathjaxReady = true;
+                pending.forEach(cards => {
+                    if (cards.childElementCount) typeset(cards);
+                });
+                pending.clear();
+            };
+            
+            // Drop far-away cards but keep their height so the scrollbar stays stable
+            function release(section) {
+                if (section.dataset.rendered !== '1') return;
+                const cards = section.querySelector('.cards');
+                section.style.height = section.offsetHeight + 'px';
+                if (window.MathJax && window.MathJax.typesetClear) {
+                    window.MathJax.typesetClear([cards]);
+                }
+                cards.innerHTML = '';
+                section.dataset.rendered = '0';
+            }
+            
+            function request(section) {
+                const page = section.dataset.page;
+                if (loaded[page]) {
+                    render(section);
+                } else if (!requested[page]) {
+                    requested[page] = true;
+                    const script = document.createElement('script');
+                    script.src = section.dataset.src;
+                    document.head.appendChild(script);
+                }
+            }
+            
+            function addPage(page, formulas) {
+                loaded[page] = formulas;
+                const section = document.querySelector(`section[data-page="${page}"]`);
+                if (section && section.dataset.visible === '1') render(section);
+            }
+            
+            const observer = new IntersectionObserver(entries => {
+                entries.forEach(entry => {
+                    const section = entry.target;
+                    if (entry.isIntersecting) {
+                        section.dataset.visible = '1';
+                        request(section);
+                    } else {
+                        section.dataset.visible = '0';
+                        release(section);
+                    }
+                });
+            }, { rootMargin: '1500px 0px' });
+            
+            document.querySelectorAll('section.page-shard').forEach(section => observer.observe(section));
+            
+            return { addPage };
+        })();
+    </script>
+"""
+
+class FormulaSource:
+    """Original/fixed LaTeX pairs of one output directory, read page by page"""
+
+    def __init__(self, output_dir):
+        self.output_dir = Path(output_dir)
+        self.images_dir = self.output_dir / "images"
+        txt_dir = self.output_dir / "txt"
+        self.model_json_path = txt_dir / "model.json"
+        self.model_npz_path = txt_dir / "model.npz"
+        self.fixed_json_path = txt_dir / "model_fixed.json"
+        self._original_data = None
+        self._fixed_data = None
+
+    @classmethod
+    def open(cls, output_dir):
+        """FormulaSource, or None if model.json is missing
+
+        Without model_fixed.json (before fix_latex has run) the fixed LaTeX
+        is the original.
+        """
+        source = cls(output_dir)
+        if not source.model_json_path.exists():
+            print(f"Error: {source.model_json_path} not found")
+            return None
+        return source
+
+    def _original_pages(self):
+        # model.npz가 있으면 JSON 파싱 대신 컬럼형 결과를 페이지 단위로 읽음
+        if self.model_npz_path.exists():
+            reader = ResultsReader(self.model_npz_path)
+            try:
+                yield from reader
+            finally:
+                reader.close()
+            return
+        if self._original_data is None:
+            with open(self.model_json_path, 'r', encoding='utf-8') as f:
+                self._original_data = json.load(f)
+        yield from self._original_data
+
+    def _fixed_pages(self):
+        if not self.fixed_json_path.exists():
+            return None
+        if self._fixed_data is None:
+            with open(self.fixed_json_path, 'r', encoding='utf-8') as f:
+                self._fixed_data = json.load(f)
+        return self._fixed_data
+
+    def pages(self):
+        """Yield (page_index, results) in document order
+
+        page_index is the model.json page_idx, which is also the page
+        number in the formula image file names.
+        """
+        formula_index = 0
+        fixed_pages = self._fixed_pages()
+        for position, orig_page in enumerate(self._original_pages()):
+            if fixed_pages is None:
+                fixed_page = orig_page
+            elif position < len(fixed_pages):
+                fixed_page = fixed_pages[position]
+            else:
+                break
+            page_index = orig_page.get('page_idx', position)
+            results = []
+            for det_idx, (orig_det, fixed_det) in enumerate(
+                zip(orig_page.get('layout_dets', []), fixed_page.get('layout_dets', []))
+            ):
+                if 'latex' not in orig_det:
+                    continue
+
+                orig_latex = orig_det.get('latex', '')
+                fixed_latex = fixed_det.get('latex', '')
+                results.append({
+                    'index': formula_index,
+                    'page_index': page_index,
+                    'original_latex': orig_latex,
+                    'fixed_latex': fixed_latex,
+                    'was_fixed': orig_latex != fixed_latex,
+                    'fixes': fixed_det.get('latex_fixes') or [],
+                    'category_id': orig_det.get('category_id', ''),
+                    'filename': f"formula_page{page_index}_{det_idx:03d}.png",
+                    # DOCX OMML results are converted without rendering, so no crop image
+                    'has_image': not orig_det.get('no_image', False)
+                })
+                formula_index += 1
+            yield page_index, results
+
+    def image_data_uri(self, filename):
+        """base64 data URI of images/<filename>, or '' if it does not exist"""
+        img_path = self.images_dir / filename
+        if not img_path.exists():
+            return ''
+        with open(img_path, 'rb') as f:
+            return f"data:image/png;base64,{base64.b64encode(f.read()).decode('utf-8')}"
+
+
+class ViewerTemplate:
+    """Base viewer template: head, one card per formula, tail"""
+
+    filename = "result_viewer_fixed.html"
+    message = "HTML viewer created"
+    show_omml = False
+
+    def __init__(self, source, scale=1.5, embed_images=True, svgs=None, svg_css='', omml=True):
+        self.source = source
+        self.output_dir = source.output_dir
+        self.scale = scale
+        self.embed_images = embed_images
+        self.svgs = svgs or {}
+        self.svg_css = svg_css
+        # OMML for Word; conversions are memoized per LaTeX string
+        self.omml = omml and self.show_omml
+        self.omml_converter = LaTeXToOMML() if self.omml else None
+
+    def head(self, stats):
+        raise NotImplementedError
+
+    def card(self, result):
+        raise NotImplementedError
+
+    def tail(self):
+        return ''
+
+    def write_page(self, out, page_index, results):
+        for result in results:
+            out.write(self.card(result))
+
+    def image_src(self, result):
+        """Data URI, or a relative images/ link when images are not embedded ('' without an image)"""
+        if not result.get('has_image', True):
+            return ''
+        if self.embed_images:
+            return self.source.image_data_uri(result['filename'])
+        return f"images/{result['filename']}"
+
+    def img_attrs(self, result):
+        if self.embed_images:
+            return f'src="{self.image_src(result)}"'
+        # Relative link, loaded by the browser only when scrolled into view
+        return f'src="{self.image_src(result)}" loading="lazy" decoding="async"'
+
+    def rendered(self, latex):
+        """Pre-rendered SVG if available, else TeX for client-side MathJax"""
+        return self.svgs.get(latex) or f"$${latex}$$"
+
+    def mathjax_block(self, stats, typeset=True):
+        """MathJax <head> block, reduced to the SVG styles when nothing is left to typeset"""
+        block = prerendered_head(self.svg_css, self.scale) if self.svgs else ''
+        if stats['needs_mathjax']:
+            block += ('\n    ' if block else '') + mathjax_head(self.scale, typeset=typeset)
+        return block
+
+
+class VerticalTemplate(ViewerTemplate):
+    """이미지 → 원본 LaTeX → 검증된 LaTeX → 렌더링 순서로 세로 배치"""
+
+    filename = "result_viewer_0714.html"
+    message = "HTML viewer with OMML created"
+    title = "SmartNougat LaTeX Results with OMML"
+    copy_label = "Copy LaTeX"
+    show_omml = True
+
+    def head(self, stats):
+        return f'''<!DOCTYPE html>
+<html lang="ko">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{self.title}</title>
+    
+    {self.mathjax_block(stats)}
+    
+    {VIEWER_CSS}
+</head>
+<body>
+    <h1>SmartNougat LaTeX Processing Results</h1>
+    
+    <div class="stats">
+        <h2>Processing Summary</h2>
+        <p>Total Formulas: <strong>{stats['total']}</strong></p>
+        <p>Fixed: <strong class="fixed">{stats['fixed']}</strong></p>
+        <p>Fix Rate: <strong>{stats['fix_rate']:.1f}%</strong></p>
+    </div>
+'''
+
+    def card(self, result):
+        img_attrs = self.img_attrs(result)
+        
+        # Extract det_idx from filename for display
+        det_num = int(result['filename'].split('_')[-1].replace('.png', ''))
+        
+        # Determine category
+        category = result.get('category_id', '')
+        category_class = 'category-inline' if category == 13 else 'category-block'
+        category_name = 'Inline' if category == 13 else 'Block'
+        
+        # Status
+        status_text = '🔧 Fixed' if result['was_fixed'] else '✓ Original'
+        status_class = 'status-fixed' if result['was_fixed'] else 'status-original'
+        
+        card = f'''
+    <div class="formula-card">
+        <!-- Header -->
+        <div class="card-header">
+            <div>
+                <span class="formula-number">#{det_num}</span> 
+                Page {result['page_index'] + 1} | 
+                <span class="{category_class}">{category_name} Formula</span>
+            </div>
+            <span class="{status_class}">{status_text}</span>
+        </div>'''
+        
+        if result.get('has_image', True):
+            card += f'''
+        
+        <!-- 1. 이미지 -->
+        <div class="formula-image" id="image-{result['index']}">
+            <div class="zoom-controls">
+                <button class="zoom-btn" onclick="zoomOutImage({result['index']})">−</button>
+                <span class="zoom-level" id="image-zoom-level-{result['index']}">100%</span>
+                <button class="zoom-btn" onclick="zoomInImage({result['index']})">+</button>
+            </div>
+            <img {img_attrs} alt="{result['filename']}" id="img-{result['index']}">
+        </div>'''
+        
+        card += f'''
+        
+        <!-- 2. 원본 LaTeX -->
+        <div class="latex-box">
+            <h4>원본 LaTeX / Original LaTeX</h4>
+            <div class="latex-code" id="original-{result['index']}">{html.escape(result['original_latex'])}</div>
+            <button class="copy-btn" onclick="copyLatex('original-{result['index']}')">{self.copy_label}</button>
+        </div>'''
+        
+        # 원본과 수정이 다른 경우에만 수정된 LaTeX 표시
+        if result['was_fixed']:
+            card += f'''
+        
+        <!-- 3. 수정된 LaTeX -->
+        <div class="latex-box">
+            <h4>수정된 LaTeX / Fixed LaTeX</h4>
+            <div class="latex-code" id="fixed-{result['index']}">{html.escape(result['fixed_latex'])}</div>
+            <button class="copy-btn" onclick="copyLatex('fixed-{result['index']}')">{self.copy_label}</button>
+        </div>'''
+        
+        if self.omml:
+            card += f'''
+        
+        <!-- 4. OMML (Word) -->
+        <div class="latex-box">
+            <h4>OMML (Word)</h4>
+            <div class="latex-code" id="omml-{result['index']}">{html.escape(self.omml_converter.convert(result['fixed_latex']))}</div>
+            <button class="copy-btn" onclick="copyLatex('omml-{result['index']}')">Copy OMML</button>
+        </div>'''
+        
+        card += f'''
+        
+        <!-- 5. 렌더링 결과 -->
+        <div class="rendered-math" id="render-{result['index']}">
+            <h4>렌더링 결과 / Rendered Result</h4>
+            <div class="zoom-controls">
+                <button class="zoom-btn" onclick="zoomOut({result['index']})">−</button>
+                <span class="zoom-level" id="zoom-level-{result['index']}">100%</span>
+                <button class="zoom-btn" onclick="zoomIn({result['index']})">+</button>
+            </div>
+            {self.rendered(result['fixed_latex'])}
+        </div>
+    </div>
+'''
+        return card
+
+    def tail(self):
+        return VIEWER_SCRIPT + '''</body>
+</html>'''
+
+
+class SimpleTemplate(VerticalTemplate):
+    """Vertical cards written as result_viewer_fixed.html"""
+
+    filename = "result_viewer_fixed.html"
+    message = "HTML viewer created"
+    title = "SmartNougat LaTeX Results"
+    copy_label = "Copy"
+    show_omml = False
+
+
+class ResultTemplate(SimpleTemplate):
+    """Vertical cards the processor writes as result_viewer.html (before fix_latex)"""
+
+    filename = "result_viewer.html"
+    title = "SmartNougat Results"
+
+
+class PanelTemplate(ViewerTemplate):
+    """Original/fixed LaTeX panels above the rendering"""
+
+    message = "Fixed HTML viewer created"
+
+    def __init__(self, source, mathjax_src=CDN_MATHJAX, **kwargs):
+        super().__init__(source, **kwargs)
+        self.mathjax_src = mathjax_src
+
+    def head(self, stats):
+        scale = self.scale
+        mathjax_src = self.mathjax_src
+        total_formulas, fixed_count = stats['total'], stats['fixed']
+        return f'''<!DOCTYPE html>
+<html lang="ko">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>SmartNougat Fixed LaTeX Results</title>
+    
+    <!-- MathJax 3 -->
+    <script>
+        window.MathJax = {{
+            tex: {{
+                inlineMath: [['$', '$'], ['\\\\(', '\\\\)']],
+                displayMath: [['$$', '$$'], ['\\\\[', '\\\\]']],
+                processEscapes: true
+            }},
+            svg: {{
+                fontCache: 'global',
+                scale: {scale}
+            }},
+            options: {{
+                skipHtmlTags: ['script', 'noscript', 'style', 'textarea', 'pre', 'code'],
+                ignoreClass: 'latex-code'
+            }}
+        }};
+    </script>
+    <script id="MathJax-script" async src="{mathjax_src}"></script>
+    
+    <style>
+        body {{
+            font-family: -apple-system, Arial, sans-serif;
+            max-width: 1400px;
+            margin: 0 auto;
+            padding: 20px;
+            background: #f5f5f5;
+        }}
+        
+        h1 {{
+            text-align: center;
+            color: #333;
+        }}
+        
+        .stats {{
+            background: white;
+            padding: 20px;
+            border-radius: 8px;
+            margin-bottom: 20px;
+            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+        }}
+        
+        .formula-card {{
+            background: white;
+            margin: 20px 0;
+            padding: 20px;
+            border-radius: 8px;
+            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+        }}
+        
+        .card-header {{
+            display: flex;
+            justify-content: space-between;
+            margin-bottom: 15px;
+            font-size: 14px;
+            color: #666;
+        }}
+        
+        .formula-image {{
+            max-width: 100%;
+            max-height: 200px;
+            display: block;
+            margin: 10px auto;
+            border: 1px solid #ddd;
+            border-radius: 4px;
+        }}
+        
+        .latex-panel {{
+            margin: 20px 0;
+        }}
+        
+        .latex-box {{
+            background: #f8f8f8;
+            padding: 15px;
+            border-radius: 4px;
+            border: 2px solid #ddd;
+            margin-bottom: 10px;
+            position: relative;
+        }}
+        
+        .copy-btn {{
+            position: absolute;
+            bottom: 10px;
+            right: 10px;
+            padding: 6px 12px;
+            background: #007bff;
+            color: white;
+            border: none;
+            border-radius: 4px;
+            cursor: pointer;
+            font-size: 12px;
+            opacity: 0.8;
+        }}
+        
+        .copy-btn:hover {{
+            opacity: 1;
+            background: #0056b3;
+        }}
+        
+        .latex-box.original {{
+            border-color: #ff6b6b;
+        }}
+        
+        .latex-box.fixed {{
+            border-color: #51cf66;
+        }}
+        
+        .latex-box h4 {{
+            margin: 0 0 10px 0;
+            font-size: 14px;
+        }}
+        
+        .latex-box.original h4 {{
+            color: #ff6b6b;
+        }}
+        
+        .latex-box.fixed h4 {{
+            color: #51cf66;
+        }}
+        
+        .latex-code {{
+            background: #1e1e1e;
+            color: #d4d4d4;
+            padding: 10px;
+            border-radius: 4px;
+            font-family: monospace;
+            font-size: 12px;
+            overflow-x: auto;
+            white-space: pre-wrap;
+        }}
+        
+        .rendered-math {{
+            background: #2563eb;
+            padding: 20px;
+            border-radius: 4px;
+            margin-top: 10px;
+            overflow-x: auto;
+            overflow-y: auto;
+            max-width: 100%;
+            min-height: 60px;
+            max-height: 400px;
+            display: flex;
+            align-items: center;
+            justify-content: center;
+            position: relative;
+            border: 1px solid #1d4ed8;
+        }}
+        
+        .rendered-math .MathJax,
+        .rendered-math .MathJax_Display,
+        .rendered-math mjx-container,
+        .rendered-math mjx-container svg,
+        .rendered-math mjx-container svg g,
+        .rendered-math mjx-container svg path,
+        .rendered-math mjx-container svg text {{
+            color: white !important;
+            fill: white !important;
+            stroke: white !important;
+        }}
+        
+        .rendered-math mjx-container svg g[data-mml-node="math"] * {{
+            fill: white !important;
+            stroke: white !important;
+        }}
+        
+        .math-container {{
+            display: inline-block;
+            transition: transform 0.2s ease;
+            max-width: 100%;
+            overflow: hidden;
+        }}
+        
+        .zoom-controls {{
+            position: absolute;
+            top: 10px;
+            right: 10px;
+            display: flex;
+            gap: 5px;
+            background: rgba(255,255,255,0.9);
+            padding: 5px;
+            border-radius: 4px;
+            box-shadow: 0 1px 3px rgba(0,0,0,0.2);
+        }}
+        
+        .zoom-btn {{
+            width: 30px;
+            height: 30px;
+            border: 1px solid #ccc;
+            background: white;
+            cursor: pointer;
+            border-radius: 3px;
+            font-size: 16px;
+            display: flex;
+            align-items: center;
+            justify-content: center;
+        }}
+        
+        .zoom-btn:hover {{
+            background: #f0f0f0;
+        }}
+        
+        .zoom-level {{
+            padding: 0 8px;
+            font-size: 12px;
+            display: flex;
+            align-items: center;
+            min-width: 45px;
+            justify-content: center;
+        }}
+        
+        .success {{ color: #4caf50; }}
+        .failed {{ color: #f44336; }}
+        .fixed {{ color: #2196F3; }}
+        
+        .category-inline {{ color: #2196F3; }}
+        .category-block {{ color: #FF5722; }}
+    </style>
+</head>
+<body>
+    <h1>SmartNougat Fixed LaTeX Results</h1>
+    
+    <div class="stats">
+        <p><strong>Total Formulas:</strong> {total_formulas}</p>
+        <p><strong>Fixed:</strong> <span class="fixed">{fixed_count}</span></p>
+        <p><strong>Unchanged:</strong> {total_formulas - fixed_count}</p>
+        <p><strong>Processing Date:</strong> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
+    </div>
+'''
+
+    def card(self, result):
+        # Determine category
+        category = result.get('category_id', '')
+        category_class = 'category-inline' if category == 13 else 'category-block'
+        category_name = 'Inline' if category == 13 else 'Block'
+
+        # Extract det_idx from filename for display
+        # filename format: formula_page0_003.png -> 003
+        det_num = int(result['filename'].split('_')[-1].replace('.png', ''))
+
+        card = f'''
+    <div class="formula-card">
+        <div class="card-header">
+            <span><strong>#{det_num}</strong> Page {result['page_index'] + 1} | <span class="{category_class}">{category_name} Formula</span></span>
+            <span>{('🔧 Fixed' if result['was_fixed'] else '✓ Original')}</span>
+        </div>
+        '''
+        
+        if self.image_src(result):
+            card += f'''
+        <img {self.img_attrs(result)} class="formula-image" alt="{result['filename']}">
+        '''
+        
+        # LaTeX panel
+        card += '''
+        <div class="latex-panel">'''
+        
+        # Original LaTeX box (코드만)
+        card += f'''
+            <div class="latex-box original">
+                <h4>원본 LaTeX / Original LaTeX</h4>
+                <div class="latex-code" id="original-{result['index']}">{html.escape(result['original_latex'])}</div>
+                <button class="copy-btn" onclick="copyLatexText('original-{result['index']}')">복사</button>
+            </div>'''
+        
+        # Fixed LaTeX box (코드만)
+        fixed_label = "수정된 LaTeX / Fixed LaTeX" if result['was_fixed'] else "동일 / Same"
+        card += f'''
+            <div class="latex-box fixed">
+                <h4>{fixed_label}</h4>
+                <div class="latex-code" id="fixed-{result['index']}">{html.escape(result['fixed_latex'])}</div>
+                <button class="copy-btn" onclick="copyLatexText('fixed-{result['index']}')">복사</button>
+            </div>'''
+        
+        card += '''
+        </div>
+        
+        <!-- 수정된 버전 렌더링 -->
+        <div class="rendered-math" id="render-''' + str(result['index']) + '''">
+            <h4 style="position: absolute; top: 10px; left: 15px; margin: 0; font-size: 14px; color: #bfdbfe;">렌더링 결과:</h4>
+            <div class="zoom-controls">
+                <button class="zoom-btn" onclick="zoomOut(''' + str(result['index']) + ''')">−</button>
+                <span class="zoom-level" id="zoom-level-''' + str(result['index']) + '''">100%</span>
+                <button class="zoom-btn" onclick="zoomIn(''' + str(result['index']) + ''')">+</button>
+                <button class="zoom-btn" onclick="resetZoom(''' + str(result['index']) + ''')" title="Reset">⟲</button>
+            </div>
+            <div class="math-container" id="math-container-''' + str(result['index']) + '''">'''
+        
+        card += f'''
+                {self.rendered(result['fixed_latex'])}
+            </div>
+        </div>
+    </div>
+'''
+        return card
+
+    def tail(self):
+        return '''
+    
+    <script>
+        const zoomLevels = {};
+        
+        function zoomIn(id) {
+            const current = zoomLevels[id] || 100;
+            const newZoom = Math.min(current + 10, 300);
+            zoomLevels[id] = newZoom;
+            applyZoom(id, newZoom);
+        }
+        
+        function zoomOut(id) {
+            const current = zoomLevels[id] || 100;
+            const newZoom = Math.max(current - 10, 50);
+            zoomLevels[id] = newZoom;
+            applyZoom(id, newZoom);
+        }
+        
+        function resetZoom(id) {
+            zoomLevels[id] = 100;
+            applyZoom(id, 100);
+        }
+        
+        function applyZoom(id, zoom) {
+            const container = document.getElementById(`math-container-${id}`);
+            const zoomDisplay = document.getElementById(`zoom-level-${id}`);
+            
+            if (container) {
+                container.style.transform = `scale(${zoom / 100})`;
+                zoomDisplay.textContent = `${zoom}%`;
+            }
+        }
+        
+        // Copy LaTeX text to clipboard
+        function copyLatexText(elementId) {
+            const element = document.getElementById(elementId);
+            const text = element.textContent || element.innerText;
+            const btn = event.target;
+            
+            if (navigator.clipboard) {
+                navigator.clipboard.writeText(text).then(function() {
+                    showCopySuccess(btn);
+                }).catch(function(err) {
+                    fallbackCopyTextToClipboard(text, btn);
+                });
+            } else {
+                fallbackCopyTextToClipboard(text, btn);
+            }
+        }
+        
+        // Fallback copy method for older browsers
+        function fallbackCopyTextToClipboard(text, btn) {
+            const textArea = document.createElement("textarea");
+            textArea.value = text;
+            textArea.style.top = "0";
+            textArea.style.left = "0";
+            textArea.style.position = "fixed";
+            
+            document.body.appendChild(textArea);
+            textArea.focus();
+            textArea.select();
+            
+            try {
+                const successful = document.execCommand('copy');
+                if (successful) {
+                    showCopySuccess(btn);
+                } else {
+                    alert('복사 실패');
+                }
+            } catch (err) {
+                alert('복사 실패: ' + err);
+            }
+            
+            document.body.removeChild(textArea);
+        }
+        
+        // Show copy success feedback
+        function showCopySuccess(btn) {
+            const originalText = btn.textContent;
+            btn.textContent = '복사완료!';
+            btn.style.background = '#28a745';
+            
+            setTimeout(() => {
+                btn.textContent = originalText;
+                btn.style.background = '#007bff';
+            }, 1500);
+        }
+        
+        // Auto-fit math content to container width
+        function autoFitMath() {
+            document.querySelectorAll('.math-container').forEach((container, index) => {
+                const parent = container.closest('.rendered-math');
+                if (parent && container.scrollWidth > parent.clientWidth) {
+                    const scale = Math.min(1, (parent.clientWidth - 40) / container.scrollWidth);
+                    const id = index;
+                    zoomLevels[id] = Math.round(scale * 100);
+                    container.style.transform = `scale(${scale})`;
+                    
+                    const zoomDisplay = parent.querySelector('.zoom-level');
+                    if (zoomDisplay) {
+                        zoomDisplay.textContent = `${Math.round(scale * 100)}%`;
+                    }
+                }
+            });
+        }
+        
+        // Force white color for MathJax elements
+        function forceMathWhite() {
+            document.querySelectorAll('.rendered-math mjx-container svg').forEach(svg => {
+                svg.style.fill = 'white';
+                svg.style.color = 'white';
+                svg.querySelectorAll('*').forEach(element => {
+                    element.style.fill = 'white';
+                    element.style.stroke = 'white';
+                    element.style.color = 'white';
+                });
+            });
+        }
+        
+        // Auto-fit on load
+        window.addEventListener('load', () => {
+            setTimeout(() => {
+                autoFitMath();
+                forceMathWhite();
+            }, 1000); // Wait for MathJax to render
+        });
+        
+        // Re-fit on window resize
+        window.addEventListener('resize', autoFitMath);
+        
+        // Ctrl + wheel zoom
+        document.addEventListener('wheel', (e) => {
+            if (e.ctrlKey) {
+                e.preventDefault();
+                const mathElement = e.target.closest('.rendered-math');
+                if (mathElement) {
+                    const id = mathElement.id.replace('render-', '');
+                    if (e.deltaY < 0) {
+                        zoomIn(id);
+                    } else {
+                        zoomOut(id);
+                    }
+                }
+            }
+        });
+    </script>
+</body>
+</html>
+'''
+
+
+class GridTemplate(ViewerTemplate):
+    """Two-column cards; the page itself searches for a local MathJax"""
+
+    message = "Fixed HTML viewer created"
+
+    def head(self, stats):
+        scale = self.scale
+        total_formulas, fixed_count = stats['total'], stats['fixed']
+        return f'''<!DOCTYPE html>
+<html lang="ko">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>SmartNougat Fixed LaTeX Results</title>
+    
+    <!-- MathJax Auto-Detection Script -->
+    <script>
+        // MathJax 자동 감지 및 로드
+        (function() {{
+            // 가능한 MathJax 경로들 (우선순위 순서)
+            var mathjaxPaths = [
+                // 1. 같은 폴더
+                './mathjax/package/es5/tex-svg.js',
+                '../mathjax/package/es5/tex-svg.js',
+                '../../mathjax/package/es5/tex-svg.js',
+                '../../../mathjax/package/es5/tex-svg.js',
+                
+                // 2. node_modules 경로
+                './node_modules/mathjax/es5/tex-svg.js',
+                '../node_modules/mathjax/es5/tex-svg.js',
+                '../../node_modules/mathjax/es5/tex-svg.js',
+                
+                // 3. 전역 설치 경로 (Windows)
+                'C:/mathjax/package/es5/tex-svg.js',
+                'D:/mathjax/package/es5/tex-svg.js',
+                
+                // 4. CDN (최후의 수단)
+                'https://cdn.jsdelivr.net/npm/mathjax@3/es5/tex-svg.js'
+            ];
+            
+            // MathJax 설정
+            window.MathJax = {{
+                tex: {{
+                    inlineMath: [['$', '$'], ['\\\\(', '\\\\)']],
+                    displayMath: [['$$', '$$'], ['\\\\[', '\\\\]']],
+                    processEscapes: true
+                }},
+                svg: {{
+                    fontCache: 'global',
+                    scale: {scale}
+                }},
+                options: {{
+                    skipHtmlTags: ['script', 'noscript', 'style', 'textarea', 'pre', 'code'],
+                    ignoreClass: 'latex-code'
+                }}
+            }};
+            
+            // 순차적으로 경로 시도
+            function tryLoadMathJax(index) {{
+                if (index >= mathjaxPaths.length) {{
+                    console.error('MathJax를 찾을 수 없습니다!');
+                    document.getElementById('mathjax-status').innerHTML = 
+                        '<span style="color: red;">⚠️ MathJax 로드 실패 - 수식이 렌더링되지 않습니다</span>';
+                    return;
+                }}
+                
+                var path = mathjaxPaths[index];
+                var script = document.createElement('script');
+                script.src = path;
+                script.async = true;
+                
+                script.onload = function() {{
+                    console.log('MathJax 로드 성공:', path);
+                    var status = document.getElementById('mathjax-status');
+                    if (status) {{
+                        if (path.includes('cdn.jsdelivr.net')) {{
+                            status.innerHTML = '<span style="color: orange;">🌐 CDN MathJax 사용중 (인터넷 필요)</span>';
+                        }} else {{
+                            status.innerHTML = '<span style="color: green;">✅ 로컬 MathJax 사용중</span>';
+                        }}
+                    }}
+                }};
+                
+                script.onerror = function() {{
+                    console.log('시도 실패:', path);
+                    // 다음 경로 시도
+                    tryLoadMathJax(index + 1);
+                }};
+                
+                document.head.appendChild(script);
+            }}
+            
+            // 첫 번째 경로부터 시도
+            tryLoadMathJax(0);
+        }})();
+    </script>
+    
+    <style>
+        body {{
+            font-family: -apple-system, Arial, sans-serif;
+            max-width: 1400px;
+            margin: 0 auto;
+            padding: 20px;
+            background: #f5f5f5;
+        }}
+        
+        h1 {{
+            text-align: center;
+            color: #333;
+        }}
+        
+        .stats {{
+            background: white;
+            padding: 20px;
+            border-radius: 8px;
+            margin-bottom: 20px;
+            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+            text-align: center;
+        }}
+        
+        .stats h2 {{
+            margin-top: 0;
+            color: #2563eb;
+        }}
+        
+        .stat-grid {{
+            display: grid;
+            grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
+            gap: 20px;
+            margin-top: 15px;
+        }}
+        
+        .stat-item {{
+            padding: 15px;
+            background: #f3f4f6;
+            border-radius: 8px;
+        }}
+        
+        .stat-value {{
+            font-size: 2em;
+            font-weight: bold;
+            color: #2563eb;
+        }}
+        
+        .stat-label {{
+            color: #6b7280;
+            margin-top: 5px;
+        }}
+        
+        #mathjax-status {{
+            text-align: center;
+            padding: 10px;
+            background: #f9fafb;
+            border-radius: 5px;
+            margin-bottom: 20px;
+            font-size: 14px;
+        }}
+        
+        .formula-item {{
+            background: white;
+            margin-bottom: 30px;
+            border-radius: 8px;
+            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+            overflow: hidden;
+        }}
+        
+        .formula-header {{
+            background: #f3f4f6;
+            padding: 10px 20px;
+            border-bottom: 1px solid #e5e7eb;
+            display: flex;
+            justify-content: space-between;
+            align-items: center;
+        }}
+        
+        .formula-title {{
+            font-weight: bold;
+            color: #374151;
+        }}
+        
+        .fixed-badge {{
+            background: #10b981;
+            color: white;
+            padding: 3px 10px;
+            border-radius: 12px;
+            font-size: 12px;
+        }}
+        
+        .formula-content {{
+            padding: 20px;
+        }}
+        
+        .formula-grid {{
+            display: grid;
+            grid-template-columns: 1fr 1fr;
+            gap: 20px;
+            margin-bottom: 20px;
+        }}
+        
+        .formula-image {{
+            text-align: center;
+            padding: 10px;
+            background: #f9fafb;
+            border-radius: 4px;
+        }}
+        
+        .formula-image img {{
+            max-width: 100%;
+            height: auto;
+        }}
+        
+        .latex-panel {{
+            background: #f9fafb;
+            padding: 15px;
+            border-radius: 4px;
+        }}
+        
+        .latex-box {{
+            margin-bottom: 15px;
+        }}
+        
+        .latex-box h4 {{
+            margin: 0 0 10px 0;
+            color: #374151;
+            font-size: 14px;
+        }}
+        
+        .latex-code {{
+            background: white;
+            padding: 10px;
+            border: 1px solid #e5e7eb;
+            border-radius: 4px;
+            font-family: 'Consolas', 'Monaco', monospace;
+            font-size: 13px;
+            white-space: pre-wrap;
+            word-break: break-all;
+            margin-bottom: 10px;
+        }}
+        
+        .copy-btn {{
+            background: #2563eb;
+            color: white;
+            border: none;
+            padding: 5px 15px;
+            border-radius: 4px;
+            cursor: pointer;
+            font-size: 12px;
+        }}
+        
+        .copy-btn:hover {{
+            background: #1d4ed8;
+        }}
+        
+        .rendered-math {{
+            background: #2563eb;
+            padding: 30px;
+            border-radius: 4px;
+            text-align: center;
+            min-height: 100px;
+            display: flex;
+            align-items: center;
+            justify-content: center;
+            position: relative;
+            overflow: auto;
+        }}
+        
+        .rendered-math h4 {{
+            position: absolute;
+            top: 10px;
+            left: 15px;
+            margin: 0;
+            font-size: 14px;
+            color: #bfdbfe;
+        }}
+        
+        .rendered-math mjx-container {{
+            color: white !important;
+            fill: white !important;
+        }}
+        
+        .rendered-math svg {{
+            fill: white !important;
+            max-width: 100%;
+            height: auto;
+        }}
+        
+        .zoom-controls {{
+            position: absolute;
+            top: 10px;
+            right: 10px;
+            display: flex;
+            gap: 5px;
+            align-items: center;
+        }}
+        
+        .zoom-btn {{
+            background: rgba(255, 255, 255, 0.2);
+            border: 1px solid rgba(255, 255, 255, 0.3);
+            color: white;
+            width: 30px;
+            height: 30px;
+            border-radius: 4px;
+            cursor: pointer;
+            font-size: 18px;
+            display: flex;
+            align-items: center;
+            justify-content: center;
+        }}
+        
+        .zoom-btn:hover {{
+            background: rgba(255, 255, 255, 0.3);
+        }}
+        
+        .zoom-level {{
+            color: white;
+            font-size: 12px;
+            min-width: 40px;
+            text-align: center;
+        }}
+    </style>
+</head>
+<body>
+    <h1>SmartNougat LaTeX 수정 결과</h1>
+    
+    <div id="mathjax-status">
+        <span style="color: #6b7280;">🔍 MathJax 로드 중...</span>
+    </div>
+    
+    <div class="stats">
+        <h2>처리 통계</h2>
+        <div class="stat-grid">
+            <div class="stat-item">
+                <div class="stat-value">{total_formulas}</div>
+                <div class="stat-label">전체 수식</div>
+            </div>
+            <div class="stat-item">
+                <div class="stat-value">{fixed_count}</div>
+                <div class="stat-label">수정된 수식</div>
+            </div>
+            <div class="stat-item">
+                <div class="stat-value">{stats['fix_rate']:.1f}%</div>
+                <div class="stat-label">수정 비율</div>
+            </div>
+        </div>
+    </div>
+'''
+
+    def card(self, result):
+        fixed_badge = '<span class="fixed-badge">수정됨</span>' if result['was_fixed'] else ''
+
+        # Determine labels based on whether it was fixed
+        if result['was_fixed']:
+            original_label = "원본 LaTeX (오류 포함):"
+            fixed_label = "수정된 LaTeX ✓:"
+        else:
+            original_label = "원본 LaTeX:"
+            fixed_label = "검증된 LaTeX:"
+
+        image_block = f'''
+                <div class="formula-image">
+                    <h4>원본 이미지</h4>
+                    <img {self.img_attrs(result)} class="formula-image" alt="{result['filename']}">
+                </div>
+                ''' if result.get('has_image', True) else ''
+
+        return f'''
+    <div class="formula-item">
+        <div class="formula-header">
+            <span class="formula-title">#{result['index'] + 1} Page {result['page_index'] + 1} | Block Formula</span>
+            {fixed_badge}
+        </div>
+        <div class="formula-content">
+            <div class="formula-grid">{image_block}
+                <div class="latex-panel">
+                    <div class="latex-box">
+                        <h4>{original_label}</h4>
+                        <div class="latex-code" id="original-{result['index']}">{html.escape(result['original_latex'])}</div>
+                        <button class="copy-btn" onclick="copyLatexText('original-{result['index']}')">복사</button>
+                    </div>
+                    
+                    <div class="latex-box">
+                        <h4>{fixed_label}</h4>
+                        <div class="latex-code" id="fixed-{result['index']}">{html.escape(result['fixed_latex'])}</div>
+                        <button class="copy-btn" onclick="copyLatexText('fixed-{result['index']}')">복사</button>
+                    </div>
+                </div>
+            </div>
+            
+            <!-- 수정된 버전 렌더링 -->
+            <div class="rendered-math" id="render-{result['index']}">
+                <h4 style="position: absolute; top: 10px; left: 15px; margin: 0; font-size: 14px; color: #bfdbfe;">렌더링 결과:</h4>
+                <div class="zoom-controls">
+                    <button class="zoom-btn" onclick="zoomOut({result['index']})">−</button>
+                    <span class="zoom-level" id="zoom-level-{result['index']}">100%</span>
+                    <button class="zoom-btn" onclick="zoomIn({result['index']})">+</button>
+                </div>
+                {self.rendered(result['fixed_latex'])}
+            </div>
+        </div>
+    </div>
+'''
+
+    def tail(self):
+        return '''
+    <script>
+        function copyLatexText(elementId) {
+            const element = document.getElementById(elementId);
+            const text = element.textContent;
+            
+            navigator.clipboard.writeText(text).then(() => {
+                // Find the button that was clicked
+                const button = element.nextElementSibling;
+                const originalText = button.textContent;
+                button.textContent = '✓ 복사됨';
+                setTimeout(() => {
+                    button.textContent = originalText;
+                }, 2000);
+            }).catch(err => {
+                console.error('복사 실패:', err);
+                alert('복사 실패');
+            });
+        }
+        
+        // Zoom functionality
+        const zoomLevels = {};
+        
+        function zoomIn(id) {
+            const current = zoomLevels[id] || 100;
+            const newZoom = Math.min(current + 10, 300);
+            zoomLevels[id] = newZoom;
+            applyZoom(id, newZoom);
+        }
+        
+        function zoomOut(id) {
+            const current = zoomLevels[id] || 100;
+            const newZoom = Math.max(current - 10, 50);
+            zoomLevels[id] = newZoom;
+            applyZoom(id, newZoom);
+        }
+        
+        function applyZoom(id, zoom) {
+            const element = document.querySelector(`#render-${id} mjx-container`);
+            if (element) {
+                element.style.transform = `scale(${zoom / 100})`;
+                element.style.transformOrigin = 'center';
+            }
+            document.getElementById(`zoom-level-${id}`).textContent = zoom + '%';
+        }
+        
+        // Force white color for math
+        function forceMathWhite() {
+            document.querySelectorAll('.rendered-math mjx-container svg').forEach(svg => {
+                svg.style.fill = 'white';
+                svg.querySelectorAll('*').forEach(element => {
+                    element.style.fill = 'white';
+                    element.style.stroke = 'white';
+                });
+            });
+        }
+        
+        // Apply white color after MathJax renders
+        if (window.MathJax) {
+            MathJax.startup.document.subscribe('endUpdate', forceMathWhite);
+        }
+        
+        // Also apply on load
+        window.addEventListener('load', () => {
+            setTimeout(forceMathWhite, 1000);
+        });
+        
+        // Mouse wheel zoom
+        document.addEventListener('wheel', (e) => {
+            if (e.ctrlKey) {
+                e.preventDefault();
+                const mathElement = e.target.closest('.rendered-math');
+                if (mathElement) {
+                    const id = mathElement.id.replace('render-', '');
+                    if (e.deltaY < 0) {
+                        zoomIn(id);
+                    } else {
+                        zoomOut(id);
+                    }
+                }
+            }
+        });
+    </script>
+</body>
+</html>'''
+
+
+class CompareTemplate(ViewerTemplate):
+    """Original (with errors) and fixed renderings of each formula"""
+
+    message = "Fixed HTML viewer created"
+
+    def head(self, stats):
+        scale = self.scale
+        total_formulas, fixed_count = stats['total'], stats['fixed']
+        return f'''<!DOCTYPE html>
+<html lang="ko">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>SmartNougat Fixed LaTeX Results</title>
+    
+    <!-- MathJax 3 -->
+    <script>
+        window.MathJax = {{
+            tex: {{
+                inlineMath: [['$', '$'], ['\\\\(', '\\\\)']],
+                displayMath: [['$$', '$$'], ['\\\\[', '\\\\]']],
+                processEscapes: true
+            }},
+            svg: {{
+                fontCache: 'global',
+                scale: {scale}
+            }},
+            options: {{
+                skipHtmlTags: ['script', 'noscript', 'style', 'textarea', 'pre', 'code'],
+                ignoreClass: 'latex-code'
+            }}
+        }};
+    </script>
+    <script id="MathJax-script" async src="https://cdn.jsdelivr.net/npm/mathjax@3/es5/tex-svg.js"></script>
+    
+    <style>
+        body {{
+            font-family: -apple-system, Arial, sans-serif;
+            max-width: 1400px;
+            margin: 0 auto;
+            padding: 20px;
+            background: #f5f5f5;
+        }}
+        
+        h1 {{
+            text-align: center;
+            color: #333;
+        }}
+        
+        .stats {{
+            background: white;
+            padding: 20px;
+            border-radius: 8px;
+            margin-bottom: 20px;
+            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+        }}
+        
+        .formula-card {{
+            background: white;
+            margin: 20px 0;
+            padding: 20px;
+            border-radius: 8px;
+            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+        }}
+        
+        .card-header {{
+            display: flex;
+            justify-content: space-between;
+            margin-bottom: 15px;
+            font-size: 14px;
+            color: #666;
+        }}
+        
+        .formula-image {{
+            max-width: 100%;
+            max-height: 200px;
+            display: block;
+            margin: 10px auto;
+            border: 1px solid #ddd;
+            border-radius: 4px;
+        }}
+        
+        .latex-code {{
+            background: #1e1e1e;
+            color: #d4d4d4;
+            padding: 15px;
+            border-radius: 4px;
+            font-family: monospace;
+            font-size: 14px;
+            overflow-x: auto;
+            margin: 10px 0;
+            white-space: pre-wrap;
+        }}
+        
+        .rendered-math {{
+            background: #f8f8f8;
+            padding: 20px;
+            border-radius: 4px;
+            margin: 10px 0;
+            overflow-x: auto;
+            overflow-y: hidden;
+            position: relative;
+            min-height: 60px;
+            display: flex;
+            align-items: center;
+            justify-content: center;
+        }}
+        
+        /* Rendering label */
+        .render-label {{
+            position: absolute;
+            top: 5px;
+            left: 10px;
+            font-size: 12px;
+            font-weight: bold;
+            padding: 2px 8px;
+            border-radius: 3px;
+            background: rgba(255,255,255,0.9);
+            z-index: 10;
+        }}
+        
+        /* Original rendering style */
+        .original-render {{
+            border: 2px solid #ff6b6b;
+            background: #fff5f5;
+        }}
+        
+        .original-render .render-label {{
+            color: #ff6b6b;
+            background: #ffe0e0;
+        }}
+        
+        /* Fixed rendering style */
+        .fixed-render {{
+            border: 2px solid #51cf66;
+            background: #f3fff5;
+        }}
+        
+        .fixed-render .render-label {{
+            color: #51cf66;
+            background: #d3f9d8;
+        }}
+        
+        /* Zoom controls */
+        .zoom-controls {{
+            position: absolute;
+            top: 5px;
+            right: 5px;
+            display: flex;
+            gap: 5px;
+            background: rgba(255,255,255,0.9);
+            padding: 5px;
+            border-radius: 4px;
+            box-shadow: 0 1px 3px rgba(0,0,0,0.2);
+        }}
+        
+        .zoom-btn {{
+            width: 25px;
+            height: 25px;
+            border: 1px solid #ccc;
+            background: white;
+            cursor: pointer;
+            border-radius: 3px;
+            font-size: 14px;
+        }}
+        
+        .zoom-btn:hover {{
+            background: #f0f0f0;
+        }}
+        
+        .zoom-level {{
+            padding: 0 8px;
+            font-size: 12px;
+            display: flex;
+            align-items: center;
+        }}
+        
+        .math-container {{
+            display: inline-block;
+            transition: transform 0.2s ease;
+        }}
+        
+        /* Scrollbar styling */
+        .rendered-math::-webkit-scrollbar {{
+            height: 8px;
+        }}
+        
+        .rendered-math::-webkit-scrollbar-track {{
+            background: #f1f1f1;
+            border-radius: 4px;
+        }}
+        
+        .rendered-math::-webkit-scrollbar-thumb {{
+            background: #888;
+            border-radius: 4px;
+        }}
+        
+        .rendered-math::-webkit-scrollbar-thumb:hover {{
+            background: #555;
+        }}
+        
+        .success {{ color: #4caf50; }}
+        .failed {{ color: #f44336; }}
+        .fixed {{ color: #2196F3; }}
+        
+        .category-inline {{ color: #2196F3; }}
+        .category-block {{ color: #FF5722; }}
+    </style>
+</head>
+<body>
+    <h1>SmartNougat Fixed LaTeX Results</h1>
+    
+    <div class="stats">
+        <p><strong>Total Formulas:</strong> {total_formulas}</p>
+        <p><strong>Fixed:</strong> <span class="fixed">{fixed_count}</span></p>
+        <p><strong>Unchanged:</strong> {total_formulas - fixed_count}</p>
+        <p><strong>Processing Date:</strong> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
+    </div>
+'''
+
+    def card(self, result):
+        img_src = self.image_src(result)
+        index = result['index']
+
+        # Determine category
+        category = result.get('category_id', '')
+        category_class = 'category-inline' if '13' in str(category) else 'category-block'
+        category_name = 'Inline' if '13' in str(category) else 'Block'
+
+        # Check if fixed
+        was_fixed = result['was_fixed']
+        fixes_list = result['fixes']
+
+        card = f'''
+    <div class="formula-card">
+        <div class="card-header">
+            <span><strong>#{index + 1}</strong> Page {result['page_index'] + 1} | <span class="{category_class}">{category_name} Formula</span></span>
+            <span>{'🔧 Fixed' if was_fixed else '✓ Original'}</span>
+        </div>
+        '''
+        
+        if img_src:
+            card += f'''
+        <img {self.img_attrs(result)} class="formula-image" alt="{result['filename']}">
+        '''
+        
+        # Show fixed LaTeX code
+        card += f'''
+        <div class="latex-code">
+            <strong>LaTeX Code:</strong><br>
+            <pre>{html.escape(result['fixed_latex'])}</pre>'''
+        
+        # Add original LaTeX if it was fixed
+        if was_fixed:
+            card += f'''
+            <details style="margin-top: 10px;">
+                <summary style="cursor: pointer; color: #666;">🔧 Original (before fixes): {', '.join(fixes_list)}</summary>
+                <pre style="margin-top: 5px; color: #888;">{html.escape(result['original_latex'])}</pre>
+            </details>'''
+        
+        card += '''
+        </div>'''
+        
+        # Add original rendering if there were fixes
+        if was_fixed:
+            card += f'''
+        
+        <div class="rendered-math original-render" id="math-original-{index}">
+            <div class="render-label">Original (with errors)</div>
+            <div class="zoom-controls">
+                <button class="zoom-btn" onclick="zoomOut('original-{index}')">−</button>
+                <span class="zoom-level" id="zoom-level-original-{index}">100%</span>
+                <button class="zoom-btn" onclick="zoomIn('original-{index}')">+</button>
+                <button class="zoom-btn" onclick="resetZoom('original-{index}')" title="Reset">⟲</button>
+            </div>
+            <div class="math-container" id="math-container-original-{index}">
+                $${result['original_latex']}$$
+            </div>
+        </div>'''
+        
+        # Add fixed/final rendering
+        render_label = '<div class="render-label">Fixed Rendering</div>' if was_fixed else ''
+        extra_class = ' fixed-render' if was_fixed else ''
+        
+        card += f'''
+        
+        <div class="rendered-math{extra_class}" id="math-{index}">
+            {render_label}
+            <div class="zoom-controls">
+                <button class="zoom-btn" onclick="zoomOut('{index}')">−</button>
+                <span class="zoom-level" id="zoom-level-{index}">100%</span>
+                <button class="zoom-btn" onclick="zoomIn('{index}')">+</button>
+                <button class="zoom-btn" onclick="resetZoom('{index}')" title="Reset">⟲</button>
+            </div>
+            <div class="math-container" id="math-container-{index}">
+                {self.rendered(result['fixed_latex'])}
+            </div>
+        </div>
+    </div>
+'''
+        return card
+
+    def tail(self):
+        return '''
+    
+    <script>
+        const zoomLevels = {};
+        
+        function zoomIn(id) {
+            const current = zoomLevels[id] || 100;
+            const newZoom = Math.min(current + 10, 300);
+            zoomLevels[id] = newZoom;
+            applyZoom(id, newZoom);
+        }
+        
+        function zoomOut(id) {
+            const current = zoomLevels[id] || 100;
+            const newZoom = Math.max(current - 10, 50);
+            zoomLevels[id] = newZoom;
+            applyZoom(id, newZoom);
+        }
+        
+        function resetZoom(id) {
+            zoomLevels[id] = 100;
+            applyZoom(id, 100);
+        }
+        
+        function applyZoom(id, zoom) {
+            const container = document.getElementById(`math-container-${id}`);
+            const zoomDisplay = document.getElementById(`zoom-level-${id}`);
+            
+            if (container) {
+                container.style.transform = `scale(${zoom / 100})`;
+                zoomDisplay.textContent = `${zoom}%`;
+            }
+        }
+        
+        // Ctrl + wheel zoom
+        document.addEventListener('wheel', (e) => {
+            if (e.ctrlKey) {
+                e.preventDefault();
+                const mathElement = e.target.closest('.rendered-math');
+                if (mathElement) {
+                    const id = mathElement.id.replace('math-', '').replace('original-', '');
+                    if (e.deltaY < 0) {
+                        zoomIn(id);
+                    } else {
+                        zoomOut(id);
+                    }
+                }
+            }
+        });
+    </script>
+</body>
+</html>
+'''
+
+
+class VirtualTemplate(VerticalTemplate):
+    """Placeholder per page; cards come from viewer_data/page_XXXXX.js shards"""
+
+    filename = "result_viewer_virtual.html"
+    message = "Virtual HTML viewer created"
+    title = "SmartNougat LaTeX Results"
+
+    def __init__(self, source, **kwargs):
+        # Shards always link images; embedding would defeat lazy loading
+        kwargs['embed_images'] = False
+        super().__init__(source, **kwargs)
+        self.data_dir = self.output_dir / "viewer_data"
+        self.data_dir.mkdir(exist_ok=True)
+
+    def mathjax_block(self, stats, typeset=True):
+        # MathJax typesets on demand only, per page as it is built
+        return super().mathjax_block(stats, typeset=False)
+
+    def write_page(self, out, page_index, results):
+        if not results:
+            return
+        shard_name = f"page_{page_index:05d}.js"
+        shard = []
+        for result in results:
+            entry = dict(result, det_num=int(result['filename'].split('_')[-1].replace('.png', '')))
+            if result['fixed_latex'] in self.svgs:
+                entry['svg'] = self.svgs[result['fixed_latex']]
+            if self.omml:
+                entry['omml'] = self.omml_converter.convert(result['fixed_latex'])
+            shard.append(entry)
+        with open(self.data_dir / shard_name, 'w', encoding='utf-8') as f:
+            f.write(f"SmartNougatViewer.addPage({page_index}, ")
+            json.dump(shard, f, ensure_ascii=False)
+            f.write(");\n")
+        # Placeholder height roughly matching the rendered cards
+        out.write(
+            f'    <section class="page-shard" data-page="{page_index}" '
+            f'data-src="viewer_data/{shard_name}" style="min-height: {len(shard) * 420}px">\n'
+            f'        <div class="cards"></div>\n'
+            f'    </section>\n'
+        )
+
+    def tail(self):
+        return VIEWER_SCRIPT + VIRTUAL_VIEWER_SCRIPT + '</body>\n</html>'
+
+
+TEMPLATES = {
+    '0714': VerticalTemplate,
+    'simple': SimpleTemplate,
+    'result': ResultTemplate,
+    'panel': PanelTemplate,
+    'grid': GridTemplate,
+    'compare': CompareTemplate,
+    'virtual': VirtualTemplate,
+}
+
+
+def write_viewer(output_dir, template='0714', scale=1.5, embed_images=True,
+                 prerender_svg=False, **options):
+    """
+    Write one viewer for output_dir, streaming cards to the HTML file
+
+    Args:
+        template: key of TEMPLATES
+        embed_images: inline images as base64 (False links images/ lazily)
+        prerender_svg: inline build-time SVG (see prerender_svgs)
+        options: extra template options (e.g. mathjax_src for 'panel',
+            omml=False to leave out the OMML boxes)
+
+    Returns:
+        Path of the written HTML file, or None if the results are missing
+    """
+
+    source = FormulaSource.open(output_dir)
+    if source is None:
+        return None
+
+    # Statistics first (cheap: no images), the header shows them
+    total_formulas = 0
+    fixed_count = 0
+    latex_list = []
+    for _, results in source.pages():
+        total_formulas += len(results)
+        fixed_count += sum(1 for r in results if r['was_fixed'])
+        latex_list.extend(r['fixed_latex'] for r in results)
+
+    svgs, svg_css = {}, ''
+    if prerender_svg:
+        svgs, svg_css = prerender_svgs(latex_list, source.output_dir / "svg_cache")
+
+    stats = {
+        'total': total_formulas,
+        'fixed': fixed_count,
+        'fix_rate': fixed_count / total_formulas * 100 if total_formulas else 0.0,
+        'needs_mathjax': any(latex not in svgs for latex in latex_list),
+    }
+    del latex_list
+
+    viewer = TEMPLATES[template](source, scale=scale, embed_images=embed_images,
+                                 svgs=svgs, svg_css=svg_css, **options)
+    html_path = source.output_dir / viewer.filename
+    with open(html_path, 'w', encoding='utf-8') as out:
+        out.write(viewer.head(stats))
+        for page_index, results in source.pages():
+            viewer.write_page(out, page_index, results)
+        out.write(viewer.tail())
+
+    print(f"[Success] {viewer.message}: {html_path}")
+    return html_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SmartNougat result viewer generator")
+    parser.add_argument('output_dir', help='SmartNougat output directory')
+    parser.add_argument('--template', default='0714', choices=list(TEMPLATES),
+                        help='Viewer template (default: 0714)')
+    parser.add_argument('--scale', type=float, default=1.5, help='MathJax scale')
+    parser.add_argument('--link-images', action='store_true',
+                        help='Reference images/ lazily instead of embedding base64')
+    parser.add_argument('--svg', action='store_true',
+                        help='Pre-render formulas to SVG with local node MathJax (needs npm install in mathjax/)')
+    parser.add_argument('--no-omml', action='store_true',
+                        help='Leave out the OMML (Word) boxes')
+    args = parser.parse_args()
+
+    if not write_viewer(args.output_dir, args.template, scale=args.scale,
+                        embed_images=not args.link_images, prerender_svg=args.svg,
+                        omml=not args.no_omml):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()